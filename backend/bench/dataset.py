@@ -0,0 +1,214 @@
+"""
+Deterministic synthetic dataset at configurable scale.
+
+The same size and seed always produce the same rows. Row ids are md5-derived UUIDs of the row kind and number
+(see `row_uuid`), so benchmarks can address applicants, questions and answers without querying for them.
+Reference data is generated in Python, applicants and their exams and results in SQL with generate_series.
+
+    python -m backend.bench.dataset --size small [--applicants N] [--seed 1] [--reset]
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.src.applicants.analytics import rebuild_analytics
+from backend.src.database.events import notify
+from backend.src.database.models import (Answer, AnswerFaculty, Applicant, ApplicantDailyCount, ApplicantExam,
+                                         ApplicantFaculty, ApplicantResult, ComplianceHistogram, Exam,
+                                         ExamScoreHistogram, Faculty, FacultyExamRequirement, FacultyType,
+                                         Question)
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    """Объём синтетических данных"""
+    questions: int
+    answers_per_question: int
+    faculty_types: int
+    faculties: int
+    exams: int
+    requirements_per_faculty: int
+    applicants: int
+    exams_per_applicant: int = 3
+    # доля абитуриентов, прошедших тест
+    tested_share: float = 0.5
+
+
+SIZES = {
+    "tiny": DatasetSize(questions=10, answers_per_question=4, faculty_types=4, faculties=10, exams=6,
+                        requirements_per_faculty=2, applicants=200),
+    "small": DatasetSize(questions=100, answers_per_question=5, faculty_types=6, faculties=60, exams=10,
+                         requirements_per_faculty=3, applicants=20_000),
+    "medium": DatasetSize(questions=300, answers_per_question=8, faculty_types=8, faculties=200, exams=12,
+                          requirements_per_faculty=3, applicants=300_000),
+    "large": DatasetSize(questions=500, answers_per_question=10, faculty_types=10, faculties=400, exams=15,
+                         requirements_per_faculty=4, applicants=2_000_000),
+}
+
+TABLES = [ApplicantDailyCount, ComplianceHistogram, ExamScoreHistogram, ApplicantResult, ApplicantFaculty,
+          ApplicantExam, Applicant, FacultyExamRequirement, Faculty, AnswerFaculty, Answer, Question, Exam,
+          FacultyType]
+
+CITIES = ["Краснодар", "Сочи", "Новороссийск", "Армавир", "Анапа", "Ейск", "Тихорецк", "Кропоткин"]
+
+# Абитуриенты вставляются порциями, чтобы не держать миллионы строк в одной транзакции
+APPLICANT_CHUNK = 100_000
+
+
+def row_uuid(kind: str, number: int) -> UUID:
+    """UUID of the `number`-th row of a kind, the same as md5(kind || number)::uuid in SQL"""
+    return UUID(hashlib.md5(f"{kind}{number}".encode()).hexdigest())
+
+
+def phone_number(number: int) -> str:
+    """Phone number of the `number`-th applicant"""
+    return str(79000000000 + number)
+
+
+# Абитуриент n создан через n секунд после CREATED
+CREATED = datetime(2025, 6, 1)
+
+APPLICANTS_SQL = text("""
+    INSERT INTO applicant (uuid, surname, name, patronymic, phone_number, city, dt_created)
+    SELECT md5('applicant' || n)::uuid, 'Фамилия ' || (n % 997), 'Имя ' || (n % 283), NULL,
+           (79000000000 + n)::text, (CAST(:cities AS VARCHAR[]))[1 + n % CAST(:city_count AS INTEGER)],
+           CAST(:created AS TIMESTAMP) + n * interval '1 second'
+    FROM generate_series(CAST(:start AS INTEGER), CAST(:stop AS INTEGER)) AS n
+""")
+
+APPLICANT_EXAMS_SQL = text("""
+    INSERT INTO applicantexam (uuid, applicant_id, exam_id, score)
+    SELECT md5('applicant_exam' || n || ':' || k)::uuid, md5('applicant' || n)::uuid,
+           md5('exam' || ((n + k) % CAST(:exams AS INTEGER)))::uuid,
+           30 + abs(hashtext(CAST(:seed AS TEXT) || ':' || n || ':' || k)) % 71
+    FROM generate_series(CAST(:start AS INTEGER), CAST(:stop AS INTEGER)) AS n,
+         generate_series(0, CAST(:per_applicant AS INTEGER) - 1) AS k
+""")
+
+APPLICANT_FACULTIES_SQL = text("""
+    INSERT INTO applicant_faculty (uuid, applicant_id, faculty_type_id, compliance)
+    SELECT md5('applicant_faculty' || n || ':' || t)::uuid, md5('applicant' || n)::uuid,
+           md5('faculty_type' || t)::uuid, abs(hashtext(CAST(:seed AS TEXT) || ':c:' || n || ':' || t)) % 40
+    FROM generate_series(CAST(:start AS INTEGER), CAST(:stop AS INTEGER)) AS n,
+         generate_series(0, CAST(:faculty_types AS INTEGER) - 1) AS t
+    WHERE abs(hashtext(CAST(:seed AS TEXT) || ':t:' || n)) % 1000 < CAST(:tested AS INTEGER)
+""")
+
+
+def reference_rows(size: DatasetSize, seed: int) -> dict:
+    """Rows of the reference tables, keyed by model"""
+    rng = random.Random(seed)
+    faculty_types = [{"uuid": row_uuid("faculty_type", number), "name": f"Тип факультета {number}"}
+                     for number in range(size.faculty_types)]
+    exams = [{"uuid": row_uuid("exam", number), "name": f"Экзамен {number}", "code": f"exam_{number}"}
+             for number in range(size.exams)]
+    faculties = [{"uuid": row_uuid("faculty", number), "name": f"Факультет {number}",
+                  "url": f"https://kubsau.ru/education/faculty-{number}/",
+                  "type_id": faculty_types[number % size.faculty_types]["uuid"]}
+                 for number in range(size.faculties)]
+    requirements = [
+        {"uuid": row_uuid("requirement", number * size.exams + exam), "faculty_id": faculty["uuid"],
+         "exam_id": exams[exam]["uuid"], "min_score": rng.randint(30, 70)}
+        for number, faculty in enumerate(faculties)
+        for exam in rng.sample(range(size.exams), min(size.requirements_per_faculty, size.exams))
+    ]
+    questions = [{"uuid": row_uuid("question", number), "text": f"Вопрос {number}"}
+                 for number in range(size.questions)]
+    answers, answer_faculties = [], []
+    for question_number, question in enumerate(questions):
+        for answer in range(size.answers_per_question):
+            number = question_number * size.answers_per_question + answer
+            answers.append({"uuid": row_uuid("answer", number), "text": f"Ответ {answer + 1}",
+                            "question_id": question["uuid"]})
+            for faculty_type in rng.sample(faculty_types, min(2, size.faculty_types)):
+                answer_faculties.append({"uuid": row_uuid("answer_faculty", len(answer_faculties)),
+                                         "answer_id": answers[-1]["uuid"],
+                                         "faculty_type_id": faculty_type["uuid"],
+                                         "score": rng.randint(1, 10)})
+    return {FacultyType: faculty_types, Exam: exams, Faculty: faculties, FacultyExamRequirement: requirements,
+            Question: questions, Answer: answers, AnswerFaculty: answer_faculties}
+
+
+async def generate(engine: AsyncEngine, size: DatasetSize, seed: int = 1, reset: bool = False,
+                   progress: bool = False) -> None:
+    """
+    Fill the database with a synthetic dataset.
+
+    Args:
+        engine: Engine of a migrated database
+        size: Dataset size
+        seed: Seed of scores, weights and requirements
+        reset: Empty the tables first
+        progress: Print progress of the applicant load
+
+    Raises:
+        RuntimeError: If the database already has applicants or questions and `reset` is not set
+    """
+    async with engine.begin() as conn:
+        if reset:
+            await conn.execute(text(f"TRUNCATE {', '.join(table.__tablename__ for table in TABLES)}"))
+        else:
+            for model in (Applicant, Question):
+                if (await conn.execute(select(func.count()).select_from(model))).scalar_one():
+                    raise RuntimeError(f"{model.__tablename__} is not empty, pass reset to replace the data")
+        for model, rows in reference_rows(size, seed).items():
+            if rows:
+                await conn.execute(insert(model), rows)
+
+    tested = int(1000 * size.tested_share)
+    for start in range(0, size.applicants, APPLICANT_CHUNK):
+        stop = min(start + APPLICANT_CHUNK, size.applicants) - 1
+        parameters = {"start": start, "stop": stop, "seed": str(seed), "cities": CITIES, "city_count": len(CITIES),
+                      "created": CREATED, "exams": size.exams,
+                      "per_applicant": min(size.exams_per_applicant, size.exams),
+                      "faculty_types": size.faculty_types, "tested": tested}
+        async with engine.begin() as conn:
+            await conn.execute(APPLICANTS_SQL, parameters)
+            await conn.execute(APPLICANT_EXAMS_SQL, parameters)
+            await conn.execute(APPLICANT_FACULTIES_SQL, parameters)
+        if progress:
+            print(f"applicants {stop + 1}/{size.applicants}")
+
+    # Абитуриенты загружены мимо сервисов, поэтому сводки пересчитываются целиком
+    async with engine.begin() as conn:
+        await rebuild_analytics(conn)
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+    # Вставки шли мимо сессий, поэтому снимки этого процесса сбрасываем сами
+    for model in TABLES:
+        notify(model.__tablename__)
+
+
+async def main(size: DatasetSize, seed: int, reset: bool) -> None:
+    from backend.src.database.main import async_engine
+
+    started = time.perf_counter()
+    try:
+        await generate(async_engine, size, seed, reset, progress=True)
+    finally:
+        await async_engine.dispose()
+    print(f"generated {size} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the database with a deterministic synthetic dataset")
+    parser.add_argument("--size", choices=SIZES, default="small")
+    parser.add_argument("--applicants", type=int, help="override the number of applicants of the size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="truncate the tables first")
+    arguments = parser.parse_args()
+    dataset_size = SIZES[arguments.size]
+    if arguments.applicants is not None:
+        dataset_size = replace(dataset_size, applicants=arguments.applicants)
+    asyncio.run(main(dataset_size, arguments.seed, arguments.reset))
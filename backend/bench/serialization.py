@@ -0,0 +1,135 @@
+"""
+CPU cost of producing the JSON body of GET /questions/ and GET /applicant/{uuid}.
+
+Compares the path of a route returning schema objects (validated again against `response_model`, converted by
+`jsonable_encoder` and dumped by the stdlib encoder) with serializing them once in pydantic-core, and with
+serving the cached body or stored document the routes use now. No database is needed: the rows are synthetic.
+
+    python -m backend.bench.serialization [--iterations N]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute, serialize_response
+
+from backend.src import app
+from backend.src.applicants.schemas import (AnswerSch, ApplicantExamResult, Faculty, FacultyTypeSch, QuestionSch,
+                                            ResponseResult)
+from backend.src.applicants.serialization import dump_json
+
+QUESTIONS = 40
+ANSWERS_PER_QUESTION = 4
+FACULTY_TYPES = 6
+FACULTIES_PER_TYPE = 5
+EXAMS = 4
+
+
+def question_rows() -> list[tuple]:
+    """(question_id, question_text, answer_id, answer_text) rows as the questions query returns them"""
+    return [
+        (question_id, f"Вопрос {question}", uuid4(), f"Ответ {answer}")
+        for question in range(QUESTIONS)
+        for question_id in [uuid4()]
+        for answer in range(ANSWERS_PER_QUESTION)
+    ]
+
+
+def build_questions(rows: list[tuple]) -> list[QuestionSch]:
+    """QuestionService.get_all_questions without the query"""
+    questions = {}
+    for question_id, question_text, answer_id, answer_text in rows:
+        if question_id not in questions:
+            questions[question_id] = QuestionSch(id=str(question_id), question=question_text, answers=[])
+        questions[question_id].answers.append(AnswerSch(id=str(answer_id), text=answer_text))
+    return list(questions.values())
+
+
+def applicant_result() -> ResponseResult:
+    return ResponseResult(
+        uuid=uuid4(),
+        surname="Иванов",
+        name="Иван",
+        patronymic="Иванович",
+        phone_number="79000000000",
+        city="Краснодар",
+        faculty_type=[
+            FacultyTypeSch(
+                name=f"Тип {faculty_type}",
+                compliance=faculty_type,
+                faculties=[Faculty(name=f"Факультет {faculty}", url=f"https://kubsau.ru/{faculty}")
+                           for faculty in range(FACULTIES_PER_TYPE)]
+            )
+            for faculty_type in range(FACULTY_TYPES)
+        ],
+        exams=[ApplicantExamResult(exam_id=uuid4(), exam_name=f"Экзамен {exam}", exam_code=f"exam_{exam}", score=70)
+               for exam in range(EXAMS)]
+    )
+
+
+def response_field(path: str):
+    return next(route.response_field for route in app.routes if isinstance(route, APIRoute) and route.path == path)
+
+
+async def fastapi_body(field, content) -> bytes:
+    """What FastAPI does with a returned object: validate against response_model, encode, dump"""
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def measure(iterations: int, func) -> float:
+    """CPU microseconds per call"""
+    started = time.process_time()
+    for _ in range(iterations):
+        await func()
+    return 1e6 * (time.process_time() - started) / iterations
+
+
+async def main(iterations: int) -> None:
+    rows = question_rows()
+    questions_field = response_field("/backend/api/questions/")
+    result = applicant_result()
+    result_field = response_field("/backend/api/applicant/{applicant_uuid}")
+    cached_questions = dump_json(List[QuestionSch], build_questions(rows))
+    stored_document = dump_json(ResponseResult, result)
+
+    async def questions_before():
+        return await fastapi_body(questions_field, build_questions(rows))
+
+    async def questions_rebuild():
+        return dump_json(List[QuestionSch], build_questions(rows))
+
+    async def questions_cached():
+        return Response(content=cached_questions, media_type="application/json").body
+
+    async def applicant_before():
+        return await fastapi_body(result_field, result)
+
+    async def applicant_rebuild():
+        return dump_json(ResponseResult, result)
+
+    async def applicant_stored():
+        return Response(content=stored_document, media_type="application/json").body
+
+    assert json.loads(await questions_before()) == json.loads(await questions_rebuild())
+    assert json.loads(await applicant_before()) == json.loads(await applicant_rebuild())
+    print(f"{'case':<48}{'us/request':>12}")
+    for name, func in (
+        ("GET /questions/ validated + FastAPI encoder", questions_before),
+        ("GET /questions/ rebuild: dump_json once", questions_rebuild),
+        ("GET /questions/ cached body", questions_cached),
+        ("GET /applicant/{uuid} validated + FastAPI encoder", applicant_before),
+        ("GET /applicant/{uuid} rebuild: dump_json", applicant_rebuild),
+        ("GET /applicant/{uuid} stored document", applicant_stored),
+    ):
+        await func()
+        print(f"{name:<48}{await measure(iterations, func):>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().iterations))
@@ -0,0 +1,219 @@
+"""
+Service-level benchmark suite.
+
+Times every service method and counts the queries it sends, against a local Postgres filled by
+`backend.bench.dataset` with the same size. Results are compared with the stored baselines: the run fails
+if a method sends more queries than its baseline or its median time exceeds the baseline by more than the
+tolerance. The write cases modify the dataset, so run it against a benchmark database.
+
+    python -m backend.bench.services --size small [--iterations 200] [--tolerance 1.0] [--update]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.bench.dataset import CREATED, SIZES, DatasetSize, phone_number, row_uuid
+from backend.src.applicants.analytics import AnalyticsService
+from backend.src.applicants.eligibility import EligibilityService
+from backend.src.applicants.listing import ApplicantListService, encode_cursor
+from backend.src.applicants.ranking import RecommendationService
+from backend.src.applicants.schemas import AnswerInput, ApplicantAnswers, ApplicantInfo, ExamScore
+from backend.src.applicants.service import ExamsService, QuestionService, ResultService
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+@dataclass(frozen=True)
+class Case:
+    """Замеряемый метод сервиса; run получает сессию и номер итерации"""
+    name: str
+    run: Callable[[AsyncSession, int], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Результат замера одного метода"""
+    name: str
+    queries: float
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+
+
+def cases(size: DatasetSize) -> list[Case]:
+    """Benchmark cases addressing the rows of a dataset of the given size"""
+
+    def applicant(iteration: int) -> int:
+        # Разносим обращения по всей таблице, а не по первым строкам
+        return iteration * 7919 % size.applicants
+
+    def registration(iteration: int) -> ApplicantInfo:
+        number = applicant(iteration)
+        return ApplicantInfo(
+            surname="Фамилия", name="Имя", phone_number=phone_number(number), city="Краснодар",
+            exams=[ExamScore(exam_id=row_uuid("exam", exam), exam_name=f"Экзамен {exam}", exam_code=f"exam_{exam}",
+                             score=60 + exam)
+                   for exam in range(min(size.exams_per_applicant, size.exams))]
+        )
+
+    def answers(iteration: int) -> ApplicantAnswers:
+        number = applicant(iteration)
+        return ApplicantAnswers(uuid=row_uuid("applicant", number), answers=[
+            AnswerInput(question_id=str(row_uuid("question", question)), answer_ids=[
+                str(row_uuid("answer", question * size.answers_per_question
+                             + (number + question) % size.answers_per_question))
+            ])
+            for question in range(size.questions)
+        ])
+
+    def cursor(iteration: int) -> str:
+        number = applicant(iteration)
+        return encode_cursor(CREATED + timedelta(seconds=number), row_uuid("applicant", number))
+
+    return [
+        Case("QuestionService.get_all_questions",
+             lambda session, i: QuestionService(session).get_all_questions()),
+        Case("ExamsService.get_all_exams",
+             lambda session, i: ExamsService(session).get_all_exams()),
+        Case("ExamsService.get_all_required_exams",
+             lambda session, i: ExamsService(session).get_all_required_exams()),
+        Case("ResultService.register_or_get_applicant",
+             lambda session, i: ResultService(session).register_or_get_applicant(registration(i))),
+        Case("ResultService.process_user_answers",
+             lambda session, i: ResultService(session).process_user_answers(answers(i))),
+        Case("ResultService.get_applicant_results",
+             lambda session, i: ResultService(session).get_applicant_results(row_uuid("applicant", applicant(i)))),
+        Case("ResultService.get_applicant_results_document",
+             lambda session, i: ResultService(session).get_applicant_results_document(
+                 row_uuid("applicant", applicant(i)))),
+        Case("ResultService.get_applicant_results_batch_document",
+             lambda session, i: ResultService(session).get_applicant_results_batch_document(
+                 [row_uuid("applicant", applicant(i * 100 + n)) for n in range(100)])),
+        Case("EligibilityService.get_applicant_eligibility",
+             lambda session, i: EligibilityService(session).get_applicant_eligibility(
+                 row_uuid("applicant", applicant(i)))),
+        Case("RecommendationService.get_recommendations",
+             lambda session, i: RecommendationService(session).get_recommendations(
+                 row_uuid("applicant", applicant(i)), 5)),
+        Case("AnalyticsService.get_analytics",
+             lambda session, i: AnalyticsService(session).get_analytics(30)),
+        Case("ApplicantListService.list_applicants",
+             lambda session, i: ApplicantListService(session).list_applicants(100, cursor(i), include_exams=True)),
+    ]
+
+
+async def measure(engine: AsyncEngine, case: Case, iterations: int, warmup: int) -> Measurement:
+    """
+    Run a case like a request would: a fresh session per call.
+
+    Args:
+        engine: Engine of the benchmark database
+        case: Method to measure
+        iterations: Measured calls
+        warmup: Calls made first to fill pools, prepared statements and snapshots
+    """
+    session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    queries = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal queries
+        queries += 1
+
+    for iteration in range(warmup):
+        async with session_maker() as session:
+            await case.run(session, iteration)
+
+    timings = []
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        for iteration in range(warmup, warmup + iterations):
+            async with session_maker() as session:
+                started = time.perf_counter()
+                await case.run(session, iteration)
+                timings.append(1000 * (time.perf_counter() - started))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    timings.sort()
+    return Measurement(
+        name=case.name,
+        queries=round(queries / iterations, 2),
+        p50_ms=round(statistics.median(timings), 3),
+        p95_ms=round(timings[int(0.95 * (len(timings) - 1))], 3),
+        mean_ms=round(statistics.fmean(timings), 3)
+    )
+
+
+def regressions(measurements: list[Measurement], baselines: dict, tolerance: float) -> list[str]:
+    """
+    Compare measurements with baselines.
+
+    Args:
+        measurements: Results of this run
+        baselines: case name -> {"queries": ..., "p50_ms": ...}
+        tolerance: Allowed relative slowdown of the median, 1.0 allows twice the baseline
+
+    Returns:
+        list: Descriptions of the regressions, empty if there are none
+    """
+    found = []
+    for measurement in measurements:
+        baseline = baselines.get(measurement.name)
+        if baseline is None:
+            found.append(f"{measurement.name}: no baseline, run with --update")
+            continue
+        if measurement.queries > baseline["queries"]:
+            found.append(f"{measurement.name}: {measurement.queries} queries per call, baseline {baseline['queries']}")
+        if measurement.p50_ms > baseline["p50_ms"] * (1 + tolerance):
+            found.append(f"{measurement.name}: median {measurement.p50_ms} ms, baseline {baseline['p50_ms']} ms")
+    return found
+
+
+async def main(size_name: str, iterations: int, warmup: int, tolerance: float, update: bool) -> int:
+    from backend.src.database.main import async_engine
+
+    try:
+        measurements = [await measure(async_engine, case, iterations, warmup) for case in cases(SIZES[size_name])]
+    finally:
+        await async_engine.dispose()
+
+    print(f"{'case':<52}{'queries':>9}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for measurement in measurements:
+        print(f"{measurement.name:<52}{measurement.queries:>9}{measurement.p50_ms:>10}"
+              f"{measurement.p95_ms:>10}{measurement.mean_ms:>10}")
+
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    if update:
+        stored[size_name] = {measurement.name: {"queries": measurement.queries, "p50_ms": measurement.p50_ms}
+                             for measurement in measurements}
+        BASELINES.write_text(json.dumps(stored, indent=2, ensure_ascii=False) + "\n")
+        print(f"baselines for {size_name} written to {BASELINES}")
+        return 0
+
+    found = regressions(measurements, stored.get(size_name, {}), tolerance)
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time service methods and compare them with the baselines")
+    parser.add_argument("--size", choices=SIZES, default="small", help="size the database was generated with")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=1.0, help="allowed relative slowdown of the median")
+    parser.add_argument("--update", action="store_true", help="store this run as the baselines")
+    arguments = parser.parse_args()
+    sys.exit(asyncio.run(main(arguments.size, arguments.iterations, arguments.warmup, arguments.tolerance,
+                              arguments.update)))
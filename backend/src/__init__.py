@@ -1,15 +1,37 @@
+from backend.src.internal.boot import boot
+import asyncio
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from backend.src.database.main import init_db
+from backend.src.config import settings
+from backend.src.database.main import init_db, batch_writer
+from backend.src.database.notifications import TableChangeListener
+from backend.src.database.replica import ReadYourWritesMiddleware
 from backend.src.applicants.routes import api_router
+from backend.src.internal.routes import internal_router, probe_router
+from backend.src.internal.metrics import RequestMetricsMiddleware
+from backend.src.internal.warmup import warm_up
 from fastapi.middleware.cors import CORSMiddleware
 
+boot.mark("imports")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("app is starting")
-    await init_db()
+    with boot.phase("init_db"):
+        await init_db()
+    with boot.phase("listener"):
+        table_change_listener = TableChangeListener(settings.postgres_dsn)
+        await table_change_listener.start()
+    if batch_writer:
+        await batch_writer.start()
+    # Трафик принимаем сразу, а /ready отвечает 200 только после прогрева
+    warmup = asyncio.create_task(warm_up(app))
     yield
+    warmup.cancel()
+    if batch_writer:
+        await batch_writer.stop()
+    await table_change_listener.stop()
     print("app is shutting down")
 
 app = FastAPI(
@@ -29,4 +51,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Записи запроса выдают клиенту cookie, по которой его чтения на любом воркере идут на мастер
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Последним, чтобы замер охватывал и CORS
+app.add_middleware(RequestMetricsMiddleware)
+
 app.include_router(api_router)
+app.include_router(internal_router)
+app.include_router(probe_router)
@@ -0,0 +1,288 @@
+from datetime import date, datetime, timedelta
+from uuid import UUID, uuid4
+
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import Date, bindparam, cast, delete, func, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.database.models import (Applicant, ApplicantExam, ApplicantFaculty, ApplicantDailyCount,
+                                         ComplianceHistogram, ExamScoreHistogram)
+from backend.src.applicants.reference import reference_data
+from backend.src.applicants.schemas import (AdmissionAnalytics, DailyApplicants, ComplianceDistribution,
+                                            ExamScoreDistribution)
+
+
+# Город не указан: NULL не может быть частью первичного ключа
+NO_CITY = ""
+
+# Запись идёт текстовыми запросами: SQLAlchemy 2.0 не кеширует компиляцию INSERT ... ON CONFLICT,
+# а текст компилируется один раз и даёт один prepared statement при любом числе экзаменов
+
+
+def apply_deltas(histogram: str, keys: str, deltas: str) -> str:
+    """
+    SQL adding the summed `delta` column of a row source to the counts of a histogram table.
+
+    Keys whose deltas cancel out are not written. Rows are upserted in key order, so concurrent
+    transactions lock histogram rows in the same order and cannot deadlock on them.
+
+    Args:
+        histogram: Histogram table
+        keys: Comma-separated key columns, the same in the table and the row source
+        deltas: Row source with the key columns and `delta`
+    """
+    return f"""
+        INSERT INTO {histogram} ({keys}, count)
+        SELECT {keys}, sum(delta) FROM {deltas}
+        GROUP BY {keys} HAVING sum(delta) <> 0 ORDER BY {keys}
+        ON CONFLICT ({keys}) DO UPDATE SET count = {histogram}.count + excluded.count"""
+
+
+def daily_deltas(applicants: str, delta: int) -> str:
+    """
+    SQL selecting the `day, city, delta` rows of the daily counts for the applicants of a row source.
+
+    Args:
+        applicants: Row source with `dt_created` and `city`
+        delta: Change of the count of each applicant, 1 or -1
+    """
+    return f"""
+        SELECT dt_created::date AS day, coalesce(city, '{NO_CITY}') AS city, {delta} AS delta
+        FROM {applicants} WHERE dt_created IS NOT NULL"""
+
+
+# Абитуриент учитывается в дне и городе, которые у него были (old) и стали (updated):
+# меняет счётчики только смена города
+DAILY_DELTAS = f"{daily_deltas('old', -1)}\n        UNION ALL{daily_deltas('updated', 1)}"
+
+# Конфликт по телефону ничего не делает: ON CONFLICT DO NOTHING ждёт завершения параллельной вставки
+# того же номера, и тогда абитуриент обновляется как существующий
+INSERT_APPLICANT = text(f"""
+    WITH inserted AS (
+        INSERT INTO applicant (uuid, surname, name, patronymic, phone_number, city, dt_created)
+        VALUES (:uuid, :surname, :name, :patronymic, :phone_number, :city, :dt_created)
+        ON CONFLICT (phone_number) DO NOTHING
+        RETURNING uuid, dt_created, city
+    ), deltas AS ({daily_deltas("inserted", 1)}
+    ), counted AS ({apply_deltas("applicant_daily_count", "day, city", "deltas")}
+    )
+    SELECT uuid FROM inserted
+""").bindparams(
+    bindparam("uuid", type_=pg.UUID), bindparam("dt_created", type_=pg.TIMESTAMP)
+).columns(uuid=pg.UUID)
+
+LOCK_APPLICANT = text("SELECT uuid FROM applicant WHERE phone_number = :phone_number FOR UPDATE")
+
+# Строка заблокирована LOCK_APPLICANT, поэтому снимок запроса видит её последнюю версию и old — строка до обновления
+UPDATE_APPLICANT = text(f"""
+    WITH old AS (
+        SELECT dt_created, city FROM applicant WHERE phone_number = :phone_number
+    ), updated AS (
+        UPDATE applicant SET surname = :surname, name = :name, patronymic = :patronymic, city = :city
+        WHERE phone_number = :phone_number
+        RETURNING uuid, dt_created, city
+    ), deltas AS ({DAILY_DELTAS}
+    ), counted AS ({apply_deltas("applicant_daily_count", "day, city", "deltas")}
+    )
+    SELECT uuid FROM updated
+""").columns(uuid=pg.UUID)
+
+
+async def upsert_applicant(session: AsyncSession, uuid: UUID, surname: str, name: str, patronymic: str | None,
+                           phone_number: str, city: str | None, dt_created: datetime) -> tuple[UUID, bool]:
+    """
+    Insert the applicant or update the one with the same phone number, applying the change to the daily counts.
+
+    Args:
+        session: AsyncSession whose transaction the writes belong to
+        uuid: UUID for a new applicant
+        surname, name, patronymic, phone_number, city: Personal data
+        dt_created: Registration time of a new applicant
+
+    Returns:
+        tuple: UUID of the applicant and whether it was inserted
+
+    Notes:
+        - An existing applicant is locked before its old day and city are read, so concurrent writes
+          of the same phone number change the counts once each and never from a stale city
+        - One statement for a new applicant, three for an existing one
+    """
+    personal = dict(surname=surname, name=name, patronymic=patronymic, phone_number=phone_number, city=city)
+    inserted = (await session.exec(INSERT_APPLICANT.bindparams(uuid=uuid, dt_created=dt_created, **personal))).first()
+    if inserted is not None:
+        return inserted.uuid, True
+    await session.exec(LOCK_APPLICANT.bindparams(phone_number=phone_number))
+    updated = (await session.exec(UPDATE_APPLICANT.bindparams(**personal))).one()
+    return updated.uuid, False
+
+
+REPLACE_EXAMS = text(f"""
+    WITH deleted AS (
+        DELETE FROM applicantexam WHERE applicant_id = :applicant_id RETURNING exam_id, score
+    ), inserted AS (
+        INSERT INTO applicantexam (uuid, applicant_id, exam_id, score)
+        SELECT uuid, :applicant_id, exam_id, score
+        FROM unnest(CAST(:uuids AS UUID[]), CAST(:exam_ids AS UUID[]), CAST(:scores AS INTEGER[]))
+            AS new (uuid, exam_id, score)
+        RETURNING exam_id, score
+    ), deltas AS (
+        SELECT exam_id, score, -1 AS delta FROM deleted
+        UNION ALL
+        SELECT exam_id, score, 1 FROM inserted
+    ){apply_deltas("exam_score_histogram", "exam_id, score", "deltas")}
+""").bindparams(bindparam("applicant_id", type_=pg.UUID))
+
+REPLACE_COMPLIANCE = text(f"""
+    WITH deleted AS (
+        DELETE FROM applicant_faculty WHERE applicant_id = :applicant_id RETURNING faculty_type_id, compliance
+    ), inserted AS (
+        INSERT INTO applicant_faculty (uuid, applicant_id, faculty_type_id, compliance)
+        SELECT uuid, :applicant_id, faculty_type_id, compliance
+        FROM unnest(CAST(:uuids AS UUID[]), CAST(:faculty_type_ids AS UUID[]), CAST(:compliances AS INTEGER[]))
+            AS new (uuid, faculty_type_id, compliance)
+        RETURNING faculty_type_id, compliance
+    ), deltas AS (
+        SELECT faculty_type_id, compliance, -1 AS delta FROM deleted WHERE compliance IS NOT NULL
+        UNION ALL
+        SELECT faculty_type_id, compliance, 1 FROM inserted WHERE compliance IS NOT NULL
+    ){apply_deltas("faculty_type_compliance_histogram", "faculty_type_id, compliance", "deltas")}
+""").bindparams(bindparam("applicant_id", type_=pg.UUID))
+
+
+LOCK_APPLICANT_ROW = text(
+    "SELECT uuid FROM applicant WHERE uuid = :applicant_id FOR UPDATE"
+).bindparams(bindparam("applicant_id", type_=pg.UUID))
+
+
+def replace_exams(applicant_id: UUID, exams: dict[UUID, int]):
+    """
+    Statement replacing the exams of an applicant and applying the change to the exam score histogram.
+
+    Args:
+        applicant_id: UUID of the applicant
+        exams: New scores by exam id, empty to only delete
+    """
+    return REPLACE_EXAMS.bindparams(applicant_id=applicant_id, uuids=[uuid4() for _ in exams],
+                                    exam_ids=list(exams), scores=list(exams.values()))
+
+
+def lock_applicant(applicant_id: UUID):
+    """
+    Statement locking the applicant row until the end of the transaction.
+
+    Executed before `replace_compliance`: the replacement's own snapshot then sees the rows
+    a concurrent replacement committed, so it deletes them instead of adding a second set.
+    """
+    return LOCK_APPLICANT_ROW.bindparams(applicant_id=applicant_id)
+
+
+def replace_compliance(applicant_id: UUID, compliance: dict[UUID, int]):
+    """
+    Statement replacing the faculty type compliance of an applicant and applying the change to the histogram.
+
+    Args:
+        applicant_id: UUID of the applicant
+        compliance: New compliance by faculty type id, empty to only delete
+    """
+    return REPLACE_COMPLIANCE.bindparams(applicant_id=applicant_id, uuids=[uuid4() for _ in compliance],
+                                         faculty_type_ids=list(compliance), compliances=list(compliance.values()))
+
+
+async def rebuild_analytics(conn: AsyncConnection) -> None:
+    """Recount the aggregates from scratch, e.g. after a bulk load that bypassed the services"""
+    await conn.execute(delete(ApplicantDailyCount))
+    await conn.execute(delete(ComplianceHistogram))
+    await conn.execute(delete(ExamScoreHistogram))
+    day = cast(Applicant.dt_created, Date)
+    city = func.coalesce(Applicant.city, NO_CITY)
+    await conn.execute(pg.insert(ApplicantDailyCount).from_select(
+        ["day", "city", "count"],
+        select(day, city, func.count()).where(Applicant.dt_created.isnot(None)).group_by(day, city)
+    ))
+    await conn.execute(pg.insert(ComplianceHistogram).from_select(
+        ["faculty_type_id", "compliance", "count"],
+        select(ApplicantFaculty.faculty_type_id, ApplicantFaculty.compliance, func.count())
+        .where(ApplicantFaculty.compliance.isnot(None))
+        .group_by(ApplicantFaculty.faculty_type_id, ApplicantFaculty.compliance)
+    ))
+    await conn.execute(pg.insert(ExamScoreHistogram).from_select(
+        ["exam_id", "score", "count"],
+        select(ApplicantExam.exam_id, ApplicantExam.score, func.count())
+        .group_by(ApplicantExam.exam_id, ApplicantExam.score)
+    ))
+
+
+class AnalyticsService:
+    """
+    This class provides methods to read the admission analytics.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the AnalyticsService with a database session.
+
+        Args:
+            session: AsyncSession for database operations
+        """
+        self.session = session
+
+    async def get_analytics(self, days: int) -> AdmissionAnalytics:
+        """
+        Get applicants per day and city, and the compliance and exam score distributions.
+
+        Args:
+            days: Number of the last registration days to include, today among them
+
+        Returns:
+            AdmissionAnalytics: Read from the aggregate tables, whose size depends on the number of days,
+            cities, faculty types and exams, not on the number of applicants
+        """
+        reference = await reference_data.get(self.session)
+        since = date.today() - timedelta(days=days - 1)
+
+        daily = await self.session.exec(
+            select(ApplicantDailyCount.day, ApplicantDailyCount.city, ApplicantDailyCount.count)
+            .where(ApplicantDailyCount.day >= since, ApplicantDailyCount.count > 0)
+            .order_by(ApplicantDailyCount.day, ApplicantDailyCount.city)
+        )
+        applicants = [DailyApplicants(day=row.day, city=row.city or None, count=row.count) for row in daily]
+
+        # Гистограмма каждого типа и экзамена собирается в массивы одной строкой
+        compliance = []
+        for row in await self.session.exec(
+            select(ComplianceHistogram.faculty_type_id,
+                   func.array_agg(aggregate_order_by(ComplianceHistogram.compliance, ComplianceHistogram.compliance)),
+                   func.array_agg(aggregate_order_by(ComplianceHistogram.count, ComplianceHistogram.compliance)))
+            .where(ComplianceHistogram.count > 0)
+            .group_by(ComplianceHistogram.faculty_type_id)
+        ):
+            faculty_type_id, values, counts = row
+            name = reference.faculty_types.get(faculty_type_id)
+            if name is not None:
+                compliance.append(ComplianceDistribution(
+                    faculty_type_id=faculty_type_id, name=name, values=values, counts=counts
+                ))
+
+        exam_scores = []
+        for row in await self.session.exec(
+            select(ExamScoreHistogram.exam_id,
+                   func.array_agg(aggregate_order_by(ExamScoreHistogram.score, ExamScoreHistogram.score)),
+                   func.array_agg(aggregate_order_by(ExamScoreHistogram.count, ExamScoreHistogram.score)))
+            .where(ExamScoreHistogram.count > 0)
+            .group_by(ExamScoreHistogram.exam_id)
+        ):
+            exam_id, values, counts = row
+            exam = reference.exams.get(exam_id)
+            if exam is not None:
+                exam_scores.append(ExamScoreDistribution(
+                    exam_id=exam_id, code=exam.code, name=exam.name, values=values, counts=counts
+                ))
+
+        return AdmissionAnalytics(
+            applicants=applicants,
+            compliance=sorted(compliance, key=lambda distribution: distribution.name),
+            exam_scores=sorted(exam_scores, key=lambda distribution: distribution.code)
+        )
@@ -0,0 +1,162 @@
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import Select, literal
+from sqlmodel import select
+
+from backend.src.config import settings
+from backend.src.database.models import ApplicantResult
+from backend.src.applicants.schemas import ResponseResult
+from backend.src.applicants.serialization import dump_json
+
+
+# Пустой документ с пустой версией справочников означает "пересобрать при чтении"
+STALE = {"document": b"", "reference_version": ""}
+
+
+def serialize_result(result: ResponseResult) -> bytes:
+    """Serialize applicant results the same way the API responds with them"""
+    return dump_json(ResponseResult, result)
+
+
+def applicant_document_query(applicant_uuid: UUID):
+    """Select the stored document of an applicant with its revision and reference version"""
+    return (
+        select(ApplicantResult.revision, ApplicantResult.reference_version, ApplicantResult.document)
+        .where(ApplicantResult.applicant_id == applicant_uuid)
+    )
+
+
+def store_document(applicant_uuid: UUID, document: bytes, reference_version: str):
+    """
+    Statement writing a freshly built document, used by the write paths.
+
+    Args:
+        applicant_uuid: UUID of the applicant
+        document: Serialized ResponseResult
+        reference_version: Version of the reference snapshot the document was built with
+    """
+    statement = pg.insert(ApplicantResult).values(
+        applicant_id=applicant_uuid, revision=0, reference_version=reference_version, document=document
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[ApplicantResult.applicant_id],
+        set_={
+            "document": statement.excluded.document,
+            "reference_version": statement.excluded.reference_version,
+            "revision": ApplicantResult.revision + 1
+        }
+    )
+
+
+def store_rebuilt_document(applicant_uuid: UUID, document: bytes, reference_version: str, seen_revision: int | None):
+    """
+    Statement writing a document rebuilt on read.
+
+    It never overwrites a document written after the rebuild started: without a stored document it only
+    inserts, otherwise it updates only if the revision is still the one the reader saw.
+
+    Args:
+        applicant_uuid: UUID of the applicant
+        document: Serialized ResponseResult
+        reference_version: Version of the reference snapshot the document was built with
+        seen_revision: Revision of the stale document, None if there was none
+    """
+    statement = pg.insert(ApplicantResult).values(
+        applicant_id=applicant_uuid, revision=0, reference_version=reference_version, document=document
+    )
+    if seen_revision is None:
+        return statement.on_conflict_do_nothing(index_elements=[ApplicantResult.applicant_id])
+    return statement.on_conflict_do_update(
+        index_elements=[ApplicantResult.applicant_id],
+        set_={
+            "document": statement.excluded.document,
+            "reference_version": statement.excluded.reference_version,
+            "revision": ApplicantResult.revision + 1
+        },
+        where=ApplicantResult.revision == seen_revision
+    )
+
+
+def mark_document_stale(applicant_uuid: UUID):
+    """
+    Statement marking the document of an existing applicant for rebuild on the next read.
+
+    Args:
+        applicant_uuid: UUID of the applicant
+    """
+    statement = pg.insert(ApplicantResult).values(applicant_id=applicant_uuid, revision=0, **STALE)
+    return statement.on_conflict_do_update(
+        index_elements=[ApplicantResult.applicant_id],
+        set_={**STALE, "revision": ApplicantResult.revision + 1}
+    )
+
+
+def mark_documents_stale(applicant_ids: Select):
+    """
+    Statement marking the documents of many applicants for rebuild on the next read.
+
+    Args:
+        applicant_ids: Select of applicant UUIDs
+    """
+    statement = pg.insert(ApplicantResult).from_select(
+        ["applicant_id", "revision", "document", "reference_version"],
+        applicant_ids.add_columns(literal(0), literal(STALE["document"]), literal(STALE["reference_version"]))
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[ApplicantResult.applicant_id],
+        set_={**STALE, "revision": ApplicantResult.revision + 1}
+    )
+
+
+class ResultDocumentCache:
+    """
+    Optional in-process LRU of result documents with a TTL.
+
+    Writes made by this process drop their entries immediately; writes made by other processes
+    become visible once the entry expires, so the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Args:
+            max_size: Maximum number of documents, 0 disables the cache
+            ttl: Seconds a document is served from memory
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[UUID, tuple[float, str, bytes]] = OrderedDict()
+
+    def get(self, applicant_uuid: UUID, reference_version: str) -> bytes | None:
+        """Get a cached document built with the given reference version"""
+        entry = self._entries.get(applicant_uuid)
+        if entry is None:
+            return None
+        expires, version, document = entry
+        if expires < time.monotonic() or version != reference_version:
+            del self._entries[applicant_uuid]
+            return None
+        self._entries.move_to_end(applicant_uuid)
+        return document
+
+    def put(self, applicant_uuid: UUID, reference_version: str, document: bytes) -> None:
+        """Cache a document, evicting the least recently used one if full"""
+        if not self.max_size:
+            return
+        self._entries[applicant_uuid] = (time.monotonic() + self.ttl, reference_version, document)
+        self._entries.move_to_end(applicant_uuid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, applicant_uuid: UUID) -> None:
+        """Drop the cached document of an applicant"""
+        self._entries.pop(applicant_uuid, None)
+
+    def clear(self) -> None:
+        """Drop every cached document"""
+        self._entries.clear()
+
+
+result_cache = ResultDocumentCache(settings.RESULTS_CACHE_SIZE, settings.RESULTS_CACHE_TTL)
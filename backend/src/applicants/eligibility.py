@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.database.events import on_change
+from backend.src.database.models import Applicant, ApplicantExam, Exam, Faculty, FacultyExamRequirement
+from backend.src.database.snapshot import Snapshot
+from backend.src.applicants.schemas import Eligibility, EligibleFaculty, ExamMargin
+
+
+@dataclass(frozen=True)
+class RequirementRef:
+    """Требование факультета к экзамену в инвертированном индексе"""
+    faculty: int
+    bit: int
+    exam_code: str
+    min_score: int
+
+
+class EligibilityIndex:
+    """
+    Compiled FacultyExamRequirement table.
+
+    Requirements are indexed by exam, and every faculty has a bitset with one bit per requirement,
+    so an evaluation only touches the requirements of the exams the applicant took.
+    """
+
+    def __init__(self, rows: Iterable[tuple[UUID, str, str, UUID, str, int]]):
+        """
+        Build the index from requirement rows.
+
+        Args:
+            rows: (faculty_id, faculty_name, faculty_url, exam_id, exam_code, min_score) tuples
+        """
+        self.faculties: list[tuple[UUID, str, str]] = []
+        self.required_masks: list[int] = []
+        self.by_exam: dict[UUID, list[RequirementRef]] = {}
+        faculty_index: dict[UUID, int] = {}
+
+        for faculty_id, faculty_name, faculty_url, exam_id, exam_code, min_score in rows:
+            faculty = faculty_index.get(faculty_id)
+            if faculty is None:
+                faculty = faculty_index[faculty_id] = len(self.faculties)
+                self.faculties.append((faculty_id, faculty_name, faculty_url))
+                self.required_masks.append(0)
+            bit = self.required_masks[faculty].bit_length()
+            self.required_masks[faculty] |= 1 << bit
+            self.by_exam.setdefault(exam_id, []).append(RequirementRef(faculty, 1 << bit, exam_code, min_score))
+
+    def evaluate(self, scores: Mapping[UUID, int]) -> list[EligibleFaculty]:
+        """
+        Find the faculties whose every exam requirement is met.
+
+        Args:
+            scores: exam_id -> score
+
+        Returns:
+            list: Eligible faculties with per-exam margins, the largest overall margin first
+        """
+        satisfied: dict[int, int] = {}
+        margins: dict[int, list[ExamMargin]] = {}
+        for exam_id, score in scores.items():
+            for requirement in self.by_exam.get(exam_id, ()):
+                if score < requirement.min_score:
+                    continue
+                satisfied[requirement.faculty] = satisfied.get(requirement.faculty, 0) | requirement.bit
+                margins.setdefault(requirement.faculty, []).append(ExamMargin(
+                    exam_id=exam_id,
+                    exam_code=requirement.exam_code,
+                    min_score=requirement.min_score,
+                    score=score,
+                    margin=score - requirement.min_score
+                ))
+
+        eligible = []
+        for faculty, mask in satisfied.items():
+            if mask != self.required_masks[faculty]:
+                continue
+            faculty_id, name, url = self.faculties[faculty]
+            eligible.append(EligibleFaculty(
+                faculty_id=faculty_id,
+                name=name,
+                url=url,
+                margin=min(exam.margin for exam in margins[faculty]),
+                exams=margins[faculty]
+            ))
+        eligible.sort(key=lambda faculty: faculty.margin, reverse=True)
+        return eligible
+
+
+class EligibilityEngine(Snapshot[EligibilityIndex]):
+    """
+    Process-wide holder of the EligibilityIndex.
+
+    Rebuilt lazily after faculties, exams or their requirements change.
+    """
+
+    async def load(self, session: AsyncSession) -> EligibilityIndex:
+        result = await session.exec(
+            select(Faculty.uuid, Faculty.name, Faculty.url, Exam.uuid, Exam.code, FacultyExamRequirement.min_score)
+            .join(FacultyExamRequirement, Faculty.uuid == FacultyExamRequirement.faculty_id)
+            .join(Exam, Exam.uuid == FacultyExamRequirement.exam_id)
+        )
+        return EligibilityIndex(result.all())
+
+
+eligibility_engine = EligibilityEngine()
+on_change(Faculty, Exam, FacultyExamRequirement)(eligibility_engine.invalidate)
+
+
+def applicant_scores_query(applicant_uuid: UUID):
+    """Select the exam scores of an applicant, one row with NULL exam if there are none"""
+    return (
+        select(Applicant.uuid, ApplicantExam.exam_id, ApplicantExam.score)
+        .outerjoin(ApplicantExam, ApplicantExam.applicant_id == Applicant.uuid)
+        .where(Applicant.uuid == applicant_uuid)
+    )
+
+
+class EligibilityService:
+    """
+    This class provides methods to check applicants against faculty exam requirements.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the EligibilityService with a database session.
+
+        Args:
+            session: AsyncSession for database operations
+        """
+        self.session = session
+
+    async def get_applicant_scores(self, applicant_uuid: UUID) -> dict[UUID, int]:
+        """
+        Get the stored exam scores of an applicant.
+
+        Args:
+            applicant_uuid: UUID of the applicant
+
+        Returns:
+            dict: exam_id -> score
+
+        Raises:
+            HTTPException: 404 if applicant not found
+        """
+        rows = (await self.session.exec(applicant_scores_query(applicant_uuid))).all()
+        if not rows:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Applicant not found")
+        return {exam_id: score for _, exam_id, score in rows if exam_id is not None}
+
+    async def evaluate(self, scores: Mapping[UUID, int]) -> Eligibility:
+        """
+        Get the faculties the exam scores qualify for.
+
+        Args:
+            scores: exam_id -> score
+
+        Returns:
+            Eligibility: Qualifying faculties with margins
+        """
+        index = await eligibility_engine.get(self.session)
+        return Eligibility(faculties=index.evaluate(scores))
+
+    async def get_applicant_eligibility(self, applicant_uuid: UUID) -> Eligibility:
+        """
+        Get the faculties a stored applicant's exam scores qualify for.
+
+        Args:
+            applicant_uuid: UUID of the applicant
+
+        Returns:
+            Eligibility: Qualifying faculties with margins
+
+        Raises:
+            HTTPException: 404 if applicant not found
+        """
+        return await self.evaluate(await self.get_applicant_scores(applicant_uuid))
@@ -0,0 +1,41 @@
+"""
+Export applicants with exam scores and faculty type compliance, see `ApplicantExportService`.
+
+    python -m backend.src.applicants.export --format csv [--created-from 2025-06-01] [--created-to 2025-07-01]
+                                            [--city Краснодар] [--output applicants.csv]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from backend.src.database.main import async_engine, async_session_maker
+from backend.src.applicants.exporter import ApplicantExportService
+from backend.src.applicants.importer import CSV, JSONL
+
+
+async def main(file_format: str, created_from: datetime | None, created_to: datetime | None, city: str | None,
+               output: str | None) -> None:
+    """Write the export to `output`, or to stdout if it is not given"""
+    stream = open(output, "wb") if output else sys.stdout.buffer
+    try:
+        async with async_session_maker() as session:
+            service = ApplicantExportService(session)
+            async for chunk in service.export_applicants(file_format, created_from, created_to, city):
+                stream.write(chunk)
+    finally:
+        if output:
+            stream.close()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export applicants with exam scores and faculty type compliance")
+    parser.add_argument("--format", choices=(CSV, JSONL), default=CSV)
+    parser.add_argument("--created-from", type=datetime.fromisoformat, help="only applicants created at or after")
+    parser.add_argument("--created-to", type=datetime.fromisoformat, help="only applicants created before")
+    parser.add_argument("--city")
+    parser.add_argument("--output", help="file to write, stdout by default")
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.format, arguments.created_from, arguments.created_to, arguments.city,
+                     arguments.output))
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import JSON, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.config import settings
+from backend.src.database.models import Applicant, ApplicantExam, ApplicantFaculty
+from backend.src.applicants.importer import CSV, PERSONAL_FIELDS
+from backend.src.applicants.reference import reference_data
+
+
+# Колонки соответствия в CSV, чтобы названия типов факультетов не путались с кодами экзаменов
+COMPLIANCE_PREFIX = "compliance:"
+
+
+def export_query(created_from: datetime | None = None, created_to: datetime | None = None, city: str | None = None):
+    """
+    Select applicants with their exam scores and faculty type compliance aggregated into JSON objects.
+
+    Correlated subqueries keep one row per applicant without a GROUP BY over the whole table,
+    so the first rows are produced right away and the result can be read with a cursor.
+
+    Args:
+        created_from: Only applicants created at or after this time
+        created_to: Only applicants created before this time
+        city: Only applicants from this city
+    """
+    exams = (
+        select(func.json_object_agg(ApplicantExam.exam_id, ApplicantExam.score, type_=JSON))
+        .where(ApplicantExam.applicant_id == Applicant.uuid)
+        .scalar_subquery()
+    )
+    compliance = (
+        select(func.json_object_agg(ApplicantFaculty.faculty_type_id, ApplicantFaculty.compliance, type_=JSON))
+        .where(ApplicantFaculty.applicant_id == Applicant.uuid)
+        .scalar_subquery()
+    )
+    statement = select(Applicant.uuid, Applicant.dt_created,
+                       *(getattr(Applicant, field) for field in PERSONAL_FIELDS),
+                       exams.label("exams"), compliance.label("compliance"))
+    if created_from is not None:
+        statement = statement.where(Applicant.dt_created >= created_from)
+    if created_to is not None:
+        statement = statement.where(Applicant.dt_created < created_to)
+    if city is not None:
+        statement = statement.where(Applicant.city == city)
+    return statement
+
+
+class ApplicantExportService:
+    """
+    This class provides methods to export applicants with their results.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the ApplicantExportService with a database session.
+
+        Args:
+            session: AsyncSession for database operations
+        """
+        self.session = session
+
+    async def export_applicants(self, file_format: str, created_from: datetime | None = None,
+                                created_to: datetime | None = None, city: str | None = None) -> AsyncIterator[bytes]:
+        """
+        Export applicants as CSV or JSON Lines, row batch by row batch.
+
+        A CSV row has the applicant's fields, a column per exam code with the score and a
+        `compliance:<faculty type>` column per faculty type. A JSON Lines record has the applicant's fields,
+        `exams` mapping exam codes to scores and `compliance` mapping faculty type names to compliance.
+
+        Args:
+            file_format: CSV or JSONL
+            created_from: Only applicants created at or after this time
+            created_to: Only applicants created before this time
+            city: Only applicants from this city
+
+        Yields:
+            bytes: UTF-8 encoded lines of EXPORT_BATCH_SIZE applicants
+
+        Notes:
+            - Rows are read through a server-side cursor EXPORT_BATCH_SIZE at a time, so memory does not
+              depend on the number of applicants
+        """
+        reference = await reference_data.get(self.session)
+        exam_codes = {str(exam.uuid): exam.code for exam in reference.exams.values()}
+        faculty_types = {str(uuid): name for uuid, name in reference.faculty_types.items()}
+        exam_columns = sorted(exam_codes.values())
+        type_names = sorted(faculty_types.values())
+
+        if file_format == CSV:
+            yield self._csv_lines([["uuid", "dt_created", *PERSONAL_FIELDS, *exam_columns,
+                                    *(COMPLIANCE_PREFIX + name for name in type_names)]])
+        result = await self.session.stream(
+            export_query(created_from, created_to, city).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            records = [self._record(row, exam_codes, faculty_types) for row in rows]
+            if file_format == CSV:
+                yield self._csv_lines(
+                    [record["uuid"], record["dt_created"], *(record[field] for field in PERSONAL_FIELDS),
+                     *(record["exams"].get(code, "") for code in exam_columns),
+                     *(record["compliance"].get(name, "") for name in type_names)]
+                    for record in records
+                )
+            else:
+                yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode()
+
+    @staticmethod
+    def _record(row, exam_codes: dict[str, str], faculty_types: dict[str, str]) -> dict:
+        record = {"uuid": str(row.uuid), "dt_created": row.dt_created.isoformat() if row.dt_created else None}
+        record.update((field, getattr(row, field)) for field in PERSONAL_FIELDS)
+        # Экзамены и типы, которых нет в снимке справочников, пропускаем
+        record["exams"] = {exam_codes[exam_id]: score for exam_id, score in (row.exams or {}).items()
+                           if exam_id in exam_codes}
+        record["compliance"] = {faculty_types[type_id]: value for type_id, value in (row.compliance or {}).items()
+                                if type_id in faculty_types}
+        return record
+
+    @staticmethod
+    def _csv_lines(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode()
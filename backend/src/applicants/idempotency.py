@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, Request, Response, status
+
+from backend.src.config import settings
+
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Первый ответ на запрос с ключом идемпотентности и отпечаток тела запроса"""
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: str | None
+
+
+class IdempotencyStore:
+    """
+    In-process LRU of responses to requests carrying an Idempotency-Key, with a TTL.
+
+    A response is stored under (route, key) together with a hash of the request body. A retry
+    with the same key and body gets the stored response without running the route again;
+    a duplicate arriving while the first request is still running waits for its response.
+    The store is per process, so a retry landing on another worker runs the route again. Both writes
+    lock the applicant row before replacing its data, so a rerun, even a concurrent one, overwrites
+    the first run and the analytics count it once; it costs work, not correctness.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Args:
+            max_size: Maximum number of stored responses, 0 disables the store
+            ttl: Seconds a response is replayed
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[float, StoredResponse]] = OrderedDict()
+        # Выполняющиеся запросы: дубликаты ждут future, None означает, что первый запрос не дал ответа
+        self._in_flight: dict[tuple[str, str], tuple[str, asyncio.Future]] = {}
+
+    def get(self, route: str, key: str) -> StoredResponse | None:
+        """Get the stored response, None if there is none or it expired"""
+        entry = self._entries.get((route, key))
+        if entry is None:
+            return None
+        expires, stored = entry
+        if expires < time.monotonic():
+            del self._entries[(route, key)]
+            return None
+        self._entries.move_to_end((route, key))
+        return stored
+
+    def put(self, route: str, key: str, stored: StoredResponse) -> None:
+        """Store a response, evicting the least recently used one if full"""
+        self._entries[(route, key)] = (time.monotonic() + self.ttl, stored)
+        self._entries.move_to_end((route, key))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every stored response"""
+        self._entries.clear()
+
+    async def respond(self, request: Request, key: str | None, handle: Callable[[], Awaitable[Response]]) -> Response:
+        """
+        Run the route once per idempotency key and replay its response to retries.
+
+        Args:
+            request: Current request; its path and body identify the operation
+            key: Value of the Idempotency-Key header, None to just run the route
+            handle: Coroutine function running the route and returning its serialized response
+
+        Returns:
+            Response: The route's response, or the stored one with `Idempotent-Replayed: true`
+
+        Raises:
+            HTTPException: 422 if the key was already used with a different request body
+
+        Notes:
+            - Responses are stored only when `handle` returns; if it raises, waiting duplicates run
+              the route themselves
+        """
+        if key is None or not self.max_size:
+            return await handle()
+
+        route = request.url.path
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+        while True:
+            stored = self.get(route, key)
+            if stored is not None:
+                self._check(stored.fingerprint, fingerprint)
+                return Response(content=stored.body, status_code=stored.status_code, media_type=stored.media_type,
+                                headers={REPLAYED_HEADER: "true"})
+            in_flight = self._in_flight.get((route, key))
+            if in_flight is None:
+                break
+            self._check(in_flight[0], fingerprint)
+            await asyncio.shield(in_flight[1])
+
+        done = asyncio.get_running_loop().create_future()
+        self._in_flight[(route, key)] = (fingerprint, done)
+        stored = None
+        try:
+            response = await handle()
+            stored = StoredResponse(fingerprint, response.status_code, bytes(response.body), response.media_type)
+            self.put(route, key, stored)
+            return response
+        finally:
+            del self._in_flight[(route, key)]
+            done.set_result(stored)
+
+    @staticmethod
+    def _check(stored_fingerprint: str, fingerprint: str) -> None:
+        if stored_fingerprint != fingerprint:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                                detail="Idempotency-Key was already used with a different request body")
+
+
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_STORE_SIZE, settings.IDEMPOTENCY_TTL)
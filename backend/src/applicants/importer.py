@@ -0,0 +1,298 @@
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+import sqlalchemy.dialects.postgresql as pg
+from pydantic import ValidationError
+from sqlalchemy import Column, Integer, MetaData, String, Table, select, text
+from sqlalchemy.schema import CreateTable
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.config import settings
+from backend.src.database.models import Applicant
+from backend.src.applicants.reference import reference_data
+from backend.src.applicants.analytics import DAILY_DELTAS, apply_deltas, daily_deltas
+from backend.src.applicants.documents import mark_documents_stale, result_cache
+from backend.src.applicants.schemas import ImportedApplicant, ImportReport, ImportRowError
+
+
+CSV = "csv"
+JSONL = "jsonl"
+
+PERSONAL_FIELDS = ("surname", "name", "patronymic", "phone_number", "city")
+
+# Временные таблицы живут в рамках подключения и очищаются после каждого commit
+_staging = MetaData()
+
+applicant_staging = Table(
+    "applicant_import", _staging,
+    Column("uuid", pg.UUID),
+    Column("surname", String(30)),
+    Column("name", String(30)),
+    Column("patronymic", String(30)),
+    Column("phone_number", String(11)),
+    Column("city", String(30)),
+    Column("dt_created", pg.TIMESTAMP),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
+applicant_exam_staging = Table(
+    "applicant_exam_import", _staging,
+    Column("uuid", pg.UUID),
+    Column("phone_number", String(11)),
+    Column("exam_id", pg.UUID),
+    Column("score", Integer),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
+
+# Перенос из временных таблиц вместе с изменением сводок аналитики, см. `analytics`.
+# Сначала вставляются новые номера: ON CONFLICT DO NOTHING дожидается параллельных вставок тех же номеров,
+# после чего все строки файла уже есть в applicant, блокируются и обновляются со своими старыми значениями
+IMPORT_NEW_APPLICANTS = text(f"""
+    WITH inserted AS (
+        INSERT INTO applicant (uuid, {", ".join(PERSONAL_FIELDS)}, dt_created)
+        SELECT uuid, {", ".join(PERSONAL_FIELDS)}, dt_created FROM {applicant_staging.name}
+        ON CONFLICT (phone_number) DO NOTHING
+        RETURNING dt_created, city
+    ), deltas AS ({daily_deltas("inserted", 1)}
+    ){apply_deltas("applicant_daily_count", "day, city", "deltas")}
+""")
+
+LOCK_IMPORTED_APPLICANTS = text(f"""
+    SELECT applicant.uuid FROM applicant JOIN {applicant_staging.name} USING (phone_number)
+    ORDER BY applicant.phone_number FOR UPDATE OF applicant
+""")
+
+# Только что вставленные строки совпадают с файлом и не переписываются
+_CHANGED = ("(applicant.surname, applicant.name, applicant.patronymic, applicant.city) IS DISTINCT FROM "
+            "(staged.surname, staged.name, staged.patronymic, staged.city)")
+
+IMPORT_CHANGED_APPLICANTS = text(f"""
+    WITH old AS (
+        SELECT applicant.dt_created, applicant.city
+        FROM applicant JOIN {applicant_staging.name} staged USING (phone_number)
+        WHERE {_CHANGED}
+    ), updated AS (
+        UPDATE applicant
+        SET surname = staged.surname, name = staged.name, patronymic = staged.patronymic, city = staged.city
+        FROM {applicant_staging.name} staged
+        WHERE applicant.phone_number = staged.phone_number AND {_CHANGED}
+        RETURNING applicant.dt_created, applicant.city
+    ), deltas AS ({DAILY_DELTAS}
+    ){apply_deltas("applicant_daily_count", "day, city", "deltas")}
+""")
+
+IMPORT_EXAMS = text(f"""
+    WITH deleted AS (
+        DELETE FROM applicantexam USING applicant, {applicant_staging.name} staged
+        WHERE applicantexam.applicant_id = applicant.uuid AND applicant.phone_number = staged.phone_number
+        RETURNING applicantexam.exam_id, applicantexam.score
+    ), inserted AS (
+        INSERT INTO applicantexam (uuid, applicant_id, exam_id, score)
+        SELECT staged.uuid, applicant.uuid, staged.exam_id, staged.score
+        FROM {applicant_exam_staging.name} staged JOIN applicant USING (phone_number)
+        RETURNING exam_id, score
+    ), deltas AS (
+        SELECT exam_id, score, -1 AS delta FROM deleted
+        UNION ALL
+        SELECT exam_id, score, 1 FROM inserted
+    ){apply_deltas("exam_score_histogram", "exam_id, score", "deltas")}
+""")
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into text lines without reading it whole.
+
+    Args:
+        stream: UTF-8 encoded body chunks
+
+    Yields:
+        Lines without line terminators
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in stream:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, list[str]]]:
+    """
+    Group lines into CSV records, so a quoted field may span several lines.
+
+    Args:
+        lines: Lines without line terminators
+
+    Yields:
+        Number of the first line of the record and its values; blank lines between records are skipped
+    """
+    line_number = 0
+    first_line = 0
+    pending: list[str] = []
+    quotes = 0
+    async for line in lines:
+        line_number += 1
+        if not pending:
+            if not line.strip():
+                continue
+            first_line = line_number
+        pending.append(line)
+        # Кавычка внутри поля удваивается, поэтому при нечётном числе кавычек поле ещё не закрыто
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield first_line, next(csv.reader(["\n".join(pending)]))
+            pending = []
+            quotes = 0
+    if pending:
+        yield first_line, next(csv.reader(["\n".join(pending)]))
+
+
+class ApplicantImportService:
+    """
+    This class provides methods to bulk import applicants with their exam scores.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the ApplicantImportService with a database session.
+
+        Args:
+            session: AsyncSession for database operations
+        """
+        self.session = session
+
+    async def import_applicants(self, lines: AsyncIterator[str], file_format: str) -> ImportReport:
+        """
+        Import applicants from CSV or JSON Lines, chunk by chunk.
+
+        CSV needs a header with the personal fields; every other column is an exam code with the score
+        as its value. A JSON Lines record is an object with the personal fields and `exams` mapping exam
+        codes to scores. Existing applicants are matched by phone number, their data and exams are replaced.
+
+        Args:
+            lines: Lines of the uploaded file
+            file_format: CSV or JSONL
+
+        Returns:
+            ImportReport: Row counts and per-row validation errors
+
+        Notes:
+            - Every chunk of IMPORT_CHUNK_SIZE rows is committed separately
+            - Errors are listed for the first IMPORT_MAX_ERRORS failed rows only, so a file failing on every
+              row does not grow the report with its size
+        """
+        reference = await reference_data.get(self.session)
+        exam_ids = {exam.code: exam.uuid for exam in reference.exams.values()}
+        report = ImportReport(processed=0, imported=0, failed=0, errors=[])
+        chunk: dict[str, tuple[ImportedApplicant, dict[UUID, int]]] = {}
+
+        async for line_number, record, errors in self._parse(lines, file_format):
+            report.processed += 1
+            if not errors:
+                applicant, exams, errors = self._validate(record, exam_ids)
+            if errors:
+                report.failed += 1
+                if len(report.errors) < settings.IMPORT_MAX_ERRORS:
+                    report.errors.append(ImportRowError(line=line_number, errors=errors))
+                continue
+            # Повторный номер телефона в пределах файла: побеждает последняя строка
+            chunk[applicant.phone_number] = (applicant, exams)
+            if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+                report.imported += await self._load_chunk(list(chunk.values()))
+                chunk.clear()
+
+        if chunk:
+            report.imported += await self._load_chunk(list(chunk.values()))
+        return report
+
+    @staticmethod
+    async def _parse(lines: AsyncIterator[str], file_format: str) -> AsyncIterator[tuple[int, dict, list[str]]]:
+        if file_format == CSV:
+            header = None
+            async for line_number, values in iter_csv_records(lines):
+                if header is None:
+                    header = [column.strip() for column in values]
+                    continue
+                personal = {column: value or None for column, value in zip(header, values)
+                            if column in PERSONAL_FIELDS}
+                personal["exams"] = {column: value for column, value in zip(header, values)
+                                     if column not in PERSONAL_FIELDS and value}
+                yield line_number, personal, []
+            return
+
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, {}, [f"Invalid JSON: {exc.msg}"]
+                continue
+            yield line_number, record, []
+
+    @staticmethod
+    def _validate(record: dict, exam_ids: dict[str, UUID]) -> tuple[ImportedApplicant | None, dict[UUID, int],
+                                                                    list[str]]:
+        try:
+            applicant = ImportedApplicant.model_validate(record)
+        except ValidationError as exc:
+            return None, {}, [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()]
+
+        errors = []
+        exams = {}
+        for code, score in applicant.exams.items():
+            if code not in exam_ids:
+                errors.append(f"Exam with code {code} not found")
+            elif not 0 <= score <= 100:
+                errors.append(f"exams.{code}: score must be between 0 and 100")
+            else:
+                exams[exam_ids[code]] = score
+        return applicant, exams, errors
+
+    async def _load_chunk(self, chunk: list[tuple[ImportedApplicant, dict[UUID, int]]]) -> int:
+        connection = await self.session.connection()
+        for table in (applicant_staging, applicant_exam_staging):
+            await connection.execute(CreateTable(table, if_not_exists=True))
+
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        now = datetime.now()
+        await driver_connection.copy_records_to_table(
+            applicant_staging.name,
+            columns=[column.name for column in applicant_staging.columns],
+            records=[(uuid4(), applicant.surname, applicant.name, applicant.patronymic,
+                      applicant.phone_number, applicant.city, now)
+                     for applicant, _ in chunk],
+        )
+        await driver_connection.copy_records_to_table(
+            applicant_exam_staging.name,
+            columns=[column.name for column in applicant_exam_staging.columns],
+            records=[(uuid4(), applicant.phone_number, exam_id, score)
+                     for applicant, exams in chunk for exam_id, score in exams.items()],
+        )
+
+        await self.session.exec(IMPORT_NEW_APPLICANTS)
+        await self.session.exec(LOCK_IMPORTED_APPLICANTS)
+        await self.session.exec(IMPORT_CHANGED_APPLICANTS)
+        await self.session.exec(IMPORT_EXAMS)
+        imported_applicants = select(Applicant.uuid).join(
+            applicant_staging, applicant_staging.c.phone_number == Applicant.phone_number
+        )
+        await self.session.exec(mark_documents_stale(imported_applicants))
+
+        await self.session.commit()
+        result_cache.clear()
+        return len(chunk)
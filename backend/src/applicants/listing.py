@@ -0,0 +1,150 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import JSON, func, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.database.models import Applicant, ApplicantExam
+from backend.src.applicants.importer import PERSONAL_FIELDS
+from backend.src.applicants.reference import reference_data, ReferenceSnapshot
+from backend.src.applicants.schemas import ApplicantExamResult, ApplicantListItem, ApplicantPage
+
+
+def encode_cursor(dt_created: datetime, applicant_uuid: UUID) -> str:
+    """Opaque cursor pointing right after the applicant with this sort key"""
+    return base64.urlsafe_b64encode(f"{dt_created.isoformat()}|{applicant_uuid}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Read the sort key back from a cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor was not issued by `encode_cursor`
+    """
+    try:
+        dt_created, applicant_uuid = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split("|")
+        return datetime.fromisoformat(dt_created), UUID(applicant_uuid)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def listing_query(limit: int, after: tuple[datetime, UUID] | None = None, city: str | None = None,
+                  created_from: datetime | None = None, created_to: datetime | None = None,
+                  include_exams: bool = False):
+    """
+    Select a page of applicants in (dt_created, uuid) order.
+
+    The page starts right after the `after` key instead of skipping rows with OFFSET, so the
+    (dt_created, uuid) and (city, dt_created, uuid) indexes find it at the same cost at any depth.
+    Applicants without `dt_created` have no place in this order and are not listed.
+
+    Args:
+        limit: Number of applicants to select
+        after: Sort key of the last applicant of the previous page
+        city: Only applicants from this city
+        created_from: Only applicants created at or after this time
+        created_to: Only applicants created before this time
+        include_exams: Add the `exams` column mapping exam ids to scores
+    """
+    columns = [Applicant.uuid, Applicant.dt_created, *(getattr(Applicant, field) for field in PERSONAL_FIELDS)]
+    if include_exams:
+        # Коррелированный подзапрос читает экзамены только строк страницы, по индексу applicant_id
+        columns.append(
+            select(func.json_object_agg(ApplicantExam.exam_id, ApplicantExam.score, type_=JSON))
+            .where(ApplicantExam.applicant_id == Applicant.uuid)
+            .scalar_subquery()
+            .label("exams")
+        )
+    statement = (
+        select(*columns)
+        .where(Applicant.dt_created.isnot(None))
+        .order_by(Applicant.dt_created, Applicant.uuid)
+        .limit(limit)
+    )
+    if after is not None:
+        statement = statement.where(tuple_(Applicant.dt_created, Applicant.uuid) > tuple_(*after))
+    if city is not None:
+        statement = statement.where(Applicant.city == city)
+    if created_from is not None:
+        statement = statement.where(Applicant.dt_created >= created_from)
+    if created_to is not None:
+        statement = statement.where(Applicant.dt_created < created_to)
+    return statement
+
+
+class ApplicantListService:
+    """
+    This class provides methods to browse applicants page by page.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the ApplicantListService with a database session.
+
+        Args:
+            session: AsyncSession for database operations
+        """
+        self.session = session
+
+    async def list_applicants(self, limit: int, cursor: str | None = None, city: str | None = None,
+                              created_from: datetime | None = None, created_to: datetime | None = None,
+                              include_exams: bool = False) -> ApplicantPage:
+        """
+        Get a page of applicants ordered by creation time.
+
+        Args:
+            limit: Maximum number of applicants on the page
+            cursor: `next_cursor` of the previous page, None for the first page
+            city: Only applicants from this city
+            created_from: Only applicants created at or after this time
+            created_to: Only applicants created before this time
+            include_exams: Add the exam scores of every applicant
+
+        Returns:
+            ApplicantPage: Applicants and the cursor of the next page, None on the last page
+
+        Raises:
+            HTTPException: 400 if the cursor is invalid
+
+        Notes:
+            - The filters are not part of the cursor, pass the same ones for every page
+            - One query per page, with or without the exams
+        """
+        after = decode_cursor(cursor) if cursor is not None else None
+        # Лишняя строка показывает, есть ли следующая страница
+        rows = (await self.session.exec(
+            listing_query(limit + 1, after, city, created_from, created_to, include_exams)
+        )).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        reference = await reference_data.get(self.session) if include_exams else None
+
+        last = rows[-1] if rows else None
+        return ApplicantPage(
+            items=[
+                ApplicantListItem(
+                    uuid=row.uuid,
+                    dt_created=row.dt_created,
+                    **{field: getattr(row, field) for field in PERSONAL_FIELDS},
+                    exams=self._exams(row.exams, reference) if include_exams else None
+                )
+                for row in rows
+            ],
+            next_cursor=encode_cursor(last.dt_created, last.uuid) if has_more else None
+        )
+
+    @staticmethod
+    def _exams(scores: dict | None, reference: ReferenceSnapshot) -> list[ApplicantExamResult]:
+        exams = []
+        # Экзамены, которых нет в снимке справочников, пропускаем
+        for exam_id, score in (scores or {}).items():
+            exam = reference.exams.get(UUID(exam_id))
+            if exam is not None:
+                exams.append(ApplicantExamResult(exam_id=exam.uuid, exam_name=exam.name, exam_code=exam.code,
+                                                 score=score))
+        return exams
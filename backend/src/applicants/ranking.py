@@ -0,0 +1,142 @@
+import heapq
+from typing import Mapping
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.config import settings
+from backend.src.applicants.eligibility import EligibilityIndex, eligibility_engine
+from backend.src.applicants.reference import ReferenceSnapshot, reference_data
+from backend.src.applicants.schemas import Recommendations, RecommendedFaculty
+from backend.src.applicants.service import applicant_results_query
+
+
+class RankingTable:
+    """
+    Precomputed per-faculty feature columns used to rank faculties for an applicant.
+
+    Built from the reference snapshot and the eligibility index; scoring an applicant fills
+    two columns (test compliance of the faculty type and exam fit) and combines them per faculty.
+    """
+
+    def __init__(self, reference: ReferenceSnapshot, index: EligibilityIndex):
+        self.reference = reference
+        self.index = index
+
+        self.faculties = [faculty for type_id in reference.faculty_types
+                          for faculty in reference.faculties_by_type.get(type_id, ())]
+        self.rows = {faculty.uuid: row for row, faculty in enumerate(self.faculties)}
+        self.type_ids = [faculty.type_id for faculty in self.faculties]
+        required = {faculty_id for faculty_id, _, _ in index.faculties}
+        self.has_requirements = [faculty.uuid in required for faculty in self.faculties]
+
+    def top(self, compliance: Mapping[UUID, int], exam_scores: Mapping[UUID, int], k: int) -> list[RecommendedFaculty]:
+        """
+        Rank the faculties and return the best K.
+
+        Compliance is normalized by the applicant's best faculty type. Exam fit is 0 for faculties whose
+        requirements are not met, 0.5 for faculties without requirements and grows from 0.5 to 1 with
+        the margin up to RANKING_MARGIN_CAP for eligible ones.
+
+        Args:
+            compliance: faculty_type_id -> compliance from the test
+            exam_scores: exam_id -> score
+            k: Number of faculties to return
+
+        Returns:
+            list: Best faculties, highest score first
+        """
+        best_compliance = max(compliance.values(), default=0) or 1
+        compliance_column = [compliance.get(type_id, 0) for type_id in self.type_ids]
+        exam_fit = [0.0 if required else 0.5 for required in self.has_requirements]
+        margins: list[int | None] = [None] * len(self.faculties)
+
+        margin_cap = settings.RANKING_MARGIN_CAP
+        for eligible in self.index.evaluate(exam_scores):
+            row = self.rows.get(eligible.faculty_id)
+            if row is None:
+                continue
+            margins[row] = eligible.margin
+            exam_fit[row] = 0.5 + 0.5 * min(eligible.margin, margin_cap) / margin_cap
+
+        compliance_weight = settings.RANKING_COMPLIANCE_WEIGHT / best_compliance
+        exam_weight = settings.RANKING_EXAM_WEIGHT
+        scores = [compliance_weight * value + exam_weight * fit for value, fit in zip(compliance_column, exam_fit)]
+
+        return [
+            RecommendedFaculty(
+                faculty_id=self.faculties[row].uuid,
+                name=self.faculties[row].name,
+                url=self.faculties[row].url,
+                faculty_type=self.reference.faculty_types[self.type_ids[row]],
+                compliance=compliance_column[row],
+                eligible=margins[row] is not None if self.has_requirements[row] else None,
+                margin=margins[row],
+                score=round(scores[row], 4)
+            )
+            for row in heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+        ]
+
+
+class FacultyRanking:
+    """
+    Process-wide holder of the RankingTable, rebuilt whenever the snapshots it is derived from change.
+    """
+
+    def __init__(self):
+        self._table: RankingTable | None = None
+
+    async def get(self, session: AsyncSession) -> RankingTable:
+        reference = await reference_data.get(session)
+        index = await eligibility_engine.get(session)
+        table = self._table
+        if table is None or table.reference is not reference or table.index is not index:
+            table = self._table = RankingTable(reference, index)
+        return table
+
+
+faculty_ranking = FacultyRanking()
+
+
+class RecommendationService:
+    """
+    This class provides methods to recommend faculties to applicants.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the RecommendationService with a database session.
+
+        Args:
+            session: AsyncSession for database operations
+        """
+        self.session = session
+
+    async def get_recommendations(self, applicant_uuid: UUID, k: int) -> Recommendations:
+        """
+        Get the best K faculties for an applicant by test compliance and exam requirements.
+
+        Args:
+            applicant_uuid: UUID of the applicant
+            k: Number of faculties to return
+
+        Returns:
+            Recommendations: Best faculties, highest score first
+
+        Raises:
+            HTTPException: 404 if applicant not found
+        """
+        row = (await self.session.exec(applicant_results_query(applicant_uuid))).first()
+        if not row:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Applicant not found")
+        _, exams, faculty_types = row
+
+        table = await faculty_ranking.get(self.session)
+        compliance = {UUID(faculty_type["faculty_type_id"]): faculty_type["compliance"] or 0
+                      for faculty_type in faculty_types}
+        exam_scores = {}
+        for exam in exams:
+            exam_id = UUID(exam["exam_id"])
+            exam_scores[exam_id] = max(exam["score"], exam_scores.get(exam_id, 0))
+        return Recommendations(faculties=table.top(compliance, exam_scores, k))
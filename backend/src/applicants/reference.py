@@ -0,0 +1,100 @@
+import hashlib
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+from uuid import UUID
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.database.events import on_change
+from backend.src.database.models import FacultyType, Faculty, Exam
+from backend.src.database.snapshot import Snapshot
+from backend.src.applicants.schemas import FacultyTypeSch, Faculty as FacultySch
+
+
+@dataclass(frozen=True)
+class FacultyRef:
+    """Факультет из справочника"""
+    uuid: UUID
+    name: str
+    url: str
+    type_id: UUID
+
+
+@dataclass(frozen=True)
+class ExamRef:
+    """Экзамен из справочника"""
+    uuid: UUID
+    name: str
+    code: str
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """
+    Immutable copy of the FacultyType, Faculty and Exam tables.
+
+    `version` is a hash of the content, so every process holding the same data reports the same version.
+    """
+    version: str
+    faculty_types: Mapping[UUID, str]
+    faculties_by_type: Mapping[UUID, tuple[FacultyRef, ...]]
+    exams: Mapping[UUID, ExamRef]
+
+    def faculty_type_result(self, faculty_type_id: UUID, compliance: int) -> FacultyTypeSch | None:
+        """
+        Build the result entry for a faculty type.
+
+        Args:
+            faculty_type_id: UUID of the faculty type
+            compliance: Applicant's compliance with the type
+
+        Returns:
+            FacultyTypeSch with the type's faculties, or None if the type does not exist
+        """
+        name = self.faculty_types.get(faculty_type_id)
+        if name is None:
+            return None
+        return FacultyTypeSch(
+            name=name,
+            compliance=compliance,
+            faculties=[FacultySch(name=faculty.name, url=faculty.url)
+                       for faculty in self.faculties_by_type.get(faculty_type_id, ())]
+        )
+
+
+class ReferenceData(Snapshot[ReferenceSnapshot]):
+    """
+    Process-wide holder of the ReferenceSnapshot.
+
+    Built in the application lifespan and rebuilt lazily after the reference tables change.
+    """
+
+    async def load(self, session: AsyncSession) -> ReferenceSnapshot:
+        faculty_types = (await session.exec(select(FacultyType.uuid, FacultyType.name))).all()
+        faculties = (await session.exec(
+            select(Faculty.uuid, Faculty.name, Faculty.url, Faculty.type_id)
+        )).all()
+        exams = (await session.exec(select(Exam.uuid, Exam.name, Exam.code))).all()
+
+        faculties_by_type: dict[UUID, list[FacultyRef]] = {}
+        for row in faculties:
+            faculties_by_type.setdefault(row.type_id, []).append(FacultyRef(*row))
+
+        digest = hashlib.sha256()
+        for rows in (faculty_types, faculties, exams):
+            digest.update(repr(sorted(tuple(map(str, row)) for row in rows)).encode())
+
+        return ReferenceSnapshot(
+            version=digest.hexdigest()[:16],
+            faculty_types=MappingProxyType({row.uuid: row.name for row in faculty_types}),
+            faculties_by_type=MappingProxyType({
+                type_id: tuple(items) for type_id, items in faculties_by_type.items()
+            }),
+            exams=MappingProxyType({row.uuid: ExamRef(*row) for row in exams}),
+        )
+
+
+reference_data = ReferenceData()
+on_change(FacultyType, Faculty, Exam)(reference_data.invalidate)
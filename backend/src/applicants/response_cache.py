@@ -0,0 +1,134 @@
+import asyncio
+import gzip
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response, status
+
+from backend.src.database.events import on_change
+from backend.src.database.models import Question, Answer, Exam, Faculty, FacultyExamRequirement
+from backend.src.applicants.serialization import dump_json
+
+
+QUESTIONS = "questions"
+EXAMS = "exams"
+REQUIRED_EXAMS = "required_exams"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Serialized response body with its compressed variant and validator"""
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+
+class ResponseStore:
+    """
+    In-memory store of serialized responses for rarely changing reference endpoints.
+
+    Entries are built on first request, answered with 304 when the client already has
+    the current version and dropped when the underlying tables change.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, CachedResponse] = {}
+        self._generations: dict[str, int] = defaultdict(int)
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the entry so the next request rebuilds it"""
+        self._generations[key] += 1
+        self._entries.pop(key, None)
+
+    async def get(self, key: str, build: Callable[[], Awaitable[Any]], response_model: Any) -> CachedResponse:
+        """
+        Get the cached entry, building and serializing it if needed.
+
+        Args:
+            key: Entry name
+            build: Coroutine function returning the response data
+            response_model: Type used to serialize the data
+
+        Returns:
+            CachedResponse: Serialized body, gzip variant and ETag
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        async with self._locks[key]:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry
+            generation = self._generations[key]
+            body = dump_json(response_model, await build())
+            entry = CachedResponse(
+                body=body,
+                gzip_body=gzip.compress(body, mtime=0),
+                etag=f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+            )
+            if generation == self._generations[key]:
+                self._entries[key] = entry
+            return entry
+
+    async def respond(self, request: Request, key: str, build: Callable[[], Awaitable[Any]],
+                      response_model: Any) -> Response:
+        """
+        Answer the request from the store.
+
+        Args:
+            request: Incoming request, used for If-None-Match and Accept-Encoding
+            key: Entry name
+            build: Coroutine function returning the response data
+            response_model: Type used to serialize the data
+
+        Returns:
+            Response: 304 if the client's copy is current, otherwise the (compressed) body
+        """
+        entry = await self.get(key, build, response_model)
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, entry.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        if _accepts_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=entry.gzip_body, media_type="application/json", headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Для If-None-Match используется слабое сравнение
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    # q=0 означает отказ от кодировки; gzip, не названный явно, разрешает только "*"
+    qualities = {}
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip()] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
+response_store = ResponseStore()
+on_change(Question, Answer)(partial(response_store.invalidate, QUESTIONS))
+on_change(Exam)(partial(response_store.invalidate, EXAMS))
+on_change(Exam, Faculty, FacultyExamRequirement)(partial(response_store.invalidate, REQUIRED_EXAMS))
@@ -1,44 +1,202 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 from uuid import UUID
 from typing import List
+from datetime import datetime
 
-from backend.src.database.main import get_session
+from backend.src.config import settings
+from backend.src.database.main import get_session, get_read_session
 from backend.src.applicants.schemas import (
     ResponseResult, ApplicantAnswers, ApplicantInfo, ApplicantUUIDResponse,
-    QuestionSch, AnswerSch, Exam, Exams, RequiredExams
+    QuestionSch, AnswerSch, Exam, Exams, RequiredExams, ImportReport, Eligibility, EligibilityRequest,
+    Recommendations, ApplicantResultsRequest, ApplicantResultsBatch, AdmissionAnalytics, ApplicantPage,
+    ApplicantSearchResults
 )
 from .service import ResultService, QuestionService, ExamsService
+from .eligibility import EligibilityService
+from .ranking import RecommendationService
+from .importer import ApplicantImportService, iter_lines, CSV, JSONL
+from .exporter import ApplicantExportService
+from .analytics import AnalyticsService
+from .listing import ApplicantListService
+from .search import ApplicantSearchService
+from .response_cache import response_store, QUESTIONS, EXAMS, REQUIRED_EXAMS
+from .serialization import dump_json, json_response
+from .idempotency import idempotency_store
+from backend.src.internal.admission import admission_control, READ, WRITE, BULK
+from backend.src.internal.metrics import TimedRoute
 
-api_router = APIRouter(prefix="/backend/api")
+api_router = APIRouter(prefix="/backend/api", route_class=TimedRoute)
 
 @api_router.post("/applicant/register/", 
+                dependencies=[admission_control.dependency(WRITE)],
                 status_code=status.HTTP_200_OK, 
                 response_model=ApplicantUUIDResponse,
                 summary="Register or get applicant",
                 description="Registers new applicant or returns existing one by phone number")
-async def register_applicant(user_data: ApplicantInfo, 
+async def register_applicant(user_data: ApplicantInfo, request: Request,
+                           idempotency_key: str | None = Header(default=None, max_length=255),
                            session: AsyncSession = Depends(get_session)):
     """
     Register new applicant or get existing one by phone number.
     
     Args:
         user_data: Contains applicant personal information
+        idempotency_key: Retries with the same key and body get the first response replayed
         
     Returns:
         Dictionary with applicant UUID: {"uuid": "..."}
+
+    Raises:
+        HTTPException: 422 if the idempotency key was used with a different body
     """
     service = ResultService(session)
-    uuid = await service.register_or_get_applicant(user_data)
-    return {"uuid": uuid}
+
+    async def register() -> Response:
+        uuid = await service.register_or_get_applicant(user_data)
+        return Response(content=dump_json(ApplicantUUIDResponse, ApplicantUUIDResponse(uuid=uuid)),
+                        media_type="application/json")
+
+    if idempotency_key is None:
+        return {"uuid": await service.register_or_get_applicant(user_data)}
+    return await idempotency_store.respond(request, idempotency_key, register)
+
+@api_router.post("/applicant/import/",
+                dependencies=[admission_control.dependency(BULK)],
+                status_code=status.HTTP_200_OK,
+                response_model=ImportReport,
+                summary="Bulk import applicants",
+                description="Imports applicants with exam scores from a CSV or JSON Lines request body")
+async def import_applicants(request: Request,
+                            session: AsyncSession = Depends(get_session)):
+    """
+    Bulk import applicants from the request body.
+
+    The body is read as a stream and loaded in chunks, and only the first IMPORT_MAX_ERRORS row errors
+    are kept, so files of any size use bounded memory.
+
+    Returns:
+        Import report with row counts and the first row errors
+
+    Raises:
+        HTTPException: 415 if the body is neither CSV nor JSON Lines
+    """
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        file_format = CSV
+    elif "json" in content_type:
+        file_format = JSONL
+    else:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="Expected text/csv or application/x-ndjson body")
+
+    service = ApplicantImportService(session)
+    return await service.import_applicants(iter_lines(request.stream()), file_format)
+
+@api_router.get("/applicants/export",
+               dependencies=[admission_control.dependency(BULK)],
+               status_code=status.HTTP_200_OK,
+               response_class=StreamingResponse,
+               summary="Export applicants",
+               description="Streams every applicant with exam scores and faculty type compliance as CSV or JSON Lines")
+async def export_applicants(file_format: str = Query(default=CSV, alias="format", pattern=f"^({CSV}|{JSONL})$"),
+                            created_from: datetime | None = Query(default=None, description="Created at or after"),
+                            created_to: datetime | None = Query(default=None, description="Created before"),
+                            city: str | None = Query(default=None),
+                            session: AsyncSession = Depends(get_read_session)):
+    """
+    Export applicants for the faculties' reports.
+
+    Rows are written to the response as they are read from a server-side cursor, so exports of any size
+    use bounded memory.
+
+    Args:
+        file_format: csv or jsonl
+        created_from: Only applicants created at or after this time
+        created_to: Only applicants created before this time
+        city: Only applicants from this city
+
+    Returns:
+        Streamed CSV or JSON Lines file
+    """
+    service = ApplicantExportService(session)
+    media_type = "text/csv" if file_format == CSV else "application/x-ndjson"
+    return StreamingResponse(
+        service.export_applicants(file_format, created_from, created_to, city),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="applicants.{file_format}"'}
+    )
+
+@api_router.get("/applicants/",
+               dependencies=[admission_control.dependency(READ)],
+               status_code=status.HTTP_200_OK,
+               response_model=ApplicantPage,
+               summary="List applicants",
+               description="Returns a page of applicants ordered by creation time, "
+                           "with the cursor of the next page")
+async def list_applicants(limit: int = Query(default=100, ge=1, le=1000, description="Page size"),
+                          cursor: str | None = Query(default=None, description="next_cursor of the previous page"),
+                          city: str | None = Query(default=None),
+                          created_from: datetime | None = Query(default=None, description="Created at or after"),
+                          created_to: datetime | None = Query(default=None, description="Created before"),
+                          include_exams: bool = Query(default=False, description="Add exam scores"),
+                          session: AsyncSession = Depends(get_read_session)):
+    """
+    Browse applicants for the admin tools.
+
+    Pages are found by the sort key of the previous page rather than by offset, so a page deep
+    in the list costs as much as the first one.
+
+    Args:
+        limit: Maximum number of applicants on the page
+        cursor: Cursor of the previous page, omitted for the first page
+        city: Only applicants from this city
+        created_from: Only applicants created at or after this time
+        created_to: Only applicants created before this time
+        include_exams: Add the exam scores of every applicant
+
+    Returns:
+        Applicants and the cursor of the next page
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    service = ApplicantListService(session)
+    page = await service.list_applicants(limit, cursor, city, created_from, created_to, include_exams)
+    return json_response(page, ApplicantPage)
+
+@api_router.get("/applicants/search",
+               dependencies=[admission_control.dependency(READ)],
+               status_code=status.HTTP_200_OK,
+               response_model=ApplicantSearchResults,
+               summary="Search applicants",
+               description="Finds applicants by a fragment or a misspelling of their surname, name, "
+                           "patronymic or city, best matches first")
+async def search_applicants(q: str = Query(min_length=2, max_length=100, description="Search text"),
+                            limit: int = Query(default=20, ge=1, le=100, description="Maximum number of results"),
+                            session: AsyncSession = Depends(get_read_session)):
+    """
+    Look applicants up for the call centre.
+
+    Args:
+        q: Surname, name, patronymic or city, whole or in part
+        limit: Maximum number of results
+
+    Returns:
+        Matching applicants, best matches first
+    """
+    service = ApplicantSearchService(session)
+    return json_response(await service.search_applicants(q, limit), ApplicantSearchResults)
 
 @api_router.get("/applicant/{applicant_uuid}", 
+               dependencies=[admission_control.dependency(READ)],
                status_code=status.HTTP_200_OK, 
                response_model=ResponseResult,
                summary="Get applicant results",
                description="Returns applicant data and test results by UUID")
 async def get_applicant_results(applicant_uuid: UUID, 
-                              session: AsyncSession = Depends(get_session)):
+                              session: AsyncSession = Depends(get_read_session)):
     """
     Get applicant results by UUID.
     
@@ -52,36 +210,143 @@ async def get_applicant_results(applicant_uuid: UUID,
         HTTPException: 404 if applicant not found
     """
     service = ResultService(session)
-    return await service.get_applicant_results(applicant_uuid)
+    document = await service.get_applicant_results_document(applicant_uuid)
+    return Response(content=document, media_type="application/json")
+
+@api_router.post("/applicants/results:batch",
+                dependencies=[admission_control.dependency(READ)],
+                status_code=status.HTTP_200_OK,
+                response_model=ApplicantResultsBatch,
+                summary="Get results of many applicants",
+                description="Returns the results of up to 5000 applicants by UUID, "
+                            "with the UUIDs that were not found")
+async def get_applicant_results_batch(request: ApplicantResultsRequest,
+                                      session: AsyncSession = Depends(get_read_session)):
+    """
+    Get the results of many applicants at once, e.g. a whole class.
+
+    Args:
+        request: UUIDs of the applicants
+
+    Returns:
+        Results in request order and the UUIDs of missing applicants
+    """
+    service = ResultService(session)
+    document = await service.get_applicant_results_batch_document(request.uuids)
+    return Response(content=document, media_type="application/json")
+
+@api_router.get("/applicant/{applicant_uuid}/eligibility",
+               dependencies=[admission_control.dependency(READ)],
+               status_code=status.HTTP_200_OK,
+               response_model=Eligibility,
+               summary="Get applicant eligibility",
+               description="Returns faculties whose exam requirements the applicant's stored scores meet")
+async def get_applicant_eligibility(applicant_uuid: UUID,
+                                    session: AsyncSession = Depends(get_read_session)):
+    """
+    Get the faculties the applicant qualifies for by exam scores.
+
+    Args:
+        applicant_uuid: UUID of the applicant
+
+    Returns:
+        Qualifying faculties with score margins
+
+    Raises:
+        HTTPException: 404 if applicant not found
+    """
+    service = EligibilityService(session)
+    return json_response(await service.get_applicant_eligibility(applicant_uuid), Eligibility)
+
+@api_router.get("/applicant/{applicant_uuid}/recommendations",
+               dependencies=[admission_control.dependency(READ)],
+               status_code=status.HTTP_200_OK,
+               response_model=Recommendations,
+               summary="Get faculty recommendations",
+               description="Returns the best faculties for the applicant by test results and exam scores")
+async def get_recommendations(applicant_uuid: UUID,
+                              k: int = Query(default=5, ge=1, le=50, description="Number of faculties"),
+                              session: AsyncSession = Depends(get_read_session)):
+    """
+    Get the top K faculties for the applicant.
+
+    Args:
+        applicant_uuid: UUID of the applicant
+        k: Number of faculties to return
+
+    Returns:
+        Best faculties, highest score first
+
+    Raises:
+        HTTPException: 404 if applicant not found
+    """
+    service = RecommendationService(session)
+    return json_response(await service.get_recommendations(applicant_uuid, k), Recommendations)
+
+@api_router.post("/eligibility/",
+                dependencies=[admission_control.dependency(READ)],
+                status_code=status.HTTP_200_OK,
+                response_model=Eligibility,
+                summary="Check exam scores eligibility",
+                description="Returns faculties whose exam requirements the given scores meet")
+async def check_eligibility(scores: EligibilityRequest,
+                            session: AsyncSession = Depends(get_read_session)):
+    """
+    Get the faculties an ad-hoc set of exam scores qualifies for.
+
+    Args:
+        scores: Exam ids with scores
+
+    Returns:
+        Qualifying faculties with score margins
+    """
+    service = EligibilityService(session)
+    exam_scores = {}
+    for exam in scores.exams:
+        exam_scores[exam.exam_id] = max(exam.score, exam_scores.get(exam.exam_id, 0))
+    return json_response(await service.evaluate(exam_scores), Eligibility)
 
 @api_router.post("/results/", 
+                dependencies=[admission_control.dependency(WRITE)],
                 status_code=status.HTTP_201_CREATED, 
                 response_model=ResponseResult,
                 summary="Process test answers",
                 description="Processes test answers and updates applicant results")
-async def process_user_answers(user_data: ApplicantAnswers, 
+async def process_user_answers(user_data: ApplicantAnswers, request: Request,
+                             idempotency_key: str | None = Header(default=None, max_length=255),
                              session: AsyncSession = Depends(get_session)):
     """
     Process user answers and create/update test results.
     
     Args:
         user_data: Contains applicant UUID and list of answers
+        idempotency_key: Retries with the same key and body get the first response replayed
+            without scoring and writing again
         
     Returns:
         Updated applicant data with test results
         
     Raises:
         ValueError: If applicant not found
+        HTTPException: 422 if the idempotency key was used with a different body
     """
     service = ResultService(session)
+
+    async def process() -> Response:
+        document = await service.process_user_answers_document(user_data)
+        return Response(content=document, status_code=status.HTTP_201_CREATED, media_type="application/json")
+
+    if idempotency_key is not None or settings.FAST_RESPONSES:
+        return await idempotency_store.respond(request, idempotency_key, process)
     return await service.process_user_answers(user_data)
 
 @api_router.get("/questions/", 
+               dependencies=[admission_control.dependency(READ)],
                status_code=status.HTTP_200_OK,
                response_model= List[QuestionSch],
                summary="Get all questions",
                description="Returns all questions with possible answers")
-async def get_all_questions(session: AsyncSession = Depends(get_session)):
+async def get_all_questions(request: Request, session: AsyncSession = Depends(get_session)):
     """
     Get all questions with their answers.
     
@@ -92,15 +357,16 @@ async def get_all_questions(session: AsyncSession = Depends(get_session)):
         HTTPException: 404 if no questions found
     """
     service = QuestionService(session)
-    return await service.get_all_questions()
+    return await response_store.respond(request, QUESTIONS, service.get_all_questions, List[QuestionSch])
 
 
 @api_router.get("/exam/",
+                dependencies=[admission_control.dependency(READ)],
                 status_code=status.HTTP_200_OK,
                 summary="Get all exams",
                 response_model=Exams,
                 description="Returns all exams")
-async def get_all_exams(session: AsyncSession = Depends(get_session)):
+async def get_all_exams(request: Request, session: AsyncSession = Depends(get_session)):
     """
     Get all questions with their answers.
 
@@ -111,15 +377,16 @@ async def get_all_exams(session: AsyncSession = Depends(get_session)):
         HTTPException: 404 if no questions found
     """
     service = ExamsService(session)
-    return await service.get_all_exams()
+    return await response_store.respond(request, EXAMS, service.get_all_exams, Exams)
 
 
 @api_router.get("/exam/required",
+                dependencies=[admission_control.dependency(READ)],
                 status_code=status.HTTP_200_OK,
                 response_model=RequiredExams,
                 summary="Get all required exams for all faculties",
                 description="Returns all exams for faculties")
-async def get_all_required_exams(session: AsyncSession = Depends(get_session)):
+async def get_all_required_exams(request: Request, session: AsyncSession = Depends(get_session)):
     """
     Get all questions with their answers.
 
@@ -130,4 +397,29 @@ async def get_all_required_exams(session: AsyncSession = Depends(get_session)):
         HTTPException: 404 if no questions found
     """
     service = ExamsService(session)
-    return await service.get_all_required_exams()
\ No newline at end of file
+    return await response_store.respond(request, REQUIRED_EXAMS, service.get_all_required_exams, RequiredExams)
+
+
+@api_router.get("/analytics/",
+                dependencies=[admission_control.dependency(READ)],
+                status_code=status.HTTP_200_OK,
+                response_model=AdmissionAnalytics,
+                summary="Get admission analytics",
+                description="Returns applicants per day and city, faculty type compliance distributions "
+                            "and exam score histograms")
+async def get_analytics(days: int = Query(default=30, ge=1, le=366, description="Number of last days"),
+                        session: AsyncSession = Depends(get_read_session)):
+    """
+    Get the live admission numbers for the dashboard.
+
+    The numbers are read from aggregates maintained by the writes, so the time does not depend
+    on the number of applicants.
+
+    Args:
+        days: Number of the last registration days to include
+
+    Returns:
+        Daily applicant counts, compliance distributions and exam score histograms
+    """
+    service = AnalyticsService(session)
+    return json_response(await service.get_analytics(days), AdmissionAnalytics)
@@ -1,5 +1,6 @@
 from sqlmodel import Field, SQLModel
 from uuid import UUID
+from datetime import date, datetime
 from typing import Optional, List
 
 
@@ -116,3 +117,162 @@ class ResponseResult(ApplicantInfo):
     uuid: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
     faculty_type: list[FacultyTypeSch]
     exams: List[ApplicantExamResult] = Field(default=[], description="Сданные экзамены и баллы")
+
+
+class ApplicantResultsRequest(SQLModel):
+    """Абитуриенты, результаты которых нужно получить одним запросом"""
+    uuids: list[UUID] = Field(min_length=1, max_length=5000,
+                              schema_extra={"example": ["a1b2c3d4-e5f6-7890-1234-56789abcdef0"]})
+
+
+class ApplicantResultsBatch(SQLModel):
+    """Результаты нескольких абитуриентов"""
+    results: list[ResponseResult] = Field(description="Результаты в порядке запроса, без повторов")
+    not_found: list[UUID] = Field(default=[], description="Абитуриенты, которых нет в базе")
+
+
+class ImportedApplicant(ApplicantInfo):
+    """Строка массовой загрузки абитуриентов"""
+    # Длины колонок applicant: строка длиннее не попадёт в таблицу
+    surname: str = Field(max_length=30, schema_extra={"example": "Ivanov"})
+    name: str = Field(max_length=30, schema_extra={"example": "Ivan"})
+    patronymic: str | None = Field(default=None, max_length=30, schema_extra={"example": "Ivanovich"})
+    city: str = Field(default=None, max_length=30, schema_extra={"example": "Krasnodar"})
+    exams: dict[str, int] = Field(default={}, description="Баллы по кодам экзаменов",
+                                  schema_extra={"example": {"rus": 80, "math_profile": 75}})
+
+
+class ImportRowError(SQLModel):
+    """Ошибка в строке файла загрузки"""
+    line: int = Field(schema_extra={"example": 3})
+    errors: list[str] = Field(schema_extra={"example": ["phone_number: String should match pattern '^79\\d{9}$'"]})
+
+
+class ImportReport(SQLModel):
+    """Результат массовой загрузки абитуриентов"""
+    processed: int = Field(schema_extra={"example": 1000})
+    imported: int = Field(schema_extra={"example": 998})
+    failed: int = Field(default=0, schema_extra={"example": 2})
+    errors: list[ImportRowError] = Field(
+        default=[], description="Errors of the first IMPORT_MAX_ERRORS failed rows; `failed` counts all of them"
+    )
+
+
+class ExamScoreInput(SQLModel):
+    """Балл абитуриента по экзамену"""
+    exam_id: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    score: int = Field(ge=0, le=100, schema_extra={"example": 75})
+
+
+class EligibilityRequest(SQLModel):
+    """Баллы для проверки проходных требований факультетов"""
+    exams: list[ExamScoreInput] = Field(default=[])
+
+
+class ExamMargin(SQLModel):
+    """Запас балла абитуриента над минимальным баллом факультета"""
+    exam_id: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    exam_code: str = Field(schema_extra={"example": "math_base"})
+    min_score: int = Field(schema_extra={"example": 55})
+    score: int = Field(schema_extra={"example": 75})
+    margin: int = Field(schema_extra={"example": 20})
+
+
+class EligibleFaculty(SQLModel):
+    """Факультет, требованиям которого удовлетворяют баллы абитуриента"""
+    faculty_id: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    name: str = Field(schema_extra={"example": "Прикладной информатики"})
+    url: str = Field(schema_extra={"example": "https://..."})
+    margin: int = Field(description="Наименьший запас по требуемым экзаменам", schema_extra={"example": 20})
+    exams: list[ExamMargin]
+
+
+class Eligibility(SQLModel):
+    """Факультеты, на которые проходит абитуриент"""
+    faculties: list[EligibleFaculty]
+
+
+class RecommendedFaculty(SQLModel):
+    """Рекомендованный факультет"""
+    faculty_id: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    name: str = Field(schema_extra={"example": "Прикладной информатики"})
+    url: str = Field(schema_extra={"example": "https://..."})
+    faculty_type: str = Field(schema_extra={"example": "Человек-Природа"})
+    compliance: int = Field(schema_extra={"example": 12})
+    eligible: bool | None = Field(description="Проходит ли по баллам ЕГЭ, None если требований нет",
+                                  schema_extra={"example": True})
+    margin: int | None = Field(default=None, schema_extra={"example": 20})
+    score: float = Field(schema_extra={"example": 0.83})
+
+
+class Recommendations(SQLModel):
+    """Лучшие факультеты для абитуриента"""
+    faculties: list[RecommendedFaculty]
+
+
+class DailyApplicants(SQLModel):
+    """Число абитуриентов, зарегистрированных за день в городе"""
+    day: date = Field(schema_extra={"example": "2025-06-20"})
+    city: str | None = Field(schema_extra={"example": "Краснодар"})
+    count: int = Field(schema_extra={"example": 42})
+
+
+class ComplianceDistribution(SQLModel):
+    """Распределение соответствия типу факультета"""
+    faculty_type_id: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    name: str = Field(schema_extra={"example": "Человек-Природа"})
+    # Гистограмма: значения по возрастанию и число абитуриентов с каждым из них
+    values: list[int] = Field(schema_extra={"example": [5, 10, 15]})
+    counts: list[int] = Field(schema_extra={"example": [12, 30, 7]})
+
+
+class ExamScoreDistribution(SQLModel):
+    """Распределение баллов экзамена"""
+    exam_id: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    code: str = Field(schema_extra={"example": "math_base"})
+    name: str = Field(schema_extra={"example": "Математика (базовая)"})
+    values: list[int] = Field(schema_extra={"example": [60, 75, 90]})
+    counts: list[int] = Field(schema_extra={"example": [3, 12, 5]})
+
+
+class AdmissionAnalytics(SQLModel):
+    """Сводка приёмной кампании"""
+    applicants: list[DailyApplicants]
+    compliance: list[ComplianceDistribution]
+    exam_scores: list[ExamScoreDistribution]
+
+
+class ApplicantListItem(SQLModel):
+    """Абитуриент в постраничном списке"""
+    uuid: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    surname: str | None = Field(schema_extra={"example": "Иванов"})
+    name: str | None = Field(schema_extra={"example": "Иван"})
+    patronymic: str | None = Field(default=None, schema_extra={"example": "Иванович"})
+    phone_number: str | None = Field(schema_extra={"example": "79001234567"})
+    city: str | None = Field(schema_extra={"example": "Краснодар"})
+    dt_created: datetime | None = Field(schema_extra={"example": "2025-06-20T12:30:00"})
+    # Только при include_exams
+    exams: list[ApplicantExamResult] | None = None
+
+
+class ApplicantPage(SQLModel):
+    """Страница списка абитуриентов"""
+    items: list[ApplicantListItem]
+    next_cursor: str | None = Field(schema_extra={"example": "MjAyNS0wNi0yMFQxMjozMDowMHxhMWIy"})
+
+
+class ApplicantSearchHit(SQLModel):
+    """Найденный абитуриент"""
+    uuid: UUID = Field(schema_extra={"example": "a1b2c3d4-e5f6-7890-1234-56789abcdef0"})
+    surname: str | None = Field(schema_extra={"example": "Иванов"})
+    name: str | None = Field(schema_extra={"example": "Иван"})
+    patronymic: str | None = Field(default=None, schema_extra={"example": "Иванович"})
+    city: str | None = Field(schema_extra={"example": "Краснодар"})
+    phone_number: str | None = Field(schema_extra={"example": "79001234567"})
+    # Сходство с запросом от 0 до 1; null, если поиск идёт по префиксам
+    similarity: float | None = Field(default=None, schema_extra={"example": 0.83})
+
+
+class ApplicantSearchResults(SQLModel):
+    """Результаты поиска, лучшие совпадения первыми"""
+    items: list[ApplicantSearchHit]
@@ -0,0 +1,150 @@
+from collections import OrderedDict
+from typing import Iterable
+from uuid import UUID
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.config import settings
+from backend.src.database.events import on_change
+from backend.src.database.models import AnswerFaculty
+from backend.src.database.snapshot import Snapshot
+from backend.src.internal.metrics import Counter, Gauge
+
+
+HIT = "hit"
+MISS = "miss"
+
+
+class ScoringMetrics:
+    """Lookups in the answer set → scores memo of the current matrix"""
+
+    def __init__(self):
+        self.lookups = Counter("scoring_memo_lookups_total", "Answer set score lookups by result.", ("result",))
+        self.size = Gauge("scoring_memo_entries", "Answer sets memoized for the current scoring matrix.", ())
+
+    def hit_rate(self) -> float:
+        hits, misses = self.lookups.value((HIT,)), self.lookups.value((MISS,))
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def expose(self) -> str:
+        """All scoring metrics in the Prometheus text exposition format"""
+        return "\n".join(self.lookups.expose() + self.size.expose()) + "\n"
+
+
+scoring_metrics = ScoringMetrics()
+
+
+class ScoringMatrix:
+    """
+    Compiled answer × faculty type weight matrix.
+
+    Each row holds the weights of one answer for every faculty type, so scoring a submission
+    is a gather of the selected rows followed by a column-wise sum.
+
+    Many applicants choose the same answers, so the sums are memoized per answer set in a bounded LRU.
+    The memo belongs to the matrix: when the weights change the matrix is rebuilt with an empty one.
+    """
+
+    def __init__(self, rows: Iterable[tuple[UUID, UUID, int | None]], memo_size: int = 0,
+                 metrics: ScoringMetrics = scoring_metrics):
+        """
+        Build the matrix from AnswerFaculty rows.
+
+        Args:
+            rows: (answer_id, faculty_type_id, score) tuples
+            memo_size: Maximum number of memoized answer sets, 0 disables the memo
+            metrics: Where memo lookups are counted
+        """
+        rows = list(rows)
+        self.faculty_type_ids: list[UUID] = sorted({faculty_type_id for _, faculty_type_id, _ in rows})
+        columns = {faculty_type_id: index for index, faculty_type_id in enumerate(self.faculty_type_ids)}
+
+        self.answer_index: dict[UUID, int] = {}
+        self.weights: list[list[int]] = []
+        # Битовая маска типов факультетов, с которыми связан ответ (даже с нулевым весом)
+        self.links: list[int] = []
+
+        for answer_id, faculty_type_id, score in rows:
+            row = self.answer_index.get(answer_id)
+            if row is None:
+                row = self.answer_index[answer_id] = len(self.weights)
+                self.weights.append([0] * len(self.faculty_type_ids))
+                self.links.append(0)
+            column = columns[faculty_type_id]
+            self.weights[row][column] += score or 0
+            self.links[row] |= 1 << column
+
+        self.memo_size = memo_size
+        self.metrics = metrics
+        # Отсортированные номера строк выбранных ответов -> баллы по типам факультетов
+        self._memo: OrderedDict[tuple[int, ...], dict[UUID, int]] = OrderedDict()
+        if memo_size:
+            metrics.size.set((), 0)
+
+    def score(self, answer_ids: Iterable[str | UUID]) -> dict[UUID, int]:
+        """
+        Sum the weights of the selected answers per faculty type.
+
+        Args:
+            answer_ids: Selected answer ids, unknown ids are ignored
+
+        Returns:
+            dict: faculty_type_id -> compliance for every faculty type linked to a selected answer
+        """
+        rows = []
+        for answer_id in answer_ids:
+            try:
+                row = self.answer_index.get(answer_id if isinstance(answer_id, UUID) else UUID(answer_id))
+            except ValueError:
+                continue
+            if row is not None:
+                rows.append(row)
+
+        if not self.memo_size:
+            return self._sum(rows)
+        # Порядок ответов на сумму не влияет, повторы влияют, поэтому ключ — отсортированный кортеж
+        key = tuple(sorted(rows))
+        scores = self._memo.get(key)
+        if scores is not None:
+            self._memo.move_to_end(key)
+            self.metrics.lookups.inc((HIT,))
+            return dict(scores)
+        self.metrics.lookups.inc((MISS,))
+        scores = self._memo[key] = self._sum(rows)
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        self.metrics.size.set((), len(self._memo))
+        return dict(scores)
+
+    def _sum(self, rows: list[int]) -> dict[UUID, int]:
+        touched = 0
+        for row in rows:
+            touched |= self.links[row]
+        if not touched:
+            return {}
+
+        totals = [sum(column) for column in zip(*(self.weights[row] for row in rows))]
+        return {
+            faculty_type_id: totals[column]
+            for column, faculty_type_id in enumerate(self.faculty_type_ids)
+            if touched >> column & 1
+        }
+
+
+class ScoringEngine(Snapshot[ScoringMatrix]):
+    """
+    Process-wide holder of the compiled ScoringMatrix.
+
+    The matrix is loaded on first use and rebuilt lazily after AnswerFaculty rows change.
+    """
+
+    async def load(self, session: AsyncSession) -> ScoringMatrix:
+        result = await session.exec(
+            select(AnswerFaculty.answer_id, AnswerFaculty.faculty_type_id, AnswerFaculty.score)
+        )
+        return ScoringMatrix(result.all(), settings.SCORING_MEMO_SIZE)
+
+
+scoring_engine = ScoringEngine()
+on_change(AnswerFaculty)(scoring_engine.invalidate)
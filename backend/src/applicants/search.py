@@ -0,0 +1,118 @@
+from sqlalchemy import Float, String, and_, bindparam, func, literal_column, or_, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.database.models import Applicant
+from backend.src.applicants.schemas import ApplicantSearchHit, ApplicantSearchResults
+
+
+# Поля поиска и текст, по которому строится триграммный индекс; выражение запроса
+# должно совпадать с выражением индекса буква в букву
+SEARCH_COLUMNS = ("surname", "name", "patronymic", "city")
+SEARCH_DOCUMENT = "lower(" + " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS) + ")"
+
+# Есть ли pg_trgm в базе; проверяется один раз на процесс
+_trigram: bool | None = None
+
+
+async def trigram_available(session: AsyncSession) -> bool:
+    """Whether the pg_trgm extension is installed, checked once per process"""
+    global _trigram
+    if _trigram is None:
+        _trigram = (await session.exec(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        )).scalar_one()
+    return _trigram
+
+
+def trigram_query(query: str, limit: int):
+    """
+    Select the applicants whose surname, name, patronymic or city resemble the query, closest first.
+
+    `<%` keeps rows whose text contains a word similar to the query, so fragments and misspellings
+    match. `<<->` is the distance to that word; the GiST index returns rows in its order,
+    so the search reads about `limit` rows whatever the table size.
+    """
+    document = literal_column(SEARCH_DOCUMENT)
+    words = bindparam("query", query, type_=String)
+    distance = words.op("<<->", return_type=Float)(document)
+    return (
+        select(Applicant.uuid, Applicant.surname, Applicant.name, Applicant.patronymic, Applicant.city,
+               Applicant.phone_number, (1 - distance).label("similarity"))
+        .where(words.op("<%", is_comparison=True)(document))
+        .order_by(distance, Applicant.uuid)
+        .limit(limit)
+    )
+
+
+def prefix_query(query: str, limit: int):
+    """
+    Select the applicants with a field starting with every word of the query, surname matches first.
+
+    Used where pg_trgm is not installed; each field has its own prefix index.
+    """
+    conditions = [
+        or_(*(func.lower(getattr(Applicant, column)).startswith(word, autoescape=True) for column in SEARCH_COLUMNS))
+        for word in query.split()
+    ]
+    first_word = query.split()[0]
+    return (
+        select(Applicant.uuid, Applicant.surname, Applicant.name, Applicant.patronymic, Applicant.city,
+               Applicant.phone_number, literal_column("NULL").label("similarity"))
+        .where(and_(*conditions))
+        .order_by((func.lower(Applicant.surname) == first_word).desc(), Applicant.surname, Applicant.name,
+                  Applicant.uuid)
+        .limit(limit)
+    )
+
+
+class ApplicantSearchService:
+    """
+    This class provides methods to look applicants up by name and city.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the ApplicantSearchService with a database session.
+
+        Args:
+            session: AsyncSession for database operations
+        """
+        self.session = session
+
+    async def search_applicants(self, query: str, limit: int) -> ApplicantSearchResults:
+        """
+        Find applicants by a fragment of their surname, name, patronymic or city.
+
+        Args:
+            query: Search text, case-insensitive; may be misspelled when pg_trgm is installed
+            limit: Maximum number of applicants to return
+
+        Returns:
+            ApplicantSearchResults: Best matches first
+
+        Notes:
+            - With pg_trgm the match is fuzzy and ranked by trigram word similarity
+            - Without it every word of the query must start one of the fields; similarity is null
+            - One query per search
+        """
+        query = query.strip().lower()
+        if not query:
+            return ApplicantSearchResults(items=[])
+        if await trigram_available(self.session):
+            statement = trigram_query(query, limit)
+        else:
+            statement = prefix_query(query, limit)
+        rows = (await self.session.exec(statement)).all()
+        return ApplicantSearchResults(items=[
+            ApplicantSearchHit(
+                uuid=row.uuid,
+                surname=row.surname,
+                name=row.name,
+                patronymic=row.patronymic,
+                city=row.city,
+                phone_number=row.phone_number,
+                similarity=row.similarity
+            )
+            for row in rows
+        ])
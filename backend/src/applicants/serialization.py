@@ -0,0 +1,51 @@
+import time
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+from backend.src.config import settings
+from backend.src.internal.request_stats import record_serialization
+
+
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def dump_json(response_model: Any, value: Any) -> bytes:
+    """
+    Serialize a value of the response model to JSON in one pass, without validating it again.
+
+    The serializer runs in pydantic-core, and the TypeAdapter of every model is built once per process.
+
+    Args:
+        response_model: Type the value is an instance of
+        value: Data to serialize
+
+    Returns:
+        bytes: JSON document
+    """
+    started = time.perf_counter()
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters[response_model] = TypeAdapter(response_model)
+    content = adapter.dump_json(value)
+    record_serialization(time.perf_counter() - started)
+    return content
+
+
+def json_response(value: Any, response_model: Any, status_code: int = status.HTTP_200_OK) -> Any:
+    """
+    Respond with a value built by the services.
+
+    Args:
+        value: Response data, already valid for the response model
+        response_model: Response model of the route
+        status_code: Status code of the route
+
+    Returns:
+        The value itself, for FastAPI to validate and serialize against `response_model`, or with
+        FAST_RESPONSES a Response with the value serialized once
+    """
+    if not settings.FAST_RESPONSES:
+        return value
+    return Response(content=dump_json(response_model, value), status_code=status_code, media_type="application/json")
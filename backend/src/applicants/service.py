@@ -1,13 +1,65 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
-from sqlalchemy.sql.expression import delete
-from uuid import UUID
-
-from backend.src.database.models import (Applicant, Faculty, ApplicantFaculty, FacultyType, Question, Answer,
-                                         AnswerFaculty, Exam, FacultyExamRequirement, ApplicantExam)
-from backend.src.applicants.schemas import (ResponseResult, FacultyTypeSch, ApplicantAnswers, ApplicantInfo, Exams,
+from sqlalchemy import JSON, any_, bindparam, func, select as sa_select
+import sqlalchemy.dialects.postgresql as pg
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, TypeVar
+from uuid import UUID, uuid4
+
+from backend.src.database.models import (Applicant, Faculty, ApplicantFaculty, Question, Answer,
+                                         Exam, FacultyExamRequirement, ApplicantExam, ApplicantResult)
+from backend.src.applicants.schemas import (ResponseResult, ApplicantAnswers, ApplicantInfo, Exams,
                                             QuestionSch, AnswerSch, RequiredExams, RequiredExam, ApplicantExamResult)
+from backend.src.database.main import batch_writer, stick_to_primary
+from backend.src.applicants.scoring import scoring_engine
+from backend.src.applicants.reference import reference_data, ReferenceSnapshot
+from backend.src.applicants.serialization import dump_json
+from backend.src.applicants.analytics import lock_applicant, replace_compliance, replace_exams, upsert_applicant
+from backend.src.applicants.documents import (result_cache, serialize_result, applicant_document_query,
+                                              store_document, store_rebuilt_document, mark_document_stale)
+
+
+T = TypeVar("T")
+
+
+def applicant_results_query(applicant_uuid: UUID):
+    """Select the applicant with its exams and faculty type compliance aggregated into JSON arrays"""
+    exams = (
+        sa_select(func.coalesce(
+            func.json_agg(func.json_build_object(
+                "exam_id", ApplicantExam.exam_id,
+                "exam_name", Exam.name,
+                "exam_code", Exam.code,
+                "score", ApplicantExam.score
+            )),
+            func.json_build_array(),
+            type_=JSON
+        ))
+        .select_from(ApplicantExam)
+        .join(Exam, ApplicantExam.exam_id == Exam.uuid)
+        .where(ApplicantExam.applicant_id == Applicant.uuid)
+        .scalar_subquery()
+    )
+    faculty_types = (
+        sa_select(func.coalesce(
+            func.json_agg(func.json_build_object(
+                "faculty_type_id", ApplicantFaculty.faculty_type_id,
+                "compliance", ApplicantFaculty.compliance
+            )),
+            func.json_build_array(),
+            type_=JSON
+        ))
+        .where(ApplicantFaculty.applicant_id == Applicant.uuid)
+        .scalar_subquery()
+    )
+    return select(Applicant, exams, faculty_types).where(Applicant.uuid == applicant_uuid)
+
+
+def any_of(column, ids: list[UUID]):
+    """`column = ANY(:ids)`: one array parameter and one cached statement however many ids there are"""
+    return column == any_(bindparam("ids", ids, type_=pg.ARRAY(pg.UUID)))
 
 
 class ResultService:
@@ -24,6 +76,29 @@ class ResultService:
         """
         self.session = session
 
+    async def _commit(self, write: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        Run writes in a committed transaction.
+
+        Args:
+            write: Coroutine function executing statements on the given session, without committing
+
+        Returns:
+            What `write` returned, once the transaction is committed
+
+        Notes:
+            - With WRITE_BATCHING the writes are group-committed with other requests by the batch writer,
+              otherwise they run on this service's session
+            - Before submitting to the batch writer the session's read transaction is ended, so the request
+              holds no pooled connection while the flushers need one from the same pool
+        """
+        if batch_writer is not None and batch_writer.running:
+            await self.session.commit()
+            return await batch_writer.submit(write)
+        result = await write(self.session)
+        await self.session.commit()
+        return result
+
     async def register_or_get_applicant(self, user_data: ApplicantInfo) -> UUID:
         """
         Register new applicant or get existing one by phone number.
@@ -43,76 +118,46 @@ class ResultService:
         Notes:
             - If applicant exists, updates their personal information и экзамены
             - If applicant doesn't exist, creates new record with экзаменами
+            - Everything is written in one transaction: upsert by phone number, replacement of the exams
+            - The admission analytics aggregates are updated by the same statements, see `analytics`
+            - With WRITE_BATCHING the transaction is shared with other requests, see `_commit`
         """
-        existing_applicant = await self.session.exec(select(Applicant).where(
-            Applicant.phone_number == user_data.phone_number
-        ))
-        existing_applicant = existing_applicant.first()
-
-        if existing_applicant:
-            # Обновляем основную информацию
-            existing_applicant.surname = user_data.surname
-            existing_applicant.name = user_data.name
-            existing_applicant.patronymic = user_data.patronymic
-            existing_applicant.city = user_data.city
-
-            # Удаляем старые экзамены абитуриента
-            await self.session.exec(delete(ApplicantExam).where(
-                ApplicantExam.applicant_id == existing_applicant.uuid
-            ))
-
-            # Добавляем новые экзамены
-            for exam_score in user_data.exams:
-                # Проверяем, существует ли экзамен
-                exam = await self.session.exec(select(Exam).where(Exam.uuid == exam_score.exam_id))
-                if not exam.first():
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Exam with id {exam_score.exam_id} not found"
-                    )
-
-                new_applicant_exam = ApplicantExam(
-                    applicant_id=existing_applicant.uuid,
-                    exam_id=exam_score.exam_id,
-                    score=exam_score.score
+        reference = await reference_data.get(self.session)
+        # Проверяем все экзамены до записи, чтобы не оставить абитуриента без экзаменов
+        for exam_score in user_data.exams:
+            if exam_score.exam_id not in reference.exams:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Exam with id {exam_score.exam_id} not found"
                 )
-                self.session.add(new_applicant_exam)
 
-            await self.session.commit()
-            await self.session.refresh(existing_applicant)
-            return existing_applicant.uuid
-        else:
-            # Создаем нового абитуриента
-            new_applicant = Applicant(
+        async def write(session: AsyncSession) -> UUID:
+            applicant_uuid, inserted = await upsert_applicant(
+                session,
+                uuid=uuid4(),
                 surname=user_data.surname,
                 name=user_data.name,
                 patronymic=user_data.patronymic,
                 phone_number=user_data.phone_number,
-                city=user_data.city
+                city=user_data.city,
+                dt_created=datetime.now()
             )
-            self.session.add(new_applicant)
-            await self.session.commit()
-            await self.session.refresh(new_applicant)
-
-            # Добавляем экзамены абитуриента
-            for exam_score in user_data.exams:
-                # Проверяем, существует ли экзамен
-                exam = await self.session.exec(select(Exam).where(Exam.uuid == exam_score.exam_id))
-                if not exam.first():
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Exam with id {exam_score.exam_id} not found"
-                    )
-
-                new_applicant_exam = ApplicantExam(
-                    applicant_id=new_applicant.uuid,
-                    exam_id=exam_score.exam_id,
-                    score=exam_score.score
-                )
-                self.session.add(new_applicant_exam)
 
-            await self.session.commit()
-            return new_applicant.uuid
+            # Старые экзамены заменяются новыми, гистограмма баллов меняется в том же запросе
+            if user_data.exams or not inserted:
+                await session.exec(replace_exams(
+                    applicant_uuid, {exam_score.exam_id: exam_score.score for exam_score in user_data.exams}
+                ))
+
+            if not inserted:
+                # Сохранённые результаты устарели, они пересоберутся при следующем чтении
+                await session.exec(mark_document_stale(applicant_uuid))
+            return applicant_uuid
+
+        applicant_uuid = await self._commit(write)
+        result_cache.discard(applicant_uuid)
+        stick_to_primary(applicant_uuid)
+        return applicant_uuid
 
     async def get_applicant_results(self, applicant_uuid: UUID) -> ResponseResult:
         """
@@ -127,55 +172,20 @@ class ResultService:
         Raises:
             HTTPException: 404 if applicant not found
         """
-        # Получаем основную информацию об абитуриенте
-        applicant = await self.session.exec(select(Applicant).where(Applicant.uuid == applicant_uuid))
-        applicant = applicant.first()
-        if not applicant:
+        # Абитуриент, его экзамены и соответствие типам факультетов одним запросом
+        row = (await self.session.exec(applicant_results_query(applicant_uuid))).first()
+        if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Applicant not found")
 
-        # Получаем сданные экзамены абитуриента с информацией об экзаменах
-        applicant_exams = await self.session.exec(
-            select(ApplicantExam, Exam)
-            .join(Exam, ApplicantExam.exam_id == Exam.uuid)
-            .where(ApplicantExam.applicant_id == applicant.uuid)
-        )
-        exam_results = [
-            ApplicantExamResult(
-                exam_id=ae.ApplicantExam.exam_id,
-                exam_name=ae.Exam.name,
-                exam_code=ae.Exam.code,
-                score=ae.ApplicantExam.score
-            )
-            for ae in applicant_exams.all()
-        ]
-
-        # Получаем информацию о факультетах (как было раньше)
-        applicant_faculties = await self.session.exec(select(ApplicantFaculty).where(
-            ApplicantFaculty.applicant_id == applicant.uuid
-        ))
-        applicant_faculties = applicant_faculties.all()
-
+        reference = await reference_data.get(self.session)
+        applicant, exams, faculty_types = row
         faculties_list = []
 
-        for app_faculty in applicant_faculties:
-            faculty_type = await self.session.exec(select(FacultyType).where(
-                FacultyType.uuid == app_faculty.faculty_type_id
-            ))
-            faculty_type = faculty_type.first()
-
-            if not faculty_type:
+        for app_faculty in faculty_types:
+            faculty_type_obj = reference.faculty_type_result(UUID(app_faculty["faculty_type_id"]),
+                                                             app_faculty["compliance"])
+            if not faculty_type_obj:
                 continue
-
-            faculties = await self.session.exec(select(Faculty).where(
-                Faculty.type_id == faculty_type.uuid
-            ))
-            faculties = faculties.all()
-
-            faculty_type_obj = FacultyTypeSch(
-                name=faculty_type.name,
-                compliance=app_faculty.compliance,
-                faculties=faculties
-            )
             faculties_list.append(faculty_type_obj)
 
         return ResponseResult(
@@ -186,9 +196,128 @@ class ResultService:
             city=applicant.city,
             phone_number=applicant.phone_number,
             faculty_type=faculties_list,
-            exams=exam_results
+            exams=[ApplicantExamResult(**exam) for exam in exams]
         )
 
+    async def get_applicant_results_document(self, applicant_uuid: UUID) -> bytes:
+        """
+        Get applicant results serialized to JSON.
+
+        Args:
+            applicant_uuid: UUID of the applicant
+
+        Returns:
+            bytes: Serialized ResponseResult
+
+        Raises:
+            HTTPException: 404 if applicant not found
+
+        Notes:
+            - Served from the stored document by primary key; a missing document or one built with other
+              reference data is rebuilt and stored
+            - On a replica session the rebuilt document is stored through the primary session
+        """
+        reference = await reference_data.get(self.session)
+        document = result_cache.get(applicant_uuid, reference.version)
+        if document is not None:
+            return document
+
+        stored = (await self.session.exec(applicant_document_query(applicant_uuid))).first()
+
+        if stored and stored.reference_version == reference.version:
+            document = stored.document
+        else:
+            document = serialize_result(await self.get_applicant_results(applicant_uuid))
+            # С реплики документ записывается через сессию мастера
+            writer = self.session.info.get("primary", self.session)
+            await writer.exec(store_rebuilt_document(
+                applicant_uuid, document, reference.version, stored.revision if stored else None
+            ))
+            await writer.commit()
+
+        result_cache.put(applicant_uuid, reference.version, document)
+        return document
+
+    async def get_applicant_results_batch_document(self, applicant_uuids: list[UUID]) -> bytes:
+        """
+        Get the results of many applicants serialized to JSON as an ApplicantResultsBatch.
+
+        Args:
+            applicant_uuids: UUIDs of the applicants, repeats are answered once
+
+        Returns:
+            bytes: Serialized ApplicantResultsBatch with the results in request order
+
+        Notes:
+            - Stored documents built with the current reference data are read with one query for all applicants
+            - The rest are built with three set-based queries (applicants, exams, faculty type compliance)
+              grouped in memory, so the number of queries does not grow with the number of applicants
+            - Rebuilt documents are not stored: the lookup stays read-only and may run on the replica
+        """
+        reference = await reference_data.get(self.session)
+        uuids = list(dict.fromkeys(applicant_uuids))
+        documents = {}
+        for applicant_uuid in uuids:
+            document = result_cache.get(applicant_uuid, reference.version)
+            if document is not None:
+                documents[applicant_uuid] = document
+
+        missing = [applicant_uuid for applicant_uuid in uuids if applicant_uuid not in documents]
+        if missing:
+            # Устаревшие документы помечены пустой версией справочников и сюда не попадут
+            documents.update((await self.session.exec(
+                select(ApplicantResult.applicant_id, ApplicantResult.document)
+                .where(any_of(ApplicantResult.applicant_id, missing),
+                       ApplicantResult.reference_version == reference.version)
+            )).all())
+            missing = [applicant_uuid for applicant_uuid in missing if applicant_uuid not in documents]
+        if missing:
+            for result in await self._build_results(missing, reference):
+                documents[result.uuid] = serialize_result(result)
+
+        results = [documents[applicant_uuid] for applicant_uuid in uuids if applicant_uuid in documents]
+        not_found = [applicant_uuid for applicant_uuid in uuids if applicant_uuid not in documents]
+        return b'{"results":[' + b",".join(results) + b'],"not_found":' + dump_json(list[UUID], not_found) + b"}"
+
+    async def _build_results(self, applicant_uuids: list[UUID], reference: ReferenceSnapshot) -> list[ResponseResult]:
+        applicants = (await self.session.exec(select(Applicant).where(any_of(Applicant.uuid, applicant_uuids)))).all()
+        if not applicants:
+            return []
+        found = [applicant.uuid for applicant in applicants]
+
+        exams = defaultdict(list)
+        for row in await self.session.exec(
+            select(ApplicantExam.applicant_id, ApplicantExam.exam_id, Exam.name, Exam.code, ApplicantExam.score)
+            .join(Exam, ApplicantExam.exam_id == Exam.uuid)
+            .where(any_of(ApplicantExam.applicant_id, found))
+        ):
+            exams[row.applicant_id].append(ApplicantExamResult(
+                exam_id=row.exam_id, exam_name=row.name, exam_code=row.code, score=row.score
+            ))
+
+        faculty_types = defaultdict(list)
+        for row in await self.session.exec(
+            select(ApplicantFaculty.applicant_id, ApplicantFaculty.faculty_type_id, ApplicantFaculty.compliance)
+            .where(any_of(ApplicantFaculty.applicant_id, found))
+        ):
+            faculty_type = reference.faculty_type_result(row.faculty_type_id, row.compliance)
+            if faculty_type:
+                faculty_types[row.applicant_id].append(faculty_type)
+
+        return [
+            ResponseResult(
+                uuid=applicant.uuid,
+                surname=applicant.surname,
+                name=applicant.name,
+                patronymic=applicant.patronymic,
+                city=applicant.city,
+                phone_number=applicant.phone_number,
+                faculty_type=faculty_types[applicant.uuid],
+                exams=exams[applicant.uuid]
+            )
+            for applicant in applicants
+        ]
+
     async def process_user_answers(self, user_data: ApplicantAnswers) -> ResponseResult:
         """
         Process user answers and update test results for an existing Applicant.
@@ -204,90 +333,76 @@ class ResultService:
         Raises:
             ValueError: If applicant not found
         """
+        result, _ = await self._process_user_answers(user_data)
+        return result
 
-        applicant = await self.session.exec(select(Applicant).where(Applicant.uuid == user_data.uuid))
-        applicant = applicant.first()
-        if not applicant:
-            raise ValueError("Абитуриент с таким uuid не найден")
+    async def process_user_answers_document(self, user_data: ApplicantAnswers) -> bytes:
+        """
+        Process user answers like `process_user_answers`, returning the results serialized to JSON.
 
-        # Get applicant's exams to include in the response
-        applicant_exams = await self.session.exec(
-            select(ApplicantExam, Exam)
-            .join(Exam, ApplicantExam.exam_id == Exam.uuid)
-            .where(ApplicantExam.applicant_id == applicant.uuid)
-        )
-        exam_results = [
-            ApplicantExamResult(
-                exam_id=ae.ApplicantExam.exam_id,
-                exam_name=ae.Exam.name,
-                exam_code=ae.Exam.code,
-                score=ae.ApplicantExam.score
-            )
-            for ae in applicant_exams.all()
-        ]
+        Returns:
+            bytes: Serialized ResponseResult, the same document that is stored for reads
 
-        # Clear existing faculty associations
-        existing_faculties = await self.session.exec(
-            select(ApplicantFaculty).where(ApplicantFaculty.applicant_id == applicant.uuid)
-        )
-        for faculty in existing_faculties.all():
-            await self.session.delete(faculty)
-        await self.session.commit()
+        Raises:
+            ValueError: If applicant not found
+        """
+        _, document = await self._process_user_answers(user_data)
+        return document
 
+    async def _process_user_answers(self, user_data: ApplicantAnswers) -> tuple[ResponseResult, bytes]:
         # Calculate new faculty scores based on answers
-        faculty_scores = {}
-        for answer_data in user_data.answers:
-            for answer_id in answer_data.answer_ids:
-                answer_faculties = await self.session.exec(
-                    select(AnswerFaculty).where(AnswerFaculty.answer_id == answer_id)
-                )
-                for answer_faculty in answer_faculties.all():
-                    faculty_scores[answer_faculty.faculty_type_id] = (
-                            faculty_scores.get(answer_faculty.faculty_type_id, 0) + (answer_faculty.score or 0)
-                    )
+        scoring_matrix = await scoring_engine.get(self.session)
+        faculty_scores = scoring_matrix.score(
+            answer_id for answer_data in user_data.answers for answer_id in answer_data.answer_ids
+        )
 
+        reference = await reference_data.get(self.session)
         faculties_list = []
+        new_compliance = {}
 
         for faculty_type_id, score in faculty_scores.items():
-            faculty_type_result = await self.session.exec(
-                select(FacultyType).where(FacultyType.uuid == faculty_type_id)
-            )
-            faculty_type_obj = faculty_type_result.first()
-            if not faculty_type_obj:
+            faculty_type_sch = reference.faculty_type_result(faculty_type_id, score)
+            if not faculty_type_sch:
                 continue
-
-            faculties_result = await self.session.exec(
-                select(Faculty).where(Faculty.type_id == faculty_type_id)
-            )
-            faculties = faculties_result.all()
-
-            faculty_type_sch = FacultyTypeSch(
-                name=faculty_type_obj.name,
-                compliance=score,
-                faculties=faculties
-            )
             faculties_list.append(faculty_type_sch)
-
-            # Create new faculty associations
-            new_applicant_faculty = ApplicantFaculty(
-                applicant_id=applicant.uuid,
-                faculty_type_id=faculty_type_id,
-                compliance=score
+            new_compliance[faculty_type_id] = score
+
+        # Replace faculty associations and the stored result document in one transaction
+        async def write(session: AsyncSession) -> tuple[ResponseResult, bytes] | None:
+            # Параллельная обработка ответов или регистрация того же абитуриента ждёт здесь: документ
+            # строится из данных, прочитанных под блокировкой, и не затирает более новую запись
+            await session.exec(lock_applicant(user_data.uuid))
+            # Applicant and exams to include in the response in one query
+            row = (await session.exec(applicant_results_query(user_data.uuid))).first()
+            if not row:
+                # Не исключение: оно откатило бы весь пакет батч-записи
+                return None
+            applicant, exams, _ = row
+
+            result = ResponseResult(
+                uuid=applicant.uuid,
+                surname=applicant.surname,
+                name=applicant.name,
+                patronymic=applicant.patronymic,
+                city=applicant.city,
+                phone_number=applicant.phone_number,
+                faculty_type=faculties_list,
+                exams=[ApplicantExamResult(**exam) for exam in exams]  # Added exams to the response
             )
-            self.session.add(new_applicant_faculty)
-
-        await self.session.commit()
+            document = serialize_result(result)
+            # Замена соответствия и обновление его гистограммы одним запросом
+            await session.exec(replace_compliance(applicant.uuid, new_compliance))
+            await session.exec(store_document(applicant.uuid, document, reference.version))
+            return result, document
+
+        written = await self._commit(write)
+        if written is None:
+            raise ValueError("Абитуриент с таким uuid не найден")
+        result, document = written
+        result_cache.discard(result.uuid)
+        stick_to_primary(result.uuid)
 
-        return ResponseResult(
-            uuid=applicant.uuid,
-            surname=applicant.surname,
-            name=applicant.name,
-            patronymic=applicant.patronymic,
-            city=applicant.city,
-            phone_number=applicant.phone_number,
-            faculty_type=faculties_list,
-            exams=exam_results  # Added exams to the response
-        )
+        return result, document
 
 class QuestionService:
     """
@@ -319,24 +434,27 @@ class QuestionService:
         """
         questions_dict = {}
 
-        query = select(Question, Answer).join(Answer).where(Question.uuid == Answer.question_id)
+        query = (
+            select(Question.uuid, Question.text, Answer.uuid, Answer.text)
+            .join(Answer).where(Question.uuid == Answer.question_id)
+        )
         result = await self.session.exec(query)
         rows = result.all()
 
         if not rows:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questions not found!")
 
-        for question, answer in rows:
-            if question.uuid not in questions_dict:
-                questions_dict[question.uuid] = QuestionSch(
-                    id=str(question.uuid),
-                    question=question.text,
+        for question_id, question_text, answer_id, answer_text in rows:
+            if question_id not in questions_dict:
+                questions_dict[question_id] = QuestionSch(
+                    id=str(question_id),
+                    question=question_text,
                     answers=[]
                 )
-            questions_dict[question.uuid].answers.append(
+            questions_dict[question_id].answers.append(
                 AnswerSch(
-                    id=str(answer.uuid),
-                    text=answer.text
+                    id=str(answer_id),
+                    text=answer_text
                 )
             )
 
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from urllib.parse import quote_plus
 
@@ -9,12 +10,90 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_NAME: str
 
+    # database runtime profile
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMAND_TIMEOUT: float = 30.0
+
+    # connections opened and prepared during warmup, capped by DB_POOL_SIZE
+    WARMUP_CONNECTIONS: int = 4
+
+    # read replica, reads stay on the primary when DB_REPLICA_HOST is not set
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: str | None = None
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 1.0
+    DB_REPLICA_STICKY_SECONDS: float = 10.0
+
+    # group commit of registrations and test submissions
+    WRITE_BATCHING: bool = False
+    WRITE_BATCH_MAX_ITEMS: int = 100
+    WRITE_BATCH_MAX_DELAY: float = 0.002
+    WRITE_BATCH_WORKERS: int = 2
+
+    # admission control: concurrent requests and wait queue per route class, 0 concurrency disables the limit;
+    # read + write + bulk concurrency should stay within DB_POOL_SIZE + DB_MAX_OVERFLOW
+    ADMISSION_READ_CONCURRENCY: int = 10
+    ADMISSION_READ_QUEUE: int = 100
+    ADMISSION_WRITE_CONCURRENCY: int = 8
+    ADMISSION_WRITE_QUEUE: int = 50
+    ADMISSION_BULK_CONCURRENCY: int = 2
+    ADMISSION_BULK_QUEUE: int = 0
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_RETRY_AFTER: int = 1
+
+    # serialize route responses once, skipping FastAPI's response_model validation
+    FAST_RESPONSES: bool = False
+
+    # debug header with the number of SQL statements a request executed
+    METRICS_QUERY_COUNT_HEADER: bool = False
+
+    # bulk import and export
+    IMPORT_CHUNK_SIZE: int = 1000
+    # rows whose errors are listed in the import report, the others are only counted
+    IMPORT_MAX_ERRORS: int = 100
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # applicant results cache, 0 disables it
+    RESULTS_CACHE_SIZE: int = 0
+    RESULTS_CACHE_TTL: float = 2.0
+
+    # responses replayed to retries with the same Idempotency-Key, 0 disables the store
+    IDEMPOTENCY_STORE_SIZE: int = 10000
+    IDEMPOTENCY_TTL: float = 3600.0
+
+    # answer sets whose faculty type scores are memoized per scoring matrix, 0 disables the memo
+    SCORING_MEMO_SIZE: int = 10000
+
+    # faculty recommendations
+    RANKING_COMPLIANCE_WEIGHT: float = 0.6
+    RANKING_EXAM_WEIGHT: float = 0.4
+    RANKING_MARGIN_CAP: int = Field(default=30, gt=0)
+
     @property
     def postgres_url(self):
         # Экранируем специальные символы в пароле
         safe_password = quote_plus(self.DB_PASSWORD)
         return f'postgresql+asyncpg://{self.DB_USER}:{safe_password}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
 
+    @property
+    def postgres_replica_url(self):
+        if not self.DB_REPLICA_HOST:
+            return None
+        safe_password = quote_plus(self.DB_PASSWORD)
+        port = self.DB_REPLICA_PORT or self.DB_PORT
+        return f'postgresql+asyncpg://{self.DB_USER}:{safe_password}@{self.DB_REPLICA_HOST}:{port}/{self.DB_NAME}'
+
+    @property
+    def postgres_dsn(self):
+        # DSN для прямого подключения asyncpg (LISTEN/NOTIFY)
+        return self.postgres_url.replace('postgresql+asyncpg://', 'postgresql://', 1)
+
     model_config = SettingsConfigDict(
         env_file='.env',
         env_file_encoding='utf-8',
@@ -0,0 +1,132 @@
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+T = TypeVar("T")
+
+Work = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class BatchWriter:
+    """
+    Group commit for small write transactions.
+
+    Requests submit their writes as `work(session)` coroutines that execute statements without
+    committing. Flusher tasks take everything queued (up to `max_items`, waiting at most `max_delay`
+    for more), run it in one transaction and commit once, so many requests share one WAL flush.
+    A submitter's future resolves only after the commit of its batch, with the value its work returned.
+
+    If a batch fails, its items are retried one transaction each, so one bad item only fails
+    its own request.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker, max_items: int, max_delay: float, workers: int = 1):
+        """
+        Args:
+            session_maker: Factory of the sessions batches are written with
+            max_items: Largest number of items in one transaction
+            max_delay: Seconds a flusher waits for more items once it has one
+            workers: Number of flushers, i.e. transactions in flight at once
+        """
+        self.session_maker = session_maker
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.workers = workers
+        self.batches = 0
+        self.items = 0
+        self._queue: asyncio.Queue[tuple[Work, asyncio.Future]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Write what is queued and stop the flushers"""
+        tasks, self._tasks = self._tasks, []
+        if tasks:
+            await self._queue.join()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, work: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        Queue writes and wait until they are committed.
+
+        Args:
+            work: Coroutine function executing the statements on the given session, without committing
+
+        Returns:
+            What `work` returned
+
+        Raises:
+            RuntimeError: If the writer is not running
+            Exception: Whatever `work` or its commit raised when run on its own
+        """
+        if not self._tasks:
+            raise RuntimeError("BatchWriter is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((work, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_items:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[tuple[Work, asyncio.Future]]) -> None:
+        try:
+            async with self.session_maker() as session:
+                results = [await work(session) for work, _ in batch]
+                await session.commit()
+        except Exception:
+            # Откатываем пакет целиком и пишем элементы по одному, чтобы ошибка досталась только виновнику
+            for item in batch:
+                await self._flush_one(*item)
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _flush_one(self, work: Work, future: asyncio.Future) -> None:
+        try:
+            async with self.session_maker() as session:
+                result = await work(session)
+                await session.commit()
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+
+        self.batches += 1
+        self.items += 1
+        if not future.done():
+            future.set_result(result)
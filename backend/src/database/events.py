@@ -0,0 +1,66 @@
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+_CHANGED_TABLES = "changed_tables"
+
+_listeners: dict[str, list[Callable[[], None]]] = defaultdict(list)
+
+
+def on_change(*models) -> Callable:
+    """
+    Register a callback fired after a commit that changed rows of any of the given models.
+
+    Args:
+        models: SQLModel table classes to watch
+
+    Returns:
+        Decorator that registers the callback and returns it unchanged
+    """
+    def decorator(func: Callable[[], None]) -> Callable[[], None]:
+        for model in models:
+            _listeners[model.__tablename__].append(func)
+        return func
+
+    return decorator
+
+
+def watched_tables() -> list[str]:
+    """Names of the tables that have registered callbacks"""
+    return sorted(_listeners)
+
+
+def notify(table_name: str) -> None:
+    """Fire every callback registered for the table"""
+    for listener in _listeners.get(table_name, ()):
+        listener()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context) -> None:
+    # В after_flush коллекции new/dirty/deleted ещё содержат состояние до flush
+    changed = session.info.setdefault(_CHANGED_TABLES, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        changed.add(type(instance).__tablename__)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed_tables(orm_execute_state) -> None:
+    # Массовые insert/update/delete не проходят через flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        changed = orm_execute_state.session.info.setdefault(_CHANGED_TABLES, set())
+        changed.add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed_tables(session: Session) -> None:
+    for table_name in session.info.pop(_CHANGED_TABLES, ()):
+        notify(table_name)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_tables(session: Session, previous_transaction) -> None:
+    session.info.pop(_CHANGED_TABLES, None)
@@ -1,32 +1,114 @@
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlmodel import SQLModel
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from fastapi import Depends, Request
+from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import sessionmaker
 
 from backend.src.config import settings
+from backend.src.database.batching import BatchWriter
+from backend.src.database.migrations import check_schema
+from backend.src.database.pool import TimedQueuePool
+from backend.src.database.replica import ReplicaRouter, STICKY_COOKIE
 
 
-async_engine = create_async_engine(
-    url=settings.postgres_url,
-    echo=True
+def create_engine(url: str) -> AsyncEngine:
+    """
+    Create an engine with the runtime profile from settings.
+
+    Args:
+        url: SQLAlchemy database URL
+
+    Returns:
+        AsyncEngine with a TimedQueuePool
+    """
+    return create_async_engine(
+        url=make_url(url).update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}),
+        echo=settings.DB_ECHO,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={"command_timeout": settings.DB_COMMAND_TIMEOUT},
+    )
+
+
+async_engine = create_engine(settings.postgres_url)
+
+async_session_maker = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
 )
 
+batch_writer = BatchWriter(
+    async_session_maker,
+    max_items=settings.WRITE_BATCH_MAX_ITEMS,
+    max_delay=settings.WRITE_BATCH_MAX_DELAY,
+    workers=settings.WRITE_BATCH_WORKERS
+) if settings.WRITE_BATCHING else None
+
+replica_engine = create_engine(settings.postgres_replica_url) if settings.postgres_replica_url else None
+
+replica_session_maker = async_sessionmaker(
+    bind=replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if replica_engine else None
+
+replica_router = ReplicaRouter(
+    replica_engine,
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+    lag_check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL
+) if replica_engine else None
+
 
 async def init_db() -> None:
-    """"Create db tables"""
-    async with async_engine.begin() as conn:
-        from backend.src.database.models import ApplicantFaculty,Applicant, Faculty,\
-            AnswerFaculty, Answer, FacultyType, Question
-        await conn.run_sync(SQLModel.metadata.create_all)
+    """
+    Check that the db schema is up to date; startup runs no DDL.
+
+    Raises:
+        RuntimeError: If the schema has pending migrations, see `backend.src.database.migrate`
+    """
+    async with async_engine.connect() as conn:
+        await check_schema(conn)
 
 
 async def get_session() -> AsyncSession:
     """Dependency to provide the session object"""
-    async_session = sessionmaker(
-        bind=async_engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
+    async with async_session_maker() as session:
+        yield session
+
+
+def _applicant_key(request: Request) -> UUID | None:
+    try:
+        return UUID(request.path_params["applicant_uuid"])
+    except (KeyError, ValueError):
+        return None
+
+
+def stick_to_primary(applicant_uuid: UUID) -> None:
+    """Serve the next reads of a just written applicant from the primary"""
+    if replica_router is not None:
+        replica_router.stick(applicant_uuid)
+
+
+async def get_read_session(request: Request, session: AsyncSession = Depends(get_session)) -> AsyncSession:
+    """
+    Dependency to provide a session for read-only routes.
+
+    The session is bound to the replica when one is configured, it keeps up with the primary,
+    the applicant in the path was not just written by this process and the client's `primary_until`
+    cookie has expired; otherwise it is the primary session.
+    A replica session keeps the primary one in `info["primary"]` for the rare writes made while reading.
+    """
+    if replica_router is None or not await replica_router.use_replica(_applicant_key(request),
+                                                                     request.cookies.get(STICKY_COOKIE)):
+        yield session
+        return
 
-    async with async_session() as session:
-        yield session
\ No newline at end of file
+    async with replica_session_maker() as replica_session:
+        replica_session.info["primary"] = session
+        yield replica_session
@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+import sys
+
+from backend.src.database.events import watched_tables
+from backend.src.database.main import async_engine
+from backend.src.database.migrations import migrate, pending_migrations
+from backend.src.database.notifications import install_triggers
+import backend.src.applicants.routes  # noqa: F401 регистрирует on_change, от них зависит набор триггеров
+
+
+async def main(check: bool) -> int:
+    """
+    Apply pending migrations and (re)install the change notification triggers, or with `check` only list
+    pending migrations.
+
+    Returns:
+        int: Exit code, 1 if `check` found pending migrations
+    """
+    try:
+        if check:
+            async with async_engine.connect() as conn:
+                pending = await pending_migrations(conn)
+            for migration in pending:
+                print(f"pending {migration.version:04d}_{migration.name}")
+            return 1 if pending else 0
+
+        for migration in await migrate(async_engine):
+            print(f"applied {migration.version:04d}_{migration.name}")
+        async with async_engine.begin() as conn:
+            await install_triggers(conn)
+        print(f"installed change triggers on {len(watched_tables())} tables")
+        return 0
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--check", action="store_true", help="only list pending migrations, exit 1 if there are any")
+    sys.exit(asyncio.run(main(parser.parse_args().check)))
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from backend.src.database.migrations import (m0001_baseline, m0002_hot_path_indexes, m0003_analytics_aggregates,
+                                             m0004_applicant_listing_indexes, m0005_applicant_search,
+                                             m0006_drop_duplicate_uuid_keys)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Шаг изменения схемы; применяется один раз в своей транзакции"""
+    version: int
+    name: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+MIGRATIONS = [
+    Migration(1, "baseline", m0001_baseline.upgrade),
+    Migration(2, "hot_path_indexes", m0002_hot_path_indexes.upgrade),
+    Migration(3, "analytics_aggregates", m0003_analytics_aggregates.upgrade),
+    Migration(4, "applicant_listing_indexes", m0004_applicant_listing_indexes.upgrade),
+    Migration(5, "applicant_search", m0005_applicant_search.upgrade),
+    Migration(6, "drop_duplicate_uuid_keys", m0006_drop_duplicate_uuid_keys.upgrade),
+]
+
+# Ключ advisory lock, чтобы миграции с нескольких машин не применялись одновременно
+MIGRATION_LOCK = 58_213_001
+
+
+async def applied_versions(conn: AsyncConnection) -> set[int]:
+    """Versions recorded in schema_migrations, empty if the table does not exist yet"""
+    exists = (await conn.execute(text("SELECT to_regclass('schema_migrations') IS NOT NULL"))).scalar_one()
+    if not exists:
+        return set()
+    return set((await conn.execute(text("SELECT version FROM schema_migrations"))).scalars())
+
+
+async def pending_migrations(conn: AsyncConnection) -> list[Migration]:
+    """Migrations not applied to the database yet, in order"""
+    applied = await applied_versions(conn)
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+async def check_schema(conn: AsyncConnection) -> None:
+    """
+    Make sure the database schema is up to date.
+
+    Raises:
+        RuntimeError: If there are pending migrations
+    """
+    pending = await pending_migrations(conn)
+    if pending:
+        names = ", ".join(f"{migration.version:04d}_{migration.name}" for migration in pending)
+        raise RuntimeError(f"Database schema is out of date, pending migrations: {names}. "
+                           f"Run `python -m backend.src.database.migrate`")
+
+
+async def migrate(engine: AsyncEngine) -> list[Migration]:
+    """
+    Apply pending migrations, each in its own transaction.
+
+    Args:
+        engine: Engine of the database to migrate
+
+    Returns:
+        list: Applied migrations
+    """
+    applied = []
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK})
+        await conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT now()
+            )
+        """))
+        await conn.commit()
+        try:
+            for migration in await pending_migrations(conn):
+                await migration.upgrade(conn)
+                await conn.execute(text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                                   {"version": migration.version, "name": migration.name})
+                await conn.commit()
+                applied.append(migration)
+        finally:
+            await conn.rollback()
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK})
+            await conn.commit()
+    return applied
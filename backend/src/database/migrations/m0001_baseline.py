@@ -0,0 +1,104 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Схема на момент перехода на миграции; не меняется, новые объекты создают следующие миграции
+TABLES = [
+    """CREATE TABLE IF NOT EXISTS applicant (
+        uuid UUID NOT NULL,
+        surname VARCHAR(30),
+        name VARCHAR(30),
+        patronymic VARCHAR(30),
+        phone_number VARCHAR(11),
+        city VARCHAR(30),
+        dt_created TIMESTAMP WITHOUT TIME ZONE,
+        PRIMARY KEY (uuid),
+        UNIQUE (phone_number)
+    )""",
+    """CREATE TABLE IF NOT EXISTS exam (
+        uuid UUID NOT NULL,
+        name VARCHAR(50) NOT NULL,
+        code VARCHAR(50) NOT NULL,
+        PRIMARY KEY (uuid),
+        UNIQUE (code)
+    )""",
+    """CREATE TABLE IF NOT EXISTS faculty_type (
+        uuid UUID NOT NULL,
+        name VARCHAR(50),
+        PRIMARY KEY (uuid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS question (
+        uuid UUID NOT NULL,
+        text VARCHAR(200),
+        PRIMARY KEY (uuid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS answer (
+        uuid UUID NOT NULL,
+        text VARCHAR(200),
+        question_id UUID NOT NULL,
+        PRIMARY KEY (uuid),
+        FOREIGN KEY (question_id) REFERENCES question (uuid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS applicant_faculty (
+        uuid UUID NOT NULL,
+        compliance INTEGER,
+        applicant_id UUID NOT NULL,
+        faculty_type_id UUID NOT NULL,
+        PRIMARY KEY (uuid),
+        FOREIGN KEY (applicant_id) REFERENCES applicant (uuid),
+        FOREIGN KEY (faculty_type_id) REFERENCES faculty_type (uuid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS applicant_result (
+        applicant_id UUID NOT NULL,
+        revision INTEGER NOT NULL,
+        reference_version VARCHAR(16) NOT NULL,
+        document BYTEA NOT NULL,
+        PRIMARY KEY (applicant_id),
+        FOREIGN KEY (applicant_id) REFERENCES applicant (uuid) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS applicantexam (
+        uuid UUID NOT NULL,
+        applicant_id UUID NOT NULL,
+        exam_id UUID NOT NULL,
+        score INTEGER NOT NULL,
+        PRIMARY KEY (uuid),
+        FOREIGN KEY (applicant_id) REFERENCES applicant (uuid),
+        FOREIGN KEY (exam_id) REFERENCES exam (uuid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS faculty (
+        uuid UUID NOT NULL,
+        name VARCHAR(50),
+        url VARCHAR(200),
+        type_id UUID NOT NULL,
+        PRIMARY KEY (uuid),
+        FOREIGN KEY (type_id) REFERENCES faculty_type (uuid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS answer_faculty (
+        uuid UUID NOT NULL,
+        score INTEGER,
+        answer_id UUID NOT NULL,
+        faculty_type_id UUID NOT NULL,
+        PRIMARY KEY (uuid),
+        FOREIGN KEY (answer_id) REFERENCES answer (uuid),
+        FOREIGN KEY (faculty_type_id) REFERENCES faculty_type (uuid)
+    )""",
+    """CREATE TABLE IF NOT EXISTS faculty_exam_requirement (
+        uuid UUID NOT NULL,
+        faculty_id UUID NOT NULL,
+        exam_id UUID NOT NULL,
+        min_score INTEGER NOT NULL,
+        PRIMARY KEY (uuid),
+        FOREIGN KEY (faculty_id) REFERENCES faculty (uuid),
+        FOREIGN KEY (exam_id) REFERENCES exam (uuid)
+    )""",
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    """
+    Create the tables of the schema as it was when migrations were introduced.
+
+    Databases created by the former `create_all` at startup are adopted as they are.
+    """
+    for statement in TABLES:
+        await conn.execute(text(statement))
@@ -0,0 +1,29 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Индексы под фильтры и соединения сервисов; INCLUDE позволяет отвечать только по индексу
+INDEXES = [
+    # загрузка вариантов ответов вопросов
+    "CREATE INDEX IF NOT EXISTS ix_answer_question_id ON answer (question_id)",
+    # соответствие ответов типам факультетов
+    "CREATE INDEX IF NOT EXISTS ix_answer_faculty_answer_id ON answer_faculty (answer_id) "
+    "INCLUDE (faculty_type_id, score)",
+    # экзамены абитуриента: результаты, допуск, перезапись при регистрации
+    "CREATE INDEX IF NOT EXISTS ix_applicantexam_applicant_id ON applicantexam (applicant_id) "
+    "INCLUDE (exam_id, score)",
+    # результаты теста абитуриента
+    "CREATE INDEX IF NOT EXISTS ix_applicant_faculty_applicant_id ON applicant_faculty (applicant_id) "
+    "INCLUDE (faculty_type_id, compliance)",
+    # факультеты по типу
+    "CREATE INDEX IF NOT EXISTS ix_faculty_type_id ON faculty (type_id)",
+    # требования факультета к экзаменам
+    "CREATE INDEX IF NOT EXISTS ix_faculty_exam_requirement_faculty_id ON faculty_exam_requirement "
+    "(faculty_id, exam_id) INCLUDE (min_score)",
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    """Create indexes on the columns the service filters and joins on"""
+    for statement in INDEXES:
+        await conn.execute(text(statement))
@@ -0,0 +1,48 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+TABLES = [
+    # '' в city — город не указан
+    """CREATE TABLE applicant_daily_count (
+        day DATE NOT NULL,
+        city VARCHAR(30) NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day, city)
+    )""",
+    """CREATE TABLE faculty_type_compliance_histogram (
+        faculty_type_id UUID NOT NULL,
+        compliance INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (faculty_type_id, compliance),
+        FOREIGN KEY (faculty_type_id) REFERENCES faculty_type (uuid)
+    )""",
+    """CREATE TABLE exam_score_histogram (
+        exam_id UUID NOT NULL,
+        score INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (exam_id, score),
+        FOREIGN KEY (exam_id) REFERENCES exam (uuid)
+    )""",
+]
+
+# Начальное заполнение по уже записанным абитуриентам; дальше сводки меняют сами записи
+BACKFILL = [
+    """INSERT INTO applicant_daily_count (day, city, count)
+    SELECT dt_created::date, coalesce(city, ''), count(*) FROM applicant
+    WHERE dt_created IS NOT NULL
+    GROUP BY dt_created::date, coalesce(city, '')""",
+    """INSERT INTO faculty_type_compliance_histogram (faculty_type_id, compliance, count)
+    SELECT faculty_type_id, compliance, count(*) FROM applicant_faculty
+    WHERE compliance IS NOT NULL
+    GROUP BY faculty_type_id, compliance""",
+    """INSERT INTO exam_score_histogram (exam_id, score, count)
+    SELECT exam_id, score, count(*) FROM applicantexam
+    GROUP BY exam_id, score""",
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    """Create the analytics aggregate tables and fill them from the existing applicants"""
+    for statement in TABLES + BACKFILL:
+        await conn.execute(text(statement))
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Порядок постраничного списка абитуриентов: страница читается с места курсора без OFFSET
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_applicant_dt_created_uuid ON applicant (dt_created, uuid)",
+    # список с фильтром по городу
+    "CREATE INDEX IF NOT EXISTS ix_applicant_city_dt_created_uuid ON applicant (city, dt_created, uuid)",
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    """Create the indexes of the keyset-paginated applicant listing"""
+    for statement in INDEXES:
+        await conn.execute(text(statement))
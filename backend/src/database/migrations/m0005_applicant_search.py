@@ -0,0 +1,34 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Поля поиска и выражение индекса на момент миграции; запрос поиска обязан повторять его буква в букву
+SEARCH_COLUMNS = ("surname", "name", "patronymic", "city")
+SEARCH_DOCUMENT = (
+    "lower(coalesce(surname, '') || ' ' || coalesce(name, '') || ' ' || coalesce(patronymic, '') || ' ' "
+    "|| coalesce(city, ''))"
+)
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    """
+    Index applicants for the search by name and city.
+
+    A trigram GiST index over all the fields where pg_trgm can be installed, otherwise
+    a prefix index per field.
+    """
+    available = (await conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')")
+    )).scalar_one()
+    if available:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_applicant_search_trgm ON applicant "
+            f"USING gist (({SEARCH_DOCUMENT}) gist_trgm_ops)"
+        ))
+        return
+    # Сборка PostgreSQL без contrib: поиск только по началу слов
+    for column in SEARCH_COLUMNS:
+        await conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_applicant_{column}_prefix ON applicant (lower({column}) text_pattern_ops)"
+        ))
@@ -0,0 +1,29 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Таблицы, у моделей которых до миграций uuid был и первичным ключом, и unique=True
+TABLES = [
+    "applicant_faculty",
+    "answer_faculty",
+    "applicant",
+    "faculty_type",
+    "faculty",
+    "answer",
+    "question",
+    "exam",
+    "faculty_exam_requirement",
+    "applicantexam",
+]
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    """
+    Drop the unique constraints duplicating the uuid primary keys.
+
+    The old models emitted UNIQUE (uuid) next to PRIMARY KEY (uuid). PostgreSQL folds it into the
+    primary key when both are in one CREATE TABLE, but a constraint added to an existing table stays
+    as `<table>_uuid_key` with an index of its own.
+    """
+    for table in TABLES:
+        await conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_uuid_key"))
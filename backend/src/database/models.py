@@ -1,7 +1,8 @@
 from sqlmodel import SQLModel, Field, Column, Relationship
+from sqlalchemy import ForeignKey, String
 import sqlalchemy.dialects.postgresql as pg
 from uuid import UUID, uuid4
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 
 class ApplicantFaculty(SQLModel, table=True):
@@ -10,7 +11,7 @@ class ApplicantFaculty(SQLModel, table=True):
     """
     __tablename__ = 'applicant_faculty'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     compliance: int | None = Field(default=None)
 
@@ -24,7 +25,7 @@ class AnswerFaculty(SQLModel, table=True):
     """
     __tablename__ = 'answer_faculty'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     score: int | None = Field(default=None)
 
@@ -38,7 +39,7 @@ class Applicant(SQLModel, table=True):
     """
     __tablename__ = 'applicant'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     surname: str | None = Field(max_length=30)
     name: str | None = Field(max_length=30)
@@ -56,7 +57,7 @@ class FacultyType(SQLModel, table=True):
     """
     __tablename__ = 'faculty_type'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     name: str | None = Field(max_length=50)
 
@@ -67,7 +68,7 @@ class Faculty(SQLModel, table=True):
     """
     __tablename__ = 'faculty'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     name: str | None = Field(max_length=50)
     url: str | None = Field(max_length=200)
@@ -84,7 +85,7 @@ class Answer(SQLModel, table=True):
     """
     __tablename__ = 'answer'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     text: str | None = Field(max_length=200)
 
@@ -97,7 +98,7 @@ class Question(SQLModel, table=True):
     """
     __tablename__ = 'question'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     text: str | None = Field(max_length=200)
 
@@ -108,7 +109,7 @@ class Exam(SQLModel, table=True):
     """
     __tablename__ = 'exam'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     name: str = Field(max_length=50, nullable=False)
     code: str = Field(max_length=50, nullable=False, unique=True)
@@ -120,7 +121,7 @@ class FacultyExamRequirement(SQLModel, table=True):
     """
     __tablename__ = 'faculty_exam_requirement'
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     faculty_id: UUID = Field(foreign_key="faculty.uuid")
     exam_id: UUID = Field(foreign_key="exam.uuid")
@@ -135,11 +136,59 @@ class ApplicantExam(SQLModel, table=True):
     This class contains what exams the applicant passed and his scores.
     """
     uuid: UUID = Field(
-        sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4)
+        sa_column=Column(pg.UUID, primary_key=True, default=uuid4)
     )
     applicant_id: UUID = Field(foreign_key="applicant.uuid")
     exam_id: UUID = Field(foreign_key="exam.uuid")
     score: int
 
     applicant: Applicant = Relationship(back_populates="passed_exams")
-    exam: Exam = Relationship()
\ No newline at end of file
+    exam: Exam = Relationship()
+
+
+class ApplicantResult(SQLModel, table=True):
+    """
+    This class contains the serialized results of the applicant, maintained on every write.
+    """
+    __tablename__ = 'applicant_result'
+    applicant_id: UUID = Field(
+        sa_column=Column(pg.UUID, ForeignKey('applicant.uuid', ondelete='CASCADE'), primary_key=True)
+    )
+    revision: int = Field(default=0)
+    reference_version: str = Field(max_length=16, default='')
+    document: bytes = Field(sa_column=Column(pg.BYTEA, nullable=False))
+
+
+class ApplicantDailyCount(SQLModel, table=True):
+    """
+    This class contains the number of applicants per registration day and city, maintained on every write.
+    """
+    __tablename__ = 'applicant_daily_count'
+    day: date = Field(sa_column=Column(pg.DATE, primary_key=True))
+    # '' — город не указан
+    city: str = Field(sa_column=Column(String(30), primary_key=True))
+    count: int = Field(default=0)
+
+
+class ComplianceHistogram(SQLModel, table=True):
+    """
+    This class contains the number of applicants per faculty type and compliance, maintained on every write.
+    """
+    __tablename__ = 'faculty_type_compliance_histogram'
+    faculty_type_id: UUID = Field(
+        sa_column=Column(pg.UUID, ForeignKey('faculty_type.uuid'), primary_key=True)
+    )
+    compliance: int = Field(primary_key=True)
+    count: int = Field(default=0)
+
+
+class ExamScoreHistogram(SQLModel, table=True):
+    """
+    This class contains the number of applicants per exam and score, maintained on every write.
+    """
+    __tablename__ = 'exam_score_histogram'
+    exam_id: UUID = Field(
+        sa_column=Column(pg.UUID, ForeignKey('exam.uuid'), primary_key=True)
+    )
+    score: int = Field(primary_key=True)
+    count: int = Field(default=0)
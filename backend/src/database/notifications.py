@@ -0,0 +1,94 @@
+import asyncio
+import logging
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.src.database.events import notify, watched_tables
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "table_changed"
+
+NOTIFY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_table_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{CHANNEL}', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+async def install_triggers(conn: AsyncConnection) -> None:
+    """
+    Create statement-level triggers that NOTIFY about changes of every watched table.
+
+    Args:
+        conn: Connection inside a transaction
+    """
+    await conn.execute(text(NOTIFY_FUNCTION))
+    for table_name in watched_tables():
+        await conn.execute(text(
+            f"CREATE OR REPLACE TRIGGER {table_name}_changed "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table_name} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION notify_table_changed()"
+        ))
+
+
+class TableChangeListener:
+    """
+    Dedicated asyncpg connection that LISTENs for table change notifications.
+
+    Every notification fires the `on_change` callbacks of the table, so changes committed by other
+    processes (other workers, pgAdmin, migrations) invalidate this process's snapshots too.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 5.0):
+        """
+        Args:
+            dsn: asyncpg connection string
+            reconnect_delay: Seconds between reconnection attempts after the connection is lost
+        """
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Connect and start listening"""
+        self._connection = await asyncpg.connect(self._dsn)
+        await self._connection.add_listener(CHANNEL, self._on_notification)
+        self._connection.add_termination_listener(self._on_termination)
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection"""
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        connection, self._connection = self._connection, None
+        if connection and not connection.is_closed():
+            connection.remove_termination_listener(self._on_termination)
+            await connection.close()
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        notify(payload)
+
+    def _on_termination(self, connection) -> None:
+        logger.warning("Table change listener connection lost, reconnecting")
+        self._connection = None
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while True:
+            try:
+                await self.start()
+                break
+            except (OSError, asyncpg.PostgresError):
+                await asyncio.sleep(self._reconnect_delay)
+        self._reconnect_task = None
+        # Уведомления, пришедшие без подключения, потеряны, поэтому сбрасываем всё
+        for table_name in watched_tables():
+            notify(table_name)
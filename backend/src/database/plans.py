@@ -0,0 +1,73 @@
+import json
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# Запросы, которые имеет смысл объяснять: DDL и служебные команды пропускаем
+EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+
+async def large_tables(conn: AsyncConnection, min_rows: int) -> set[str]:
+    """Tables of the public schema the planner estimates to hold at least `min_rows` rows"""
+    result = await conn.execute(text("""
+        SELECT relname FROM pg_class
+        WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace AND reltuples >= :min_rows
+    """), {"min_rows": min_rows})
+    return set(result.scalars())
+
+
+async def explain(conn: AsyncConnection, statement: str, parameters: Any = ()) -> dict:
+    """
+    Get the plan of a statement as executed by the driver, without running it.
+
+    Args:
+        conn: Connection to explain on
+        statement: SQL as sent to the database, e.g. captured in `before_cursor_execute`
+        parameters: Parameters sent with it
+
+    Returns:
+        dict: Top plan node of `EXPLAIN (FORMAT JSON)`
+    """
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters or ()))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def seq_scans(plan: dict, tables: Iterable[str]) -> list[str]:
+    """Names of the given tables the plan reads with a sequential scan"""
+    tables = set(tables)
+    return [node["Relation Name"] for node in _nodes(plan)
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables]
+
+
+async def find_seq_scans(conn: AsyncConnection, statements: Iterable[tuple[str, Any]],
+                         min_rows: int) -> dict[str, list[str]]:
+    """
+    Explain statements and report those scanning large tables sequentially.
+
+    Args:
+        conn: Connection to explain on
+        statements: (statement, parameters) pairs as sent by the driver
+        min_rows: Estimated row count from which a table counts as large
+
+    Returns:
+        dict: statement -> sequentially scanned large tables, only for offending statements
+    """
+    tables = await large_tables(conn, min_rows)
+    offending = {}
+    for statement, parameters in statements:
+        if not statement.lstrip().lower().startswith(EXPLAINABLE):
+            continue
+        scanned = seq_scans(await explain(conn, statement, parameters), tables)
+        if scanned:
+            offending[statement] = scanned
+    return offending
@@ -0,0 +1,46 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from backend.src.internal.request_stats import record_pool_wait
+
+
+class PoolWaitStats:
+    """Counters of how long connection checkouts waited for the pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records checkout wait times.
+
+    The time spent in `_do_get` covers waiting for a free connection and opening a new one
+    when the pool may still grow. It is also added to the statistics of the current request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        wait = time.perf_counter() - started
+        self.stats.record(wait)
+        record_pool_wait(wait)
+        return connection
@@ -0,0 +1,145 @@
+import math
+import time
+from contextvars import ContextVar
+from typing import Hashable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Отставание реплики в секундах; 0, если реплика догнала мастер или это не standby
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Cookie с временем (unix, секунды), до которого чтения клиента идут на мастер
+STICKY_COOKIE = "primary_until"
+
+# Сроки липкости, выставленные записями обрабатываемого запроса; None вне запросов
+_written_until: ContextVar[list[float] | None] = ContextVar("written_until", default=None)
+
+
+class ReplicaRouter:
+    """
+    Decides whether a read may be served by the replica.
+
+    Reads go to the primary while the replica lags more than `max_lag` or cannot be reached.
+    For `sticky_seconds` after a write, reads of the written key in this process go to the primary,
+    and so do the reads of the writing client on any worker: `ReadYourWritesMiddleware` hands it
+    the `primary_until` cookie. A client that drops cookies sees its writes only on the worker that made them.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, sticky_seconds: float, lag_check_interval: float):
+        """
+        Args:
+            engine: Replica engine
+            max_lag: Largest replication lag in seconds the replica may serve reads with
+            sticky_seconds: How long reads of a written key stay on the primary
+            lag_check_interval: How often the lag is measured, in seconds
+        """
+        self.engine = engine
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.lag_check_interval = lag_check_interval
+        self._sticky: dict[Hashable, float] = {}
+        self._lag_checked = float("-inf")
+        self._lagging = False
+
+    def stick(self, key: Hashable) -> None:
+        """Route reads of the key, and of the current request's client, to the primary for the next `sticky_seconds`"""
+        written = _written_until.get()
+        if written is not None:
+            written.append(time.time() + self.sticky_seconds)
+        now = time.monotonic()
+        self._sticky[key] = now + self.sticky_seconds
+        # Заодно выбрасываем истекшие ключи, чтобы словарь не рос
+        if len(self._sticky) > 1024:
+            self._sticky = {key: until for key, until in self._sticky.items() if until > now}
+
+    def is_sticky(self, key: Hashable) -> bool:
+        until = self._sticky.get(key)
+        if until is None:
+            return False
+        if until < time.monotonic():
+            del self._sticky[key]
+            return False
+        return True
+
+    async def measure_lag(self) -> float:
+        """Replication lag of the replica in seconds"""
+        async with self.engine.connect() as conn:
+            return float((await conn.execute(LAG_QUERY)).scalar_one())
+
+    async def replica_usable(self) -> bool:
+        """Whether the replica is reachable and within the allowed lag, re-measured at most once per interval"""
+        now = time.monotonic()
+        if now - self._lag_checked >= self.lag_check_interval:
+            self._lag_checked = now
+            try:
+                self._lagging = await self.measure_lag() > self.max_lag
+            except Exception:
+                self._lagging = True
+        return not self._lagging
+
+    async def use_replica(self, key: Hashable | None = None, sticky_until: str | None = None) -> bool:
+        """
+        Decide where a read goes.
+
+        Args:
+            key: What the read is about, e.g. an applicant UUID
+            sticky_until: Value of the client's `primary_until` cookie
+
+        Returns:
+            bool: True if the replica may serve it
+        """
+        if key is not None and self.is_sticky(key):
+            return False
+        if sticky_until is not None and _cookie_time(sticky_until) > time.time():
+            return False
+        return await self.replica_usable()
+
+
+def _cookie_time(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware giving the client of a request that wrote the `primary_until` cookie.
+
+    Writes call `ReplicaRouter.stick`; the cookie carries the latest sticky deadline, so the reads
+    the client sends to other workers stay on the primary as well, see `get_read_session`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        written: list[float] = []
+        token = _written_until.set(written)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and written:
+                until = max(written)
+                max_age = max(1, math.ceil(until - time.time()))
+                MutableHeaders(scope=message).append(
+                    "set-cookie", f"{STICKY_COOKIE}={until:.3f}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _written_until.reset(token)
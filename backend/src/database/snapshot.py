@@ -0,0 +1,64 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Generic, TypeVar
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+T = TypeVar("T")
+
+
+class Snapshot(ABC, Generic[T]):
+    """
+    Process-wide, lazily built copy of data derived from the database.
+
+    Subclasses implement `load`. The value is built on first use, replaced as a whole on refresh
+    and dropped by `invalidate`, typically from an `on_change` callback.
+    """
+
+    def __init__(self):
+        self._value: T | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    @abstractmethod
+    async def load(self, session: AsyncSession) -> T:
+        """Build a fresh value from the database"""
+
+    def invalidate(self) -> None:
+        """Drop the current value so the next access rebuilds it"""
+        self._generation += 1
+        self._value = None
+
+    async def get(self, session: AsyncSession) -> T:
+        """
+        Get the current value, building it if needed.
+
+        Args:
+            session: AsyncSession used only when the value has to be (re)built; a replica session
+                builds from its primary so a lagging replica is never cached process-wide
+
+        Returns:
+            Current value
+        """
+        value = self._value
+        if value is not None:
+            return value
+
+        async with self._lock:
+            if self._value is not None:
+                return self._value
+            return await self._build(session)
+
+    async def refresh(self, session: AsyncSession) -> T:
+        """Rebuild the value now and swap it in"""
+        async with self._lock:
+            return await self._build(session)
+
+    async def _build(self, session: AsyncSession) -> T:
+        generation = self._generation
+        value = await self.load(session.info.get("primary", session))
+        # Если данные поменялись во время загрузки, не кэшируем устаревшее значение
+        if generation == self._generation:
+            self._value = value
+        return value
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import Depends, HTTPException, status
+
+from backend.src.config import settings
+from backend.src.internal.metrics import LATENCY_BUCKETS, Counter, Gauge, Histogram
+
+
+# Классы маршрутов со своими бюджетами: чтения (анкета, результаты), записи и массовые выгрузки
+READ = "read"
+WRITE = "write"
+BULK = "bulk"
+
+QUEUE_FULL = "queue_full"
+TIMEOUT = "timeout"
+
+
+class AdmissionMetrics:
+    """Per-class in-flight requests, queue depth, queue wait and rejections"""
+
+    def __init__(self):
+        labels = ("route_class",)
+        self.in_flight = Gauge("http_admission_in_flight", "Requests holding an admission slot.", labels)
+        self.queue_depth = Gauge("http_admission_queue_depth", "Requests waiting for an admission slot.", labels)
+        self.wait = Histogram("http_admission_wait_seconds", "Time spent waiting for an admission slot.",
+                              LATENCY_BUCKETS, labels)
+        self.rejected = Counter("http_admission_rejected_total", "Requests rejected with 503 by admission control.",
+                                ("route_class", "reason"))
+
+    def expose(self) -> str:
+        """All admission metrics in the Prometheus text exposition format"""
+        return "\n".join(line for metric in (self.in_flight, self.queue_depth, self.wait, self.rejected)
+                         for line in metric.expose()) + "\n"
+
+
+admission_metrics = AdmissionMetrics()
+
+
+class Overloaded(Exception):
+    """The request was not admitted: the wait queue is full or the wait timed out"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit of a route class with a bounded wait queue.
+
+    Up to `concurrency` requests run at once, up to `queue` more wait for a slot in arrival order
+    for at most `timeout` seconds, and the rest are rejected at once. Keeping the number of running
+    requests below the database pool size means requests wait here, where the wait is bounded,
+    rather than inside the pool until DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float,
+                 metrics: AdmissionMetrics = admission_metrics):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.metrics = metrics
+        self.in_flight = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(concurrency)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Raises:
+            Overloaded: If the queue is full or no slot freed up within the timeout
+        """
+        labels = (self.name,)
+        if self._slots.locked():
+            if self.waiting >= self.queue:
+                self.metrics.rejected.inc((self.name, QUEUE_FULL))
+                raise Overloaded(QUEUE_FULL)
+            started = time.perf_counter()
+            self.waiting += 1
+            self.metrics.queue_depth.set(labels, self.waiting)
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self.metrics.rejected.inc((self.name, TIMEOUT))
+                raise Overloaded(TIMEOUT)
+            finally:
+                self.waiting -= 1
+                self.metrics.queue_depth.set(labels, self.waiting)
+            self.metrics.wait.observe(labels, time.perf_counter() - started)
+        else:
+            await self._slots.acquire()
+            self.metrics.wait.observe(labels, 0.0)
+
+        self.in_flight += 1
+        self.metrics.in_flight.set(labels, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.metrics.in_flight.set(labels, self.in_flight)
+            self._slots.release()
+
+
+class AdmissionControl:
+    """
+    Limiters of the route classes, built from the settings.
+
+    A class with a concurrency of 0 is not limited.
+    """
+
+    def __init__(self):
+        self.limiters = {
+            READ: AdmissionLimiter(READ, settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE,
+                                   settings.ADMISSION_QUEUE_TIMEOUT),
+            WRITE: AdmissionLimiter(WRITE, settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE,
+                                    settings.ADMISSION_QUEUE_TIMEOUT),
+            BULK: AdmissionLimiter(BULK, settings.ADMISSION_BULK_CONCURRENCY, settings.ADMISSION_BULK_QUEUE,
+                                   settings.ADMISSION_QUEUE_TIMEOUT),
+        }
+
+    def dependency(self, route_class: str):
+        """
+        Route dependency holding a slot of the class until the response is sent.
+
+        Raises:
+            HTTPException: 503 with Retry-After if the request is not admitted
+        """
+        async def admitted() -> AsyncIterator[None]:
+            # Ограничитель ищется при каждом запросе, чтобы его можно было заменить без пересборки маршрутов
+            limiter = self.limiters[route_class]
+            if limiter.concurrency <= 0:
+                yield
+                return
+            try:
+                async with limiter.admit():
+                    yield
+            except Overloaded as error:
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                    detail=f"Service overloaded: {error.reason}",
+                                    headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)})
+
+        return Depends(admitted)
+
+
+admission_control = AdmissionControl()
@@ -0,0 +1,46 @@
+import time
+from contextlib import contextmanager
+
+
+class BootTimer:
+    """
+    Wall-clock breakdown of a worker boot, from the import of the app to the end of warmup.
+
+    Kept free of heavy imports, so that importing it first starts the clock before the app is imported.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.ready = False
+        self.error: str | None = None
+        self._ready_at: float | None = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a startup phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def mark(self, name: str) -> None:
+        """Record a phase that ran from the start of the boot until now"""
+        self.phases[name] = time.perf_counter() - self.started
+
+    def set_ready(self) -> None:
+        self._ready_at = time.perf_counter()
+        self.ready = True
+
+    def report(self) -> dict:
+        """Phase durations and the total in milliseconds"""
+        return {
+            "ready": self.ready,
+            "total_ms": round(1000 * ((self._ready_at or time.perf_counter()) - self.started), 1),
+            "phases": {name: round(1000 * seconds, 1) for name, seconds in self.phases.items()},
+            "error": self.error
+        }
+
+
+boot = BootTimer()
@@ -0,0 +1,209 @@
+import bisect
+import inspect
+import time
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.src.config import settings
+from backend.src.internal.request_stats import RequestStats, current_request
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Запросы, не попавшие ни в один маршрут, считаются под одной меткой, чтобы не плодить ряды
+UNMATCHED = "unmatched"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Prometheus histogram with labels, kept in process memory"""
+
+    def __init__(self, name: str, description: str, buckets: tuple, labels: tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        # значения меток -> [счётчики по корзинам (последняя +Inf), сумма]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, labels: tuple[str, ...]) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def sum(self, labels: tuple[str, ...]) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def expose(self) -> list[str]:
+        """Lines of the text exposition format"""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total) in sorted(self._series.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{_format(bound)}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {_format(total)}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Prometheus counter with labels, kept in process memory"""
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...], kind: str = "counter"):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.kind = kind
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: tuple[str, ...]) -> float:
+        return self._values.get(labels, 0)
+
+    def expose(self) -> list[str]:
+        """Lines of the text exposition format"""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for values, value in sorted(self._values.items()):
+            labels = ",".join(f'{name}="{_escape(label)}"' for name, label in zip(self.labels, values))
+            lines.append(f"{self.name}{{{labels}}} {_format(value)}" if labels else f"{self.name} {_format(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Prometheus gauge with labels: a counter that can also go down or be set"""
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...]):
+        super().__init__(name, description, labels, kind="gauge")
+
+    def set(self, labels: tuple[str, ...], value: float) -> None:
+        self._values[labels] = value
+
+
+class RequestMetrics:
+    """Per-route histograms of the request latency and of what the request spent it on"""
+
+    def __init__(self):
+        labels = ("method", "route")
+        self.duration = Histogram("http_request_duration_seconds", "Total request latency.",
+                                  LATENCY_BUCKETS, labels)
+        self.statements = Histogram("http_request_db_statements", "SQL statements executed per request.",
+                                    STATEMENT_BUCKETS, labels)
+        self.db_time = Histogram("http_request_db_seconds", "Time spent executing SQL statements per request.",
+                                 LATENCY_BUCKETS, labels)
+        self.pool_wait = Histogram("http_request_db_pool_wait_seconds",
+                                   "Time spent waiting for pooled connections per request.", LATENCY_BUCKETS, labels)
+        self.serialization = Histogram("http_request_serialization_seconds",
+                                       "Time spent serializing the response per request.", LATENCY_BUCKETS, labels)
+
+    @property
+    def histograms(self) -> list[Histogram]:
+        return [self.duration, self.statements, self.db_time, self.pool_wait, self.serialization]
+
+    def observe(self, method: str, stats: RequestStats, duration: float) -> None:
+        labels = (method, stats.route or UNMATCHED)
+        self.duration.observe(labels, duration)
+        self.statements.observe(labels, stats.statements)
+        self.db_time.observe(labels, stats.db_time)
+        self.pool_wait.observe(labels, stats.pool_wait)
+        self.serialization.observe(labels, stats.serialization)
+
+    def expose(self) -> str:
+        """All histograms in the Prometheus text exposition format"""
+        return "\n".join(line for histogram in self.histograms for line in histogram.expose()) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware collecting the statistics of every HTTP request into `request_metrics`.
+
+    With METRICS_QUERY_COUNT_HEADER the response carries the number of SQL statements
+    executed before its headers were sent in `X-Query-Count`.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.METRICS_QUERY_COUNT_HEADER:
+                MutableHeaders(scope=message).append("X-Query-Count", str(stats.statements))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_request.reset(token)
+            self.metrics.observe(scope["method"], stats, time.perf_counter() - started)
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that labels the request statistics with its path and times the response serialization.
+
+    Serialization is what happens between the endpoint returning and the route handing over
+    the response: response_model validation and JSON encoding.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        endpoint = self.dependant.call
+
+        async def timed_endpoint(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                stats = current_request.get()
+                if stats is not None:
+                    stats.endpoint_returned = time.perf_counter()
+
+        if inspect.iscoroutinefunction(endpoint):
+            self.dependant.call = timed_endpoint
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            stats = current_request.get()
+            if stats is not None:
+                stats.route = self.path
+            response = await handler(request)
+            if stats is not None:
+                if stats.endpoint_returned is not None:
+                    stats.serialization += time.perf_counter() - stats.endpoint_returned
+            return response
+
+        return timed_handler
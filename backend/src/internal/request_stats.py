@@ -0,0 +1,63 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class RequestStats:
+    """Что запрос потратил на базу данных и сериализацию, время в секундах"""
+    statements: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+    serialization: float = 0.0
+    # Шаблон пути маршрута, None для запросов мимо маршрутов
+    route: str | None = None
+    # Когда обработчик маршрута вернул результат, от этой точки отсчитывается сериализация
+    endpoint_returned: float | None = None
+
+
+# Статистика обрабатываемого запроса; None вне запросов (прогрев, пакетная запись, фоновые задачи)
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def record_pool_wait(wait: float) -> None:
+    stats = current_request.get()
+    if stats is not None:
+        stats.pool_wait += wait
+
+
+def record_serialization(seconds: float) -> None:
+    stats = current_request.get()
+    if stats is not None:
+        stats.serialization += seconds
+
+
+# Слушатели висят на классе Engine, поэтому считают запросы всех движков процесса, включая реплику.
+# SQLAlchemy переносит контекст asyncio в greenlet драйвера, так что current_request здесь виден.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - started.pop()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Упавший запрос тоже считается, а его засечку снимаем, чтобы стек не рос
+    stats = current_request.get()
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if stats is not None and started:
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - started.pop()
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.src.database.main import async_engine
+from backend.src.internal.schemas import PoolStatus, BootReport, Readiness
+from backend.src.internal.boot import boot
+from backend.src.internal.admission import admission_metrics
+from backend.src.applicants.scoring import scoring_metrics
+from backend.src.internal.metrics import CONTENT_TYPE, TimedRoute, request_metrics
+
+internal_router = APIRouter(prefix="/internal", route_class=TimedRoute)
+
+probe_router = APIRouter(route_class=TimedRoute)
+
+
+def pool_status(engine: AsyncEngine) -> PoolStatus:
+    """Collect the pool gauges and wait counters of an engine"""
+    pool = engine.pool
+    stats = pool.stats
+    return PoolStatus(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        idle=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        max_overflow=pool._max_overflow,
+        timeout=pool.timeout(),
+        checkouts=stats.checkouts,
+        timeouts=stats.timeouts,
+        avg_wait_ms=round(1000 * stats.total_wait / stats.checkouts, 3) if stats.checkouts else 0.0,
+        max_wait_ms=round(1000 * stats.max_wait, 3)
+    )
+
+
+@internal_router.get("/db/pool",
+                     status_code=status.HTTP_200_OK,
+                     response_model=PoolStatus,
+                     summary="Database pool status",
+                     description="Returns checked-out and idle connections and checkout wait times")
+async def get_pool_status():
+    """
+    Get the state of the database connection pool of this worker.
+
+    Returns:
+        Pool gauges and checkout wait counters
+    """
+    return pool_status(async_engine)
+
+
+@internal_router.get("/boot",
+                     status_code=status.HTTP_200_OK,
+                     response_model=BootReport,
+                     summary="Boot time breakdown",
+                     description="Returns how long each startup phase of this worker took")
+async def get_boot_report():
+    """
+    Get the boot time breakdown of this worker.
+
+    Returns:
+        Durations of the startup phases and whether warmup has finished
+    """
+    return BootReport(**boot.report())
+
+
+@probe_router.get("/ready",
+                  status_code=status.HTTP_200_OK,
+                  response_model=Readiness,
+                  responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": Readiness}},
+                  summary="Readiness probe",
+                  description="Returns 200 once the worker has warmed up, 503 before that")
+async def get_readiness():
+    """
+    Readiness probe for the load balancer.
+
+    Returns:
+        {"status": "ready"}, or {"status": "warming_up"} with 503 while warmup runs
+    """
+    if not boot.ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+
+@probe_router.get("/metrics",
+                  status_code=status.HTTP_200_OK,
+                  response_class=Response,
+                  summary="Request metrics",
+                  description="Returns per-route latency, SQL statement, DB time, pool wait and serialization "
+                              "histograms, the admission control metrics and the scoring memo hit counters "
+                              "in the Prometheus text format")
+async def get_metrics():
+    """
+    Expose the request histograms, admission metrics and scoring memo counters of this worker for Prometheus.
+
+    Returns:
+        Text exposition of the histograms, labelled by method and route template, of the
+        admission metrics, labelled by route class, and of the scoring memo lookups
+    """
+    return Response(content=request_metrics.expose() + admission_metrics.expose() + scoring_metrics.expose(),
+                    media_type=CONTENT_TYPE)
@@ -0,0 +1,29 @@
+from sqlmodel import Field, SQLModel
+
+
+class PoolStatus(SQLModel):
+    """Состояние пула соединений с базой данных"""
+    size: int = Field(description="Постоянный размер пула", schema_extra={"example": 10})
+    checked_out: int = Field(description="Соединения, выданные запросам", schema_extra={"example": 3})
+    idle: int = Field(description="Свободные соединения в пуле", schema_extra={"example": 7})
+    overflow: int = Field(description="Соединения сверх постоянного размера", schema_extra={"example": 0})
+    max_overflow: int = Field(schema_extra={"example": 10})
+    timeout: float = Field(description="Сколько секунд запрос ждет соединение", schema_extra={"example": 30.0})
+    checkouts: int = Field(description="Выдано соединений с запуска", schema_extra={"example": 1520})
+    timeouts: int = Field(description="Запросов, не дождавшихся соединения", schema_extra={"example": 0})
+    avg_wait_ms: float = Field(schema_extra={"example": 0.12})
+    max_wait_ms: float = Field(schema_extra={"example": 35.4})
+
+
+class BootReport(SQLModel):
+    """Время запуска воркера по этапам"""
+    ready: bool = Field(description="Прогрев завершён, воркер принимает трафик", schema_extra={"example": True})
+    total_ms: float = Field(description="От импорта приложения до готовности", schema_extra={"example": 850.3})
+    phases: dict[str, float] = Field(description="Длительность этапов в миллисекундах",
+                                     schema_extra={"example": {"imports": 610.2, "init_db": 12.5, "pool": 40.1}})
+    error: str | None = Field(default=None, description="Ошибка прогрева, если он не удался")
+
+
+class Readiness(SQLModel):
+    """Готовность воркера принимать трафик"""
+    status: str = Field(schema_extra={"example": "ready"})
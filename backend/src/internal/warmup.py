@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import List
+from uuid import UUID
+
+from fastapi import FastAPI, HTTPException
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.src.config import settings
+from backend.src.database.main import async_engine, async_session_maker, replica_engine
+from backend.src.applicants.analytics import lock_applicant, replace_compliance, replace_exams
+from backend.src.applicants.documents import applicant_document_query, serialize_result
+from backend.src.applicants.eligibility import applicant_scores_query, eligibility_engine
+from backend.src.applicants.ranking import faculty_ranking
+from backend.src.applicants.reference import reference_data
+from backend.src.applicants.response_cache import response_store, QUESTIONS, EXAMS, REQUIRED_EXAMS
+from backend.src.applicants.schemas import QuestionSch, Exams, RequiredExams, ResponseResult
+from backend.src.applicants.scoring import scoring_engine
+from backend.src.applicants.service import QuestionService, ExamsService, applicant_results_query
+from backend.src.internal.boot import BootTimer, boot
+
+
+logger = logging.getLogger(__name__)
+
+# Несуществующий абитуриент: запросы с ним готовят планы, не находя строк
+NO_APPLICANT = UUID(int=0)
+
+
+def hot_statements() -> list:
+    """Statements of the per-request paths, in the form the services execute them"""
+    return [
+        applicant_document_query(NO_APPLICANT),
+        applicant_results_query(NO_APPLICANT),
+        applicant_scores_query(NO_APPLICANT),
+        replace_exams(NO_APPLICANT, {}),
+        lock_applicant(NO_APPLICANT),
+        replace_compliance(NO_APPLICANT, {}),
+    ]
+
+
+async def _prepare(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        for statement in hot_statements():
+            await conn.execute(statement)
+        # Удаления ничего не нашли, но транзакцию всё равно откатываем
+        await conn.rollback()
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    Open pooled connections at once and prepare the hot statements on each of them.
+
+    asyncpg prepared statements are per connection, so every warmed connection serves
+    its first requests without a parse/plan round trip.
+
+    Args:
+        engine: Engine whose pool is warmed
+        connections: Number of connections to open
+    """
+    await asyncio.gather(*(_prepare(engine) for _ in range(connections)))
+
+
+async def warm_caches() -> None:
+    """Load the process-wide snapshots and build the cached reference responses"""
+    async with async_session_maker() as session:
+        await reference_data.refresh(session)
+        await scoring_engine.refresh(session)
+        await eligibility_engine.refresh(session)
+        await faculty_ranking.get(session)
+
+        questions, exams = QuestionService(session), ExamsService(session)
+        for key, build, response_model in (
+            (QUESTIONS, questions.get_all_questions, List[QuestionSch]),
+            (EXAMS, exams.get_all_exams, Exams),
+            (REQUIRED_EXAMS, exams.get_all_required_exams, RequiredExams),
+        ):
+            try:
+                await response_store.get(key, build, response_model)
+            except HTTPException:
+                # Пустой справочник: ответ соберётся при первом запросе
+                pass
+
+
+def warm_schemas(app: FastAPI) -> None:
+    """Build the OpenAPI schema and run the results serializer once"""
+    app.openapi()
+    serialize_result(ResponseResult(
+        uuid=NO_APPLICANT, surname="", name="", phone_number="", city="", faculty_type=[], exams=[]
+    ))
+
+
+async def warm_up(app: FastAPI, timer: BootTimer = boot) -> None:
+    """
+    Warm the worker up and mark it ready.
+
+    A failing step is logged and reported in the boot breakdown; the worker becomes ready anyway
+    and serves the requests cold.
+
+    Args:
+        app: Application whose schemas are built
+        timer: Boot timer the phases are recorded in
+    """
+    try:
+        with timer.phase("pool"):
+            await warm_pool(async_engine, min(settings.WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+        if replica_engine is not None:
+            with timer.phase("replica_pool"):
+                await warm_pool(replica_engine, min(settings.WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+        with timer.phase("caches"):
+            await warm_caches()
+        with timer.phase("schemas"):
+            warm_schemas(app)
+    except Exception as error:
+        logger.exception("Warmup failed")
+        timer.error = repr(error)
+    timer.set_ready()
+    logger.info("Worker ready: %s", timer.report())
@@ -1,12 +1,14 @@
 import asyncio
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, text
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from uuid import UUID
 
 from backend.src.database.main import get_session
+from backend.src.database.migrations import migrate
 from backend.src.__init__ import app
 from backend.src.config import settings
 from backend.src.database.models import (
@@ -25,14 +27,18 @@ def event_loop():
     yield loop
     loop.close()
 
-@pytest.fixture(scope="function")
-async def prepare_database():
+async def drop_schema():
     async with test_engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.drop_all)
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+
+@pytest.fixture(scope="function")
+async def prepare_database():
+    # Схема создаётся миграциями, как в продакшене
+    await drop_schema()
+    await migrate(test_engine)
     yield
-    async with test_engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.drop_all)
+    await drop_schema()
 
 @pytest.fixture()
 async def client(prepare_database):
@@ -47,6 +53,18 @@ async def client(prepare_database):
 
     app.dependency_overrides.clear()
 
+@pytest.fixture()
+def statements():
+    """Collect SQL statements executed through the test engine"""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
 @pytest.fixture()
 async def test_data():
     async with TestSessionLocal() as session:
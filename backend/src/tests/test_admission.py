@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+
+from backend.src.internal.admission import (AdmissionLimiter, AdmissionMetrics, Overloaded, admission_control,
+                                            QUEUE_FULL, TIMEOUT, WRITE)
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_and_rejections():
+    metrics = AdmissionMetrics()
+    limiter = AdmissionLimiter("write", concurrency=1, queue=1, timeout=1.0, metrics=metrics)
+    admitted = []
+
+    async def request(number: int) -> None:
+        async with limiter.admit():
+            admitted.append(number)
+            await asyncio.sleep(0.01)
+
+    async with limiter.admit():
+        waiting = asyncio.create_task(request(1))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        # Очередь занята: отказ сразу, без ожидания
+        with pytest.raises(Overloaded) as error:
+            await request(2)
+        assert error.value.reason == QUEUE_FULL
+    await waiting
+
+    assert admitted == [1]
+    assert limiter.in_flight == 0 and limiter.waiting == 0
+    assert metrics.rejected.value(("write", QUEUE_FULL)) == 1
+    assert metrics.wait.count(("write",)) == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_wait_timeout():
+    metrics = AdmissionMetrics()
+    limiter = AdmissionLimiter("write", concurrency=1, queue=10, timeout=0.01, metrics=metrics)
+
+    async with limiter.admit():
+        with pytest.raises(Overloaded) as error:
+            async with limiter.admit():
+                pass
+    assert error.value.reason == TIMEOUT
+    assert metrics.rejected.value(("write", TIMEOUT)) == 1
+
+    # Слот, освобождённый после отказа, снова доступен
+    async with limiter.admit():
+        assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_overloaded_writes_shed_reads_served(client: AsyncClient, test_data, monkeypatch):
+    limiter = AdmissionLimiter(WRITE, concurrency=1, queue=0, timeout=1.0)
+    monkeypatch.setitem(admission_control.limiters, WRITE, limiter)
+
+    async with limiter.admit():
+        response = await client.post("/backend/api/applicant/register/", json={
+            "surname": "Иванов", "name": "Иван", "phone_number": "79001234567", "city": "Краснодар", "exams": []
+        })
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        # Анкета читается из своего бюджета
+        assert (await client.get("/backend/api/questions/")).status_code == 200
+
+    response = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Иванов", "name": "Иван", "phone_number": "79001234567", "city": "Краснодар", "exams": []
+    })
+    assert response.status_code == 200
+
+    metrics = (await client.get("/metrics")).text
+    assert '# TYPE http_admission_rejected_total counter' in metrics
+    assert 'http_admission_rejected_total{route_class="write",reason="queue_full"}' in metrics
+    assert 'http_admission_in_flight{route_class="write"} 0.0' in metrics
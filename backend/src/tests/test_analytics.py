@@ -0,0 +1,157 @@
+import asyncio
+import pytest
+from datetime import date, datetime
+from httpx import AsyncClient
+from sqlalchemy import text
+from uuid import UUID, uuid4
+
+from backend.src.applicants.analytics import lock_applicant, rebuild_analytics, replace_compliance, upsert_applicant
+from backend.src.tests.conftest import TestSessionLocal, test_engine
+
+
+RUS = "236e43f1-6d9a-42d2-bf80-514e7ed3030c"
+MATH = "bde589f5-c13e-4606-ad55-c394038091b8"
+
+
+async def _register(client: AsyncClient, phone_number: str, city: str | None, exams: dict[str, int]) -> str:
+    applicant = {
+        "surname": "Иванов", "name": "Иван", "phone_number": phone_number,
+        "exams": [{"exam_id": exam_id, "exam_name": "", "exam_code": "", "score": score}
+                  for exam_id, score in exams.items()]
+    }
+    if city is not None:
+        applicant["city"] = city
+    response = await client.post("/backend/api/applicant/register/", json=applicant)
+    assert response.status_code == 200
+    return response.json()["uuid"]
+
+
+async def _answer(client: AsyncClient, uuid: str, answer_ids: list[str]) -> None:
+    response = await client.post("/backend/api/results/", json={"uuid": uuid, "answers": [
+        {"question_id": "11111111-1111-1111-1111-111111111111", "answer_ids": answer_ids}
+    ]})
+    assert response.status_code == 201
+
+
+def _histograms(distributions: list[dict]) -> dict:
+    return {distribution["name"]: dict(zip(distribution["values"], distribution["counts"]))
+            for distribution in distributions}
+
+
+@pytest.mark.asyncio
+async def test_analytics_follow_writes(client: AsyncClient, test_data):
+    first = await _register(client, "79001234567", "Краснодар", {RUS: 80, MATH: 70})
+    second = await _register(client, "79001234568", "Сочи", {RUS: 80})
+    await _register(client, "79001234569", None, {})
+    await _answer(client, first, ["22222222-2222-2222-2222-222222222222"])
+    await _answer(client, second, ["22222222-2222-2222-2222-222222222222", "33333333-3333-3333-3333-333333333333"])
+
+    # Замена данных: старые значения вычитаются из сводок
+    await _register(client, "79001234568", "Краснодар", {RUS: 90})
+    await _answer(client, first, ["33333333-3333-3333-3333-333333333333"])
+    await client.post("/backend/api/applicant/import/", content=(
+        "surname,name,phone_number,city,math_basic\n"
+        "Иванов,Иван,79001234567,Краснодар,75\n"
+        "Петров,Петр,79001234570,Сочи,60\n"
+    ).encode(), headers={"Content-Type": "text/csv"})
+
+    analytics = (await client.get("/backend/api/analytics/")).json()
+    today = date.today().isoformat()
+    assert analytics["applicants"] == [
+        {"day": today, "city": None, "count": 1},
+        {"day": today, "city": "Краснодар", "count": 2},
+        {"day": today, "city": "Сочи", "count": 1},
+    ]
+    assert _histograms(analytics["compliance"]) == {"Гуманитарный": {5: 2}, "Технический": {10: 1}}
+    assert _histograms(analytics["exam_scores"]) == {"Математика (базовая)": {60: 1, 75: 1}, "Русский язык": {90: 1}}
+
+    # Пересчёт с нуля даёт те же числа
+    async with test_engine.begin() as conn:
+        await rebuild_analytics(conn)
+    assert (await client.get("/backend/api/analytics/")).json() == analytics
+
+
+@pytest.mark.asyncio
+async def test_analytics_read_aggregates_only(client: AsyncClient, test_data, statements):
+    for number in range(5):
+        await _register(client, f"7900123456{number}", "Краснодар", {RUS: 70 + number})
+    await client.get("/backend/api/analytics/")
+
+    statements.clear()
+    response = await client.get("/backend/api/analytics/", params={"days": 1})
+    assert response.status_code == 200
+    assert response.json()["applicants"][0]["count"] == 5
+    assert len(statements) == 3
+    assert not any("FROM applicant " in statement or "applicantexam" in statement for statement in statements)
+
+
+async def _concurrent_upserts(first_city: str, second_city: str) -> None:
+    """Write the same phone number from two transactions, the second one waiting for the first"""
+    async with TestSessionLocal() as first, TestSessionLocal() as second:
+        def upsert(session, city):
+            return upsert_applicant(session, uuid=uuid4(), surname="Иванов", name="Иван", patronymic=None,
+                                    phone_number="79001234567", city=city, dt_created=datetime.now())
+
+        await upsert(first, first_city)
+        waiting = asyncio.create_task(upsert(second, second_city))
+        await asyncio.sleep(0.2)
+        assert not waiting.done()
+        await first.commit()
+        await waiting
+        await second.commit()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_registrations_counted_once(client: AsyncClient, test_data):
+    await _concurrent_upserts("Краснодар", "Сочи")
+    today = date.today().isoformat()
+    assert (await client.get("/backend/api/analytics/")).json()["applicants"] == [
+        {"day": today, "city": "Сочи", "count": 1},
+    ]
+
+    # Параллельная смена города вычитается из города, записанного первой транзакцией
+    await _concurrent_upserts("Казань", "Москва")
+    assert (await client.get("/backend/api/analytics/")).json()["applicants"] == [
+        {"day": today, "city": "Москва", "count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_results_counted_once(client: AsyncClient, test_data):
+    applicant = UUID(await _register(client, "79001234567", "Краснодар", {}))
+    async with test_engine.connect() as conn:
+        faculty_type = (await conn.execute(text("SELECT uuid FROM faculty_type LIMIT 1"))).scalar_one()
+
+    # Ответы того же абитуриента, обработанные двумя воркерами одновременно
+    async with TestSessionLocal() as first, TestSessionLocal() as second:
+        async def replace(session, compliance):
+            await session.exec(lock_applicant(applicant))
+            await session.exec(replace_compliance(applicant, {faculty_type: compliance}))
+
+        await replace(first, 10)
+        waiting = asyncio.create_task(replace(second, 20))
+        await asyncio.sleep(0.2)
+        assert not waiting.done()
+        await first.commit()
+        await waiting
+        await second.commit()
+
+    async with test_engine.connect() as conn:
+        assert (await conn.execute(text("SELECT compliance FROM applicant_faculty WHERE applicant_id = :uuid"),
+                                   {"uuid": applicant})).scalars().all() == [20]
+        assert (await conn.execute(text(
+            "SELECT compliance, count FROM faculty_type_compliance_histogram WHERE count > 0"
+        ))).all() == [(20, 1)]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_skips_applicants_without_creation_time(client: AsyncClient, test_data):
+    await _register(client, "79001234567", "Краснодар", {})
+    async with test_engine.begin() as conn:
+        # dt_created допускает NULL: такие строки есть в базах, созданных до его появления
+        await conn.execute(text("INSERT INTO applicant (uuid, surname, name, phone_number, city) "
+                                "VALUES (:uuid, 'Петров', 'Петр', '79001234568', 'Сочи')"), {"uuid": uuid4()})
+        await rebuild_analytics(conn)
+    assert (await client.get("/backend/api/analytics/")).json()["applicants"] == [
+        {"day": date.today().isoformat(), "city": "Краснодар", "count": 1},
+    ]
@@ -1,7 +1,11 @@
 import pytest
 from httpx import AsyncClient
+from sqlmodel import select
 from uuid import UUID
 
+from backend.src.database.models import Applicant
+from backend.src.tests.conftest import TestSessionLocal
+
 
 @pytest.mark.asyncio
 async def test_register_applicant(client: AsyncClient, test_data):
@@ -107,4 +111,132 @@ async def test_get_questions(client: AsyncClient, test_data):
     assert isinstance(data, list)
     assert len(data) > 0
     assert "answers" in data[0]
-    assert len(data[0]["answers"]) > 0
\ No newline at end of file
+    assert len(data[0]["answers"]) > 0
+
+@pytest.mark.asyncio
+async def test_register_existing_applicant_replaces_exams(client: AsyncClient, test_data):
+    applicant = {
+        "surname": "Иванов",
+        "name": "Иван",
+        "phone_number": "79001234567",
+        "city": "Краснодар",
+        "exams": [
+            {
+                "exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c",
+                "exam_name": "Русский язык",
+                "exam_code": "rus",
+                "score": 80
+            }
+        ]
+    }
+    first = await client.post("/backend/api/applicant/register/", json=applicant)
+
+    applicant["city"] = "Сочи"
+    applicant["exams"][0]["score"] = 90
+    second = await client.post("/backend/api/applicant/register/", json=applicant)
+    assert second.json()["uuid"] == first.json()["uuid"]
+
+    data = (await client.get(f"/backend/api/applicant/{first.json()['uuid']}")).json()
+    assert data["city"] == "Сочи"
+    assert [exam["score"] for exam in data["exams"]] == [90]
+
+
+@pytest.mark.asyncio
+async def test_register_with_invalid_exam_writes_nothing(client: AsyncClient, test_data):
+    applicant = {
+        "surname": "Иванов",
+        "name": "Иван",
+        "phone_number": "79001234567",
+        "exams": [
+            {
+                "exam_id": "00000000-0000-0000-0000-000000000000",
+                "exam_name": "Несуществующий экзамен",
+                "exam_code": "invalid",
+                "score": 80
+            }
+        ]
+    }
+    response = await client.post("/backend/api/applicant/register/", json=applicant)
+    assert response.status_code == 400
+
+    async with TestSessionLocal() as session:
+        applicants = await session.exec(select(Applicant).where(Applicant.phone_number == "79001234567"))
+        assert applicants.first() is None
+
+
+@pytest.mark.asyncio
+async def test_get_applicant_results_single_query(client: AsyncClient, test_data, statements):
+    register_resp = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Сидоров",
+        "name": "Сидор",
+        "phone_number": "79111234567",
+        "city": "Казань",
+        "exams": []
+    })
+    uuid = register_resp.json()["uuid"]
+    await client.post("/backend/api/results/", json={
+        "uuid": uuid,
+        "answers": [
+            {
+                "question_id": "11111111-1111-1111-1111-111111111111",
+                "answer_ids": ["22222222-2222-2222-2222-222222222222", "33333333-3333-3333-3333-333333333333"]
+            }
+        ]
+    })
+
+    statements.clear()
+    response = await client.get(f"/backend/api/applicant/{uuid}")
+    assert response.status_code == 200
+    assert len(response.json()["faculty_type"]) == 2
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_applicant_results_batch(client: AsyncClient, test_data, statements):
+    uuids = []
+    for number in range(3):
+        register_resp = await client.post("/backend/api/applicant/register/", json={
+            "surname": "Сидоров",
+            "name": f"Сидор {number}",
+            "phone_number": f"7911123456{number}",
+            "city": "Казань",
+            "exams": [{"exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c", "exam_name": "Русский язык",
+                       "exam_code": "rus", "score": 70 + number}]
+        })
+        uuids.append(register_resp.json()["uuid"])
+    for uuid in uuids[:2]:
+        await client.post("/backend/api/results/", json={
+            "uuid": uuid,
+            "answers": [
+                {
+                    "question_id": "11111111-1111-1111-1111-111111111111",
+                    "answer_ids": ["22222222-2222-2222-2222-222222222222"]
+                }
+            ]
+        })
+    expected = [(await client.get(f"/backend/api/applicant/{uuid}")).json() for uuid in uuids]
+    unknown = "00000000-0000-0000-0000-000000000001"
+
+    # Документы всех троих сохранены: один запрос на всех и один, подтверждающий отсутствие неизвестного
+    statements.clear()
+    response = await client.post("/backend/api/applicants/results:batch",
+                                 json={"uuids": [uuids[2], unknown, uuids[0], uuids[1], uuids[0]]})
+    assert response.status_code == 200
+    assert response.json() == {"results": [expected[2], expected[0], expected[1]], "not_found": [unknown]}
+    assert len(statements) == 2
+
+    # Повторная регистрация делает документ устаревшим, он собирается тремя запросами на всю пачку
+    await client.post("/backend/api/applicant/register/", json={
+        "surname": "Сидоров", "name": "Сидор 1", "phone_number": "79111234561", "city": "Сочи", "exams": []
+    })
+    statements.clear()
+    response = await client.post("/backend/api/applicants/results:batch", json={"uuids": uuids + [unknown]})
+    results = response.json()["results"]
+    assert [result["uuid"] for result in results] == uuids
+    assert results[1]["city"] == "Сочи" and results[1]["exams"] == []
+    assert results[1]["faculty_type"] == expected[1]["faculty_type"]
+    assert results[0] == expected[0] and results[2] == expected[2]
+    assert len(statements) == 4
+
+    response = await client.post("/backend/api/applicants/results:batch", json={"uuids": []})
+    assert response.status_code == 422
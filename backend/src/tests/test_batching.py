@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.applicants import service
+from backend.src.applicants.schemas import ApplicantAnswers, ApplicantInfo
+from backend.src.database.batching import BatchWriter
+from backend.src.database.models import Applicant, ApplicantExam
+from backend.src.tests.conftest import DATABASE_URL, TestSessionLocal
+
+
+@pytest.fixture()
+async def batch_writer(monkeypatch):
+    writer = BatchWriter(TestSessionLocal, max_items=50, max_delay=0.01)
+    await writer.start()
+    monkeypatch.setattr(service, "batch_writer", writer)
+    yield writer
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_registrations_share_transactions(client: AsyncClient, test_data, batch_writer):
+    responses = await asyncio.gather(*(
+        client.post("/backend/api/applicant/register/", json={
+            "surname": "Иванов",
+            "name": f"Иван {number}",
+            "phone_number": f"7900000{number:04d}",
+            "exams": [{
+                "exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c",
+                "exam_name": "Русский язык",
+                "exam_code": "rus",
+                "score": 60 + number
+            }]
+        })
+        for number in range(10)
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.json()["uuid"] for response in responses}) == 10
+    assert batch_writer.items == 10
+    assert batch_writer.batches < 10
+
+    async with TestSessionLocal() as session:
+        assert (await session.exec(select(func.count()).select_from(Applicant))).one() == 10
+        assert (await session.exec(select(func.count()).select_from(ApplicantExam))).one() == 10
+
+
+@pytest.mark.asyncio
+async def test_failed_item_does_not_fail_batch(prepare_database, batch_writer):
+    async def good(session):
+        return (await session.exec(text("SELECT 1"))).scalar_one()
+
+    async def bad(session):
+        await session.exec(text("SELECT 1 / 0"))
+
+    results = await asyncio.gather(
+        batch_writer.submit(good), batch_writer.submit(bad), batch_writer.submit(good),
+        return_exceptions=True
+    )
+    assert results[0] == 1 and results[2] == 1
+    assert isinstance(results[1], Exception)
+
+
+@pytest.mark.asyncio
+async def test_submitters_do_not_hold_pool_connections(prepare_database, test_data, monkeypatch):
+    # Один пул на запросы и пакеты: ожидающий запрос не должен держать единственное подключение
+    engine = create_async_engine(DATABASE_URL, pool_size=1, max_overflow=0, pool_timeout=2)
+    session_maker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    writer = BatchWriter(session_maker, max_items=50, max_delay=0.01)
+    await writer.start()
+    monkeypatch.setattr(service, "batch_writer", writer)
+    try:
+        async with session_maker() as session:
+            results = service.ResultService(session)
+            applicant_uuid = await asyncio.wait_for(results.register_or_get_applicant(ApplicantInfo(
+                surname="Иванов", name="Иван", phone_number="79001234567", city="Краснодар"
+            )), 5)
+            # Ответы на тест сначала читают абитуриента этой же сессией
+            result = await asyncio.wait_for(results.process_user_answers(ApplicantAnswers(
+                uuid=applicant_uuid,
+                answers=[{"question_id": "11111111-1111-1111-1111-111111111111",
+                          "answer_ids": ["22222222-2222-2222-2222-222222222222"]}]
+            )), 5)
+        assert result.uuid == applicant_uuid
+        assert writer.items == 2
+    finally:
+        await writer.stop()
+        await engine.dispose()
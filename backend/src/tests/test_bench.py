@@ -0,0 +1,46 @@
+import pytest
+from sqlmodel import func, select
+
+from backend.bench.dataset import SIZES, generate, reference_rows, row_uuid
+from backend.bench.services import Measurement, cases, measure, regressions
+from backend.src.database.models import Applicant, ApplicantExam, AnswerFaculty, Question
+from backend.src.tests.conftest import TestSessionLocal, test_engine
+
+
+def test_reference_rows_are_deterministic():
+    size = SIZES["tiny"]
+    assert reference_rows(size, seed=1) == reference_rows(size, seed=1)
+    assert reference_rows(size, seed=1) != reference_rows(size, seed=2)
+
+
+@pytest.mark.asyncio
+async def test_generate_and_measure(prepare_database):
+    size = SIZES["tiny"]
+    await generate(test_engine, size)
+
+    async with TestSessionLocal() as session:
+        assert (await session.exec(select(func.count()).select_from(Question))).one() == size.questions
+        assert (await session.exec(select(func.count()).select_from(Applicant))).one() == size.applicants
+        assert (await session.exec(select(func.count()).select_from(ApplicantExam))).one() == \
+            size.applicants * size.exams_per_applicant
+        assert (await session.exec(select(func.count()).select_from(AnswerFaculty))).one() == \
+            size.questions * size.answers_per_question * 2
+        assert await session.get(Applicant, row_uuid("applicant", size.applicants - 1)) is not None
+
+    with pytest.raises(RuntimeError):
+        await generate(test_engine, size)
+
+    by_name = {case.name: case for case in cases(size)}
+    answers = await measure(test_engine, by_name["ResultService.process_user_answers"], iterations=3, warmup=1)
+    assert answers.queries == 4
+    # Те же абитуриенты: документы записаны при обработке ответов
+    documents = await measure(test_engine, by_name["ResultService.get_applicant_results_document"],
+                              iterations=3, warmup=1)
+    assert documents.queries == 1
+
+
+def test_regressions():
+    measurement = Measurement(name="case", queries=2, p50_ms=3.0, p95_ms=4.0, mean_ms=3.0)
+    assert regressions([measurement], {"case": {"queries": 2, "p50_ms": 2.0}}, tolerance=1.0) == []
+    assert len(regressions([measurement], {"case": {"queries": 1, "p50_ms": 1.0}}, tolerance=1.0)) == 2
+    assert regressions([measurement], {}, tolerance=1.0) == ["case: no baseline, run with --update"]
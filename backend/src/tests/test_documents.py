@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from datetime import datetime
+from httpx import AsyncClient
+from sqlmodel import select
+from uuid import UUID, uuid4
+
+from backend.src.applicants.analytics import upsert_applicant
+from backend.src.applicants.documents import ResultDocumentCache, mark_document_stale
+from backend.src.database.models import FacultyType
+from backend.src.tests.conftest import TestSessionLocal
+
+
+APPLICANT = {
+    "surname": "Сидоров",
+    "name": "Сидор",
+    "phone_number": "79111234567",
+    "city": "Казань",
+    "exams": []
+}
+
+
+async def _answer(client: AsyncClient, uuid: str) -> dict:
+    response = await client.post("/backend/api/results/", json={
+        "uuid": uuid,
+        "answers": [
+            {
+                "question_id": "11111111-1111-1111-1111-111111111111",
+                "answer_ids": ["22222222-2222-2222-2222-222222222222"]
+            }
+        ]
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+async def _register_and_answer(client: AsyncClient) -> str:
+    uuid = (await client.post("/backend/api/applicant/register/", json=APPLICANT)).json()["uuid"]
+    await _answer(client, uuid)
+    return uuid
+
+
+@pytest.mark.asyncio
+async def test_results_served_from_stored_document(client: AsyncClient, test_data, statements):
+    uuid = await _register_and_answer(client)
+
+    statements.clear()
+    response = await client.get(f"/backend/api/applicant/{uuid}")
+    assert response.status_code == 200
+    assert [faculty_type["compliance"] for faculty_type in response.json()["faculty_type"]] == [10]
+    assert len(statements) == 1
+    assert "applicant_result" in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_register_makes_document_stale(client: AsyncClient, test_data):
+    uuid = await _register_and_answer(client)
+    await client.get(f"/backend/api/applicant/{uuid}")
+
+    await client.post("/backend/api/applicant/register/", json={**APPLICANT, "city": "Сочи"})
+    data = (await client.get(f"/backend/api/applicant/{uuid}")).json()
+    assert data["city"] == "Сочи"
+    assert [faculty_type["compliance"] for faculty_type in data["faculty_type"]] == [10]
+
+
+@pytest.mark.asyncio
+async def test_answers_wait_for_concurrent_registration(client: AsyncClient, test_data):
+    uuid = await _register_and_answer(client)
+
+    # Повторная регистрация ещё не закоммичена, когда приходят ответы
+    async with TestSessionLocal() as session:
+        await upsert_applicant(session, uuid=uuid4(), surname="Петров", name=APPLICANT["name"], patronymic=None,
+                               phone_number=APPLICANT["phone_number"], city="Сочи", dt_created=datetime.now())
+        await session.exec(mark_document_stale(UUID(uuid)))
+        answering = asyncio.create_task(_answer(client, uuid))
+        await asyncio.sleep(0.2)
+        assert not answering.done()
+        await session.commit()
+    answered = await answering
+
+    # Записанный документ построен по данным регистрации, а не по прочитанным до неё
+    data = (await client.get(f"/backend/api/applicant/{uuid}")).json()
+    assert (data["surname"], data["city"]) == (answered["surname"], answered["city"]) == ("Петров", "Сочи")
+    assert [faculty_type["compliance"] for faculty_type in data["faculty_type"]] == [10]
+
+
+@pytest.mark.asyncio
+async def test_document_rebuilt_after_reference_change(client: AsyncClient, test_data):
+    uuid = await _register_and_answer(client)
+
+    async with TestSessionLocal() as session:
+        faculty_type = (await session.exec(select(FacultyType).where(
+            FacultyType.uuid == UUID("11111111-1111-1111-1111-111111111111")
+        ))).one()
+        faculty_type.name = "Инженерный"
+        session.add(faculty_type)
+        await session.commit()
+
+    data = (await client.get(f"/backend/api/applicant/{uuid}")).json()
+    assert [faculty_type["name"] for faculty_type in data["faculty_type"]] == ["Инженерный"]
+
+
+def test_result_document_cache():
+    cache = ResultDocumentCache(max_size=2, ttl=10)
+    first, second, third = UUID(int=1), UUID(int=2), UUID(int=3)
+    cache.put(first, "v1", b"1")
+    cache.put(second, "v1", b"2")
+    assert cache.get(first, "v1") == b"1"
+
+    cache.put(third, "v1", b"3")
+    assert cache.get(second, "v1") is None
+    assert cache.get(first, "v2") is None
+    assert cache.get(third, "v1") == b"3"
+
+    cache.ttl = -1
+    cache.put(first, "v1", b"1")
+    assert cache.get(first, "v1") is None
+    assert ResultDocumentCache(max_size=0, ttl=10).get(first, "v1") is None
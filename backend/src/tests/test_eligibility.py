@@ -0,0 +1,76 @@
+import pytest
+from httpx import AsyncClient
+from uuid import UUID
+
+from backend.src.applicants.eligibility import EligibilityIndex
+from backend.src.config import settings
+
+
+def test_eligibility_index_requires_every_exam():
+    faculty1, faculty2 = UUID(int=1), UUID(int=2)
+    rus, math = UUID(int=10), UUID(int=20)
+    index = EligibilityIndex([
+        (faculty1, "ИТ", "https://it", rus, "rus", 60),
+        (faculty1, "ИТ", "https://it", math, "math", 50),
+        (faculty2, "Филология", "https://phil", rus, "rus", 70),
+    ])
+
+    eligible = index.evaluate({rus: 80, math: 55})
+    assert [(faculty.faculty_id, faculty.margin) for faculty in eligible] == [(faculty2, 10), (faculty1, 5)]
+    assert {exam.exam_code: exam.margin for exam in eligible[1].exams} == {"rus": 20, "math": 5}
+
+    assert [faculty.faculty_id for faculty in index.evaluate({rus: 65})] == []
+    assert index.evaluate({}) == []
+
+
+@pytest.mark.asyncio
+async def test_check_eligibility(client: AsyncClient, test_data):
+    response = await client.post("/backend/api/eligibility/", json={"exams": [
+        {"exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c", "score": 70},
+        {"exam_id": "bde589f5-c13e-4606-ad55-c394038091b8", "score": 40}
+    ]})
+    assert response.status_code == 200
+    faculties = response.json()["faculties"]
+    assert [faculty["name"] for faculty in faculties] == ["Факультет информатики"]
+    assert faculties[0]["margin"] == 10
+
+    response = await client.post("/backend/api/eligibility/", json={"exams": [
+        {"exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c", "score": 59}
+    ]})
+    assert response.json() == {"faculties": []}
+
+
+@pytest.mark.asyncio
+async def test_get_applicant_eligibility(client: AsyncClient, test_data):
+    register_resp = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Петров",
+        "name": "Петр",
+        "phone_number": "79234567890",
+        "city": "Сочи",
+        "exams": [
+            {
+                "exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c",
+                "exam_name": "Русский язык",
+                "exam_code": "rus",
+                "score": 85
+            }
+        ]
+    })
+    response = await client.get(f"/backend/api/applicant/{register_resp.json()['uuid']}/eligibility")
+    assert response.status_code == 200
+    assert [faculty["margin"] for faculty in response.json()["faculties"]] == [25]
+
+    response = await client.get("/backend/api/applicant/00000000-0000-0000-0000-000000000000/eligibility")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_fast_responses_match_validated_ones(client: AsyncClient, test_data, monkeypatch):
+    body = {"exams": [{"exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c", "score": 70}]}
+    validated = await client.post("/backend/api/eligibility/", json=body)
+
+    monkeypatch.setattr(settings, "FAST_RESPONSES", True)
+    fast = await client.post("/backend/api/eligibility/", json=body)
+    assert fast.status_code == validated.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == validated.json()
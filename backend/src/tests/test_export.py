@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+
+from backend.src.config import settings
+
+
+async def _register(client: AsyncClient, phone_number: str, city: str, exams: list[dict]) -> str:
+    response = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Иванов", "name": "Иван", "phone_number": phone_number, "city": city, "exams": exams
+    })
+    return response.json()["uuid"]
+
+
+@pytest.mark.asyncio
+async def test_export_csv_and_jsonl(client: AsyncClient, test_data, monkeypatch):
+    # По одному абитуриенту в порции, чтобы выгрузка шла несколькими частями
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 1)
+    first = await _register(client, "79001234567", "Краснодар", [
+        {"exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c", "exam_name": "Русский язык", "exam_code": "rus",
+         "score": 80}
+    ])
+    await client.post("/backend/api/results/", json={"uuid": first, "answers": [{
+        "question_id": "11111111-1111-1111-1111-111111111111",
+        "answer_ids": ["22222222-2222-2222-2222-222222222222"]
+    }]})
+    second = await _register(client, "79001234568", "Сочи", [])
+
+    response = await client.get("/backend/api/applicants/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = {row["uuid"]: row for row in csv.DictReader(io.StringIO(response.text))}
+    assert set(rows) == {first, second}
+    assert rows[first]["city"] == "Краснодар"
+    assert rows[first]["rus"] == "80" and rows[first]["math_basic"] == ""
+    assert rows[first]["compliance:Технический"] == "10"
+    assert rows[second]["rus"] == "" and rows[second]["compliance:Технический"] == ""
+
+    response = await client.get("/backend/api/applicants/export", params={"format": "jsonl", "city": "Краснодар"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 1
+    assert records[0]["uuid"] == first
+    assert records[0]["exams"] == {"rus": 80}
+    assert records[0]["compliance"] == {"Технический": 10}
+
+
+@pytest.mark.asyncio
+async def test_export_created_range(client: AsyncClient, test_data):
+    await _register(client, "79001234567", "Краснодар", [])
+    now = datetime.now()
+
+    response = await client.get("/backend/api/applicants/export", params={
+        "format": "jsonl", "created_from": (now - timedelta(hours=1)).isoformat(), "created_to": now.isoformat()
+    })
+    assert len(response.text.splitlines()) == 1
+
+    response = await client.get("/backend/api/applicants/export", params={
+        "format": "jsonl", "created_from": now.isoformat()
+    })
+    assert response.text == ""
+
+    response = await client.get("/backend/api/applicants/export", params={"format": "xml"})
+    assert response.status_code == 422
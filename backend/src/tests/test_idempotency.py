@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+
+from backend.src.applicants.idempotency import idempotency_store
+
+
+APPLICANT = {"surname": "Иванов", "name": "Иван", "phone_number": "79001234567", "city": "Краснодар", "exams": []}
+
+
+def _answers(uuid: str, answer_id: str = "22222222-2222-2222-2222-222222222222") -> dict:
+    return {"uuid": uuid, "answers": [
+        {"question_id": "11111111-1111-1111-1111-111111111111", "answer_ids": [answer_id]}
+    ]}
+
+
+@pytest.fixture()
+def store():
+    idempotency_store.clear()
+    yield idempotency_store
+    idempotency_store.clear()
+
+
+@pytest.mark.asyncio
+async def test_retries_replay_first_response(client: AsyncClient, test_data, statements, store):
+    headers = {"Idempotency-Key": "register-1"}
+    first = await client.post("/backend/api/applicant/register/", json=APPLICANT, headers=headers)
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    uuid = first.json()["uuid"]
+
+    headers = {"Idempotency-Key": "answers-1"}
+    first = await client.post("/backend/api/results/", json=_answers(uuid), headers=headers)
+    assert first.status_code == 201
+
+    statements.clear()
+    retry = await client.post("/backend/api/results/", json=_answers(uuid), headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.content == first.content
+    # Повтор не доходит ни до подсчёта баллов, ни до записи
+    assert statements == []
+
+    # Тот же ключ с другим телом — ошибка клиента
+    response = await client.post("/backend/api/results/", headers=headers, json=_answers(
+        uuid, "33333333-3333-3333-3333-333333333333"
+    ))
+    assert response.status_code == 422
+
+    # Без ключа запрос выполняется как обычно
+    response = await client.post("/backend/api/results/", json=_answers(uuid))
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_run_once(client: AsyncClient, test_data, statements, store):
+    uuid = (await client.post("/backend/api/applicant/register/", json=APPLICANT)).json()["uuid"]
+    await client.post("/backend/api/results/", json=_answers(uuid))
+
+    headers = {"Idempotency-Key": "answers-2"}
+    statements.clear()
+    responses = await asyncio.gather(*(
+        client.post("/backend/api/results/", json=_answers(uuid, "33333333-3333-3333-3333-333333333333"),
+                    headers=headers)
+        for _ in range(3)
+    ))
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert len({response.content for response in responses}) == 1
+    assert sum("Idempotent-Replayed" in response.headers for response in responses) == 2
+    assert sum("DELETE FROM applicant_faculty" in statement for statement in statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_not_stored(client: AsyncClient, test_data, store):
+    headers = {"Idempotency-Key": "register-2"}
+    invalid = {**APPLICANT, "exams": [{"exam_id": "00000000-0000-0000-0000-000000000001", "exam_name": "",
+                                       "exam_code": "", "score": 70}]}
+    response = await client.post("/backend/api/applicant/register/", json=invalid, headers=headers)
+    assert response.status_code == 400
+
+    response = await client.post("/backend/api/applicant/register/", json=invalid, headers=headers)
+    assert response.status_code == 400
+    assert "Idempotent-Replayed" not in response.headers
@@ -0,0 +1,117 @@
+import json
+import pytest
+from httpx import AsyncClient
+
+from backend.src.config import settings
+
+
+CSV_BODY = (
+    "surname,name,patronymic,phone_number,city,rus,math_basic\n"
+    "Иванов,Иван,Иванович,79001234567,Краснодар,80,75\n"
+    "Петров,Петр,,79234567890,Сочи,90,\n"
+    "Сидоров,Сидор,,790012345678,Казань,70,\n"
+    "Козлов,Олег,,79111234567,Казань,101,abc\n"
+)
+
+
+@pytest.mark.asyncio
+async def test_import_csv(client: AsyncClient, test_data, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 1)
+    existing = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Старый", "name": "Иван", "phone_number": "79001234567", "city": "Москва", "exams": []
+    })
+
+    response = await client.post("/backend/api/applicant/import/", content=CSV_BODY.encode(),
+                                 headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["processed"] == 4
+    assert report["imported"] == 2
+    assert report["failed"] == 2
+    assert [error["line"] for error in report["errors"]] == [4, 5]
+    assert report["errors"][0]["errors"][0].startswith("phone_number")
+    assert len(report["errors"][1]["errors"]) == 1
+
+    # Абитуриент найден по номеру телефона: данные и экзамены заменены
+    updated = (await client.get(f"/backend/api/applicant/{existing.json()['uuid']}")).json()
+    assert updated["surname"] == "Иванов"
+    assert sorted((exam["exam_code"], exam["score"]) for exam in updated["exams"]) == [("math_basic", 75), ("rus", 80)]
+
+
+@pytest.mark.asyncio
+async def test_import_overlong_field(client: AsyncClient, test_data):
+    body = (
+        "surname,name,phone_number,city\n"
+        f"{'Я' * 31},Иван,79001234567,Краснодар\n"
+        "Петров,Петр,79234567890,Сочи\n"
+    )
+    response = await client.post("/backend/api/applicant/import/", content=body.encode(),
+                                 headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 1
+    assert [error["line"] for error in report["errors"]] == [2]
+    assert report["errors"][0]["errors"][0].startswith("surname")
+
+
+@pytest.mark.asyncio
+async def test_import_csv_multiline_field(client: AsyncClient, test_data):
+    body = (
+        "surname,name,phone_number,city\n"
+        '"Иванов","Иван","79001234567","Ростов-\n'
+        'на-Дону"\n'
+        "Петров,Петр,790012345678,Сочи\n"
+    )
+    response = await client.post("/backend/api/applicant/import/", content=body.encode(),
+                                 headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["processed"] == 2
+    assert report["imported"] == 1
+    # Номер строки ошибки — первая строка записи в файле
+    assert [error["line"] for error in report["errors"]] == [4]
+
+    page = (await client.get("/backend/api/applicants/", params={"limit": 10})).json()
+    assert [item["city"] for item in page["items"]] == ["Ростов-\nна-Дону"]
+
+
+@pytest.mark.asyncio
+async def test_import_errors_capped(client: AsyncClient, test_data, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_ERRORS", 2)
+    body = "surname,name,phone_number,chem\n" + "".join(f"Петров,Петр,7923456789{number},60\n" for number in range(5))
+    response = await client.post("/backend/api/applicant/import/", content=body.encode(),
+                                 headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["processed"], report["imported"], report["failed"]) == (5, 0, 5)
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_import_jsonl(client: AsyncClient, test_data):
+    lines = [
+        json.dumps({"surname": "Петров", "name": "Петр", "phone_number": "79234567890", "exams": {"rus": 85}}),
+        "{not json",
+        json.dumps({"surname": "Петров", "name": "Петр", "phone_number": "79234567891", "exams": {"chem": 60}}),
+    ]
+    response = await client.post("/backend/api/applicant/import/", content="\n".join(lines).encode(),
+                                 headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report == {
+        "processed": 3,
+        "imported": 1,
+        "failed": 2,
+        "errors": [
+            {"line": 2, "errors": [report["errors"][0]["errors"][0]]},
+            {"line": 3, "errors": ["Exam with code chem not found"]},
+        ]
+    }
+    assert report["errors"][0]["errors"][0].startswith("Invalid JSON")
+
+
+@pytest.mark.asyncio
+async def test_import_unsupported_format(client: AsyncClient, test_data):
+    response = await client.post("/backend/api/applicant/import/", content=b"<xml/>",
+                                 headers={"Content-Type": "application/xml"})
+    assert response.status_code == 415
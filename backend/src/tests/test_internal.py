@@ -0,0 +1,43 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from backend.src.__init__ import app
+from backend.src.database.main import async_engine
+from backend.src.internal import routes
+from backend.src.internal.boot import BootTimer
+from backend.src.internal.warmup import warm_up
+
+
+@pytest.mark.asyncio
+async def test_pool_status(client: AsyncClient):
+    before = (await client.get("/internal/db/pool")).json()
+
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        during = (await client.get("/internal/db/pool")).json()
+
+    assert during["checked_out"] == before["checked_out"] + 1
+    assert during["checkouts"] == before["checkouts"] + 1
+    assert during["size"] == async_engine.pool.size()
+    assert during["max_wait_ms"] >= during["avg_wait_ms"] >= 0
+    assert during["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ready_after_warmup(client: AsyncClient, test_data, monkeypatch):
+    timer = BootTimer()
+    monkeypatch.setattr(routes, "boot", timer)
+
+    response = await client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "warming_up"}
+
+    await warm_up(app, timer)
+
+    response = await client.get("/ready")
+    assert response.status_code == 200
+    report = (await client.get("/internal/boot")).json()
+    assert report["ready"] and report["error"] is None
+    assert {"pool", "caches", "schemas"} <= set(report["phases"])
+    assert report["total_ms"] >= sum(report["phases"].values())
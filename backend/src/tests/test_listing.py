@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+from sqlalchemy import text
+from uuid import uuid4
+
+from backend.src.tests.conftest import test_engine
+
+
+RUS = "236e43f1-6d9a-42d2-bf80-514e7ed3030c"
+
+
+async def _register(client: AsyncClient, phone_number: str, city: str, exams: dict[str, int]) -> str:
+    response = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Иванов", "name": "Иван", "phone_number": phone_number, "city": city,
+        "exams": [{"exam_id": exam_id, "exam_name": "", "exam_code": "", "score": score}
+                  for exam_id, score in exams.items()]
+    })
+    return response.json()["uuid"]
+
+
+async def _pages(client: AsyncClient, **params) -> list[list[dict]]:
+    pages = []
+    cursor = None
+    while True:
+        response = await client.get("/backend/api/applicants/",
+                                    params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        page = response.json()
+        pages.append(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_list_applicants_pages(client: AsyncClient, test_data):
+    uuids = [await _register(client, f"7900123456{number}", "Краснодар" if number % 2 else "Сочи", {RUS: 70})
+             for number in range(5)]
+
+    pages = await _pages(client, limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    # Порядок создания, без пропусков и повторов между страницами
+    assert [item["uuid"] for page in pages for item in page] == uuids
+    assert pages[0][0]["exams"] is None
+
+    pages = await _pages(client, limit=2, city="Краснодар", include_exams=True)
+    assert [item["uuid"] for page in pages for item in page] == [uuids[1], uuids[3]]
+    assert pages[0][0]["exams"][0]["exam_code"] == "rus"
+    assert pages[0][0]["exams"][0]["score"] == 70
+
+    now = datetime.now()
+    pages = await _pages(client, created_from=(now + timedelta(hours=1)).isoformat())
+    assert pages == [[]]
+    pages = await _pages(client, created_from=(now - timedelta(hours=1)).isoformat(), created_to=now.isoformat())
+    assert len(pages[0]) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_applicants_without_creation_time(client: AsyncClient, test_data):
+    uuids = [await _register(client, f"7900123456{number}", "Сочи", {}) for number in range(2)]
+    # Записи, созданные до появления dt_created
+    async with test_engine.begin() as conn:
+        for number in range(2):
+            await conn.execute(text(
+                "INSERT INTO applicant (uuid, phone_number, city, dt_created) VALUES (:uuid, :phone, 'Сочи', NULL)"
+            ), {"uuid": uuid4(), "phone": f"7900765432{number}"})
+
+    # Страница кончалась бы строкой без dt_created, из которой не построить курсор
+    for limit in (1, 3):
+        pages = await _pages(client, limit=limit)
+        assert [item["uuid"] for page in pages for item in page] == uuids
+
+
+@pytest.mark.asyncio
+async def test_list_applicants_statements(client: AsyncClient, test_data, statements):
+    for number in range(5):
+        await _register(client, f"7900123456{number}", "Краснодар", {RUS: 70})
+    first = (await client.get("/backend/api/applicants/", params={"limit": 2})).json()
+
+    statements.clear()
+    response = await client.get("/backend/api/applicants/", params={
+        "limit": 2, "cursor": first["next_cursor"], "include_exams": True
+    })
+    assert response.status_code == 200
+    # Страница вместе с экзаменами одним запросом; справочники уже в памяти
+    assert len(statements) == 1
+    assert not any("OFFSET" in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_list_applicants_invalid_cursor(client: AsyncClient, test_data):
+    response = await client.get("/backend/api/applicants/", params={"cursor": "not a cursor"})
+    assert response.status_code == 400
+    response = await client.get("/backend/api/applicants/", params={"limit": 0})
+    assert response.status_code == 422
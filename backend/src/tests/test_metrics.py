@@ -0,0 +1,64 @@
+import pytest
+from httpx import AsyncClient
+
+from backend.src.config import settings
+from backend.src.internal.metrics import Histogram, request_metrics
+from backend.src.tests.test_documents import _register_and_answer
+
+
+APPLICANT_ROUTE = ("GET", "/backend/api/applicant/{applicant_uuid}")
+
+
+@pytest.mark.asyncio
+async def test_query_count_header(client: AsyncClient, test_data, monkeypatch):
+    uuid = await _register_and_answer(client)
+
+    response = await client.get(f"/backend/api/applicant/{uuid}")
+    assert "X-Query-Count" not in response.headers
+
+    monkeypatch.setattr(settings, "METRICS_QUERY_COUNT_HEADER", True)
+    response = await client.get(f"/backend/api/applicant/{uuid}")
+    # Результат отдаётся из сохранённого документа одним запросом
+    assert response.headers["X-Query-Count"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_metrics_per_route(client: AsyncClient, test_data):
+    uuid = await _register_and_answer(client)
+    requests_before = request_metrics.duration.count(APPLICANT_ROUTE)
+    statements_before = request_metrics.statements.sum(APPLICANT_ROUTE)
+
+    for _ in range(3):
+        assert (await client.get(f"/backend/api/applicant/{uuid}")).status_code == 200
+    await client.get("/no/such/path")
+
+    assert request_metrics.duration.count(APPLICANT_ROUTE) == requests_before + 3
+    assert request_metrics.statements.sum(APPLICANT_ROUTE) == statements_before + 3
+    assert request_metrics.db_time.sum(APPLICANT_ROUTE) > 0
+    assert request_metrics.serialization.sum(APPLICANT_ROUTE) > 0
+    assert request_metrics.duration.count(("GET", "unmatched")) >= 1
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    labels = 'method="GET",route="/backend/api/applicant/{applicant_uuid}"'
+    for name in ("http_request_duration_seconds", "http_request_db_statements", "http_request_db_seconds",
+                 "http_request_db_pool_wait_seconds", "http_request_serialization_seconds"):
+        assert f"# TYPE {name} histogram" in response.text
+        assert f"{name}_count{{{labels}}} {request_metrics.duration.count(APPLICANT_ROUTE)}" in response.text
+
+
+def test_histogram_exposition():
+    histogram = Histogram("statements", "Statements.", (1, 5), ("route",))
+    for value in (0, 1, 3, 7):
+        histogram.observe(("/a",), value)
+
+    assert histogram.expose() == [
+        "# HELP statements Statements.",
+        "# TYPE statements histogram",
+        'statements_bucket{route="/a",le="1.0"} 2',
+        'statements_bucket{route="/a",le="5.0"} 3',
+        'statements_bucket{route="/a",le="+Inf"} 4',
+        'statements_sum{route="/a"} 11.0',
+        'statements_count{route="/a"} 4',
+    ]
@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel
+from uuid import uuid4
+
+from backend.src.applicants.analytics import rebuild_analytics
+from backend.src.database.migrations import m0001_baseline, m0006_drop_duplicate_uuid_keys, migrate
+from backend.src.tests.conftest import drop_schema, test_engine
+
+
+def _schema(conn) -> dict[str, dict]:
+    inspector = inspect(conn)
+    return {
+        table: {
+            "columns": {column["name"]: (column["type"].compile(conn.dialect), column["nullable"])
+                        for column in inspector.get_columns(table)},
+            "primary_key": inspector.get_pk_constraint(table)["constrained_columns"],
+            "foreign_keys": sorted((key["constrained_columns"][0], key["referred_table"])
+                                   for key in inspector.get_foreign_keys(table)),
+        }
+        for table in inspector.get_table_names() if table != "schema_migrations"
+    }
+
+
+@pytest.mark.asyncio
+async def test_migrations_build_the_model_schema(prepare_database):
+    async with test_engine.connect() as conn:
+        migrated = await conn.run_sync(_schema)
+
+    expected = {
+        table.name: {
+            "columns": {column.name: (column.type.compile(test_engine.dialect), column.nullable)
+                        for column in table.columns},
+            "primary_key": [column.name for column in table.primary_key],
+            "foreign_keys": sorted((key.parent.name, key.column.table.name) for key in table.foreign_keys),
+        }
+        for table in SQLModel.metadata.sorted_tables
+    }
+    assert migrated == expected
+
+
+@pytest.mark.asyncio
+async def test_duplicate_uuid_keys_dropped(prepare_database):
+    # Уникальный индекс рядом с первичным ключом, добавленный к уже созданной таблице
+    await drop_schema()
+    async with test_engine.begin() as conn:
+        await m0001_baseline.upgrade(conn)
+        for table in m0006_drop_duplicate_uuid_keys.TABLES:
+            await conn.execute(text(f"ALTER TABLE {table} ADD UNIQUE (uuid)"))
+        duplicates = text("SELECT count(*) FROM pg_constraint WHERE conname LIKE '%\\_uuid\\_key'")
+        assert (await conn.execute(duplicates)).scalar_one() == len(m0006_drop_duplicate_uuid_keys.TABLES)
+
+    await migrate(test_engine)
+    async with test_engine.connect() as conn:
+        assert (await conn.execute(duplicates)).scalar_one() == 0
+        migrated = await conn.run_sync(_schema)
+    assert migrated["applicant"]["primary_key"] == ["uuid"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_backfilled_from_existing_rows(prepare_database):
+    await drop_schema()
+    exam, faculty_type = uuid4(), uuid4()
+    async with test_engine.begin() as conn:
+        await m0001_baseline.upgrade(conn)
+        await conn.execute(text("INSERT INTO exam (uuid, name, code) VALUES (:uuid, 'Русский язык', 'rus')"),
+                           {"uuid": exam})
+        await conn.execute(text("INSERT INTO faculty_type (uuid, name) VALUES (:uuid, 'Технический')"),
+                           {"uuid": faculty_type})
+        for number, (city, dt_created) in enumerate([("Сочи", datetime.now()), (None, datetime.now()),
+                                                     ("Сочи", None)]):
+            applicant = uuid4()
+            await conn.execute(text(
+                "INSERT INTO applicant (uuid, phone_number, city, dt_created) VALUES (:uuid, :phone, :city, :dt)"
+            ), {"uuid": applicant, "phone": f"7900123456{number}", "city": city, "dt": dt_created})
+            await conn.execute(text(
+                "INSERT INTO applicantexam (uuid, applicant_id, exam_id, score) VALUES (:uuid, :applicant, :exam, 80)"
+            ), {"uuid": uuid4(), "applicant": applicant, "exam": exam})
+            await conn.execute(text(
+                "INSERT INTO applicant_faculty (uuid, applicant_id, faculty_type_id, compliance) "
+                "VALUES (:uuid, :applicant, :faculty_type, 10)"
+            ), {"uuid": uuid4(), "applicant": applicant, "faculty_type": faculty_type})
+
+    await migrate(test_engine)
+    aggregates = ("applicant_daily_count", "faculty_type_compliance_histogram", "exam_score_histogram")
+
+    async def contents(conn) -> dict[str, set]:
+        return {table: set((await conn.execute(text(f"SELECT * FROM {table}"))).all()) for table in aggregates}
+
+    async with test_engine.begin() as conn:
+        migrated = await contents(conn)
+        await rebuild_analytics(conn)
+        assert await contents(conn) == migrated
+    assert migrated["applicant_daily_count"] == {(datetime.now().date(), "Сочи", 1), (datetime.now().date(), "", 1)}
+    assert migrated["exam_score_histogram"] == {(exam, 80, 3)}
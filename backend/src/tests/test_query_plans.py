@@ -0,0 +1,94 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import Engine, event, text
+
+from backend.src.database.plans import find_seq_scans
+from backend.src.tests.conftest import test_engine
+
+
+APPLICANTS = 5000
+
+SEED = [
+    """
+    INSERT INTO applicant (uuid, surname, name, phone_number, city, dt_created)
+    SELECT gen_random_uuid(), 'Фамилия', 'Имя', (79000000000 + n)::text, 'Краснодар', now()
+    FROM generate_series(1, :applicants) AS n
+    """,
+    """
+    INSERT INTO applicantexam (uuid, applicant_id, exam_id, score)
+    SELECT gen_random_uuid(), applicant.uuid, exam.uuid, 50 + (random() * 50)::int
+    FROM applicant CROSS JOIN exam
+    """,
+    """
+    INSERT INTO applicant_faculty (uuid, applicant_id, faculty_type_id, compliance)
+    SELECT gen_random_uuid(), applicant.uuid, faculty_type.uuid, (random() * 20)::int
+    FROM applicant CROSS JOIN faculty_type
+    """,
+    """
+    INSERT INTO applicant_result (applicant_id, revision, reference_version, document)
+    SELECT uuid, 0, '', '' FROM applicant
+    """,
+]
+
+
+@pytest.fixture()
+async def large_database(test_data):
+    async with test_engine.begin() as conn:
+        for statement in SEED:
+            await conn.execute(text(statement), {"applicants": APPLICANTS})
+    async with test_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+
+@pytest.fixture()
+def executed():
+    """Collect statements with parameters executed through any engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    # Слушаем все движки: сессии клиента создаются движком экземпляра conftest, загруженного pytest
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.asyncio
+async def test_service_queries_use_indexes(client: AsyncClient, large_database, executed):
+    uuid = (await client.post("/backend/api/applicant/register/", json={
+        "surname": "Иванов",
+        "name": "Иван",
+        "phone_number": "79000000001",
+        "city": "Краснодар",
+        "exams": [{
+            "exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c",
+            "exam_name": "Русский язык",
+            "exam_code": "rus",
+            "score": 70
+        }]
+    })).json()["uuid"]
+    await client.get(f"/backend/api/applicant/{uuid}")
+    await client.post("/backend/api/results/", json={
+        "uuid": uuid,
+        "answers": [{
+            "question_id": "11111111-1111-1111-1111-111111111111",
+            "answer_ids": ["22222222-2222-2222-2222-222222222222"]
+        }]
+    })
+    await client.get(f"/backend/api/applicant/{uuid}")
+    await client.get(f"/backend/api/applicant/{uuid}/eligibility")
+    await client.get(f"/backend/api/applicant/{uuid}/recommendations")
+    await client.get("/backend/api/applicants/search", params={"q": "Иванов"})
+    page = (await client.get("/backend/api/applicants/", params={"limit": 50})).json()
+    await client.get("/backend/api/applicants/", params={
+        "limit": 50, "cursor": page["next_cursor"], "city": "Краснодар", "include_exams": True
+    })
+    statements = list(executed)
+    assert statements
+
+    async with test_engine.connect() as conn:
+        offending = await find_seq_scans(conn, statements, min_rows=APPLICANTS)
+    assert offending == {}
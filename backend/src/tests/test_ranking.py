@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+from uuid import UUID
+
+from backend.src.applicants.eligibility import EligibilityIndex
+from backend.src.applicants.ranking import RankingTable
+from backend.src.applicants.reference import ReferenceSnapshot, FacultyRef
+from backend.src.config import Settings
+
+
+def test_ranking_table_combines_compliance_and_exams():
+    type1, type2 = UUID(int=1), UUID(int=2)
+    rus = UUID(int=10)
+    it, law, art = (FacultyRef(UUID(int=100 + i), name, "https://", type_id)
+                    for i, (name, type_id) in enumerate([("ИТ", type1), ("Право", type2), ("Дизайн", type2)]))
+    reference = ReferenceSnapshot(
+        version="test",
+        faculty_types={type1: "Технический", type2: "Гуманитарный"},
+        faculties_by_type={type1: (it,), type2: (law, art)},
+        exams={},
+    )
+    index = EligibilityIndex([
+        (it.uuid, it.name, it.url, rus, "rus", 60),
+        (law.uuid, law.name, law.url, rus, "rus", 80),
+    ])
+    table = RankingTable(reference, index)
+
+    top = table.top({type1: 10, type2: 5}, {rus: 70}, k=3)
+    # Право не проходит по баллам, у Дизайна требований нет
+    assert [faculty.name for faculty in top] == ["ИТ", "Дизайн", "Право"]
+    assert [faculty.eligible for faculty in top] == [True, None, False]
+    assert top[0].margin == 10
+    assert top[0].score > top[1].score > top[2].score
+
+    assert len(table.top({}, {}, k=10)) == 3
+
+
+def test_margin_cap_must_be_positive():
+    with pytest.raises(ValidationError):
+        Settings(RANKING_MARGIN_CAP=0)
+
+
+@pytest.mark.asyncio
+async def test_get_recommendations(client: AsyncClient, test_data):
+    register_resp = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Петров",
+        "name": "Петр",
+        "phone_number": "79234567890",
+        "city": "Сочи",
+        "exams": [
+            {
+                "exam_id": "236e43f1-6d9a-42d2-bf80-514e7ed3030c",
+                "exam_name": "Русский язык",
+                "exam_code": "rus",
+                "score": 75
+            }
+        ]
+    })
+    uuid = register_resp.json()["uuid"]
+    await client.post("/backend/api/results/", json={
+        "uuid": uuid,
+        "answers": [
+            {
+                "question_id": "11111111-1111-1111-1111-111111111111",
+                "answer_ids": ["22222222-2222-2222-2222-222222222222"]
+            }
+        ]
+    })
+
+    response = await client.get(f"/backend/api/applicant/{uuid}/recommendations", params={"k": 1})
+    assert response.status_code == 200
+    faculties = response.json()["faculties"]
+    assert len(faculties) == 1
+    assert faculties[0]["name"] == "Факультет информатики"
+    assert faculties[0]["compliance"] == 10
+    assert faculties[0]["eligible"] is True
+    assert faculties[0]["margin"] == 15
+
+    response = await client.get("/backend/api/applicant/00000000-0000-0000-0000-000000000000/recommendations")
+    assert response.status_code == 404
@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from uuid import UUID
+
+from backend.src.applicants.reference import reference_data
+from backend.src.config import settings
+from backend.src.database.notifications import TableChangeListener, install_triggers
+from backend.src.tests.conftest import TestSessionLocal, test_engine
+
+
+@pytest.mark.asyncio
+async def test_reference_snapshot_lookups(client: AsyncClient, test_data):
+    async with TestSessionLocal() as session:
+        reference = await reference_data.get(session)
+
+    assert reference.exams[UUID("236e43f1-6d9a-42d2-bf80-514e7ed3030c")].code == "rus"
+    faculty_type = reference.faculty_type_result(UUID("11111111-1111-1111-1111-111111111111"), 7)
+    assert faculty_type.compliance == 7
+    assert [faculty.name for faculty in faculty_type.faculties] == ["Факультет информатики"]
+    assert reference.faculty_type_result(UUID(int=0), 7) is None
+
+
+@pytest.mark.asyncio
+async def test_reference_snapshot_refreshes_on_notify(client: AsyncClient, test_data):
+    async with test_engine.begin() as conn:
+        await install_triggers(conn)
+    async with TestSessionLocal() as session:
+        version = (await reference_data.get(session)).version
+
+    listener = TableChangeListener(settings.postgres_dsn)
+    await listener.start()
+    try:
+        # Изменение в обход ORM видно только через NOTIFY
+        async with test_engine.begin() as conn:
+            await conn.execute(text("INSERT INTO exam (uuid, name, code) "
+                                    "VALUES ('44444444-4444-4444-4444-444444444444', 'Физика', 'phys')"))
+        for _ in range(50):
+            async with TestSessionLocal() as session:
+                reference = await reference_data.get(session)
+            if reference.version != version:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await listener.stop()
+
+    assert reference.exams[UUID("44444444-4444-4444-4444-444444444444")].code == "phys"
@@ -0,0 +1,114 @@
+import pytest
+import time
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from uuid import UUID
+
+from backend.src.database import main
+from backend.src.database.replica import ReplicaRouter, STICKY_COOKIE
+from backend.src.tests.conftest import DATABASE_URL
+
+
+APPLICANT = {
+    "surname": "Петров",
+    "name": "Пётр",
+    "phone_number": "79221234567",
+    "city": "Омск",
+    "exams": []
+}
+
+
+@pytest.fixture()
+async def replica(monkeypatch):
+    """Route reads to a second engine on the test database and collect what it executes"""
+    engine = create_async_engine(DATABASE_URL)
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    router = ReplicaRouter(engine, max_lag=5, sticky_seconds=60, lag_check_interval=0)
+    monkeypatch.setattr(main, "replica_router", router)
+    monkeypatch.setattr(main, "replica_session_maker",
+                        async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False))
+    yield router, executed
+    await engine.dispose()
+
+
+def _reads(executed: list[str]) -> list[str]:
+    return [statement for statement in executed if "pg_is_in_recovery" not in statement]
+
+
+async def _register_and_answer(client: AsyncClient) -> str:
+    uuid = (await client.post("/backend/api/applicant/register/", json=APPLICANT)).json()["uuid"]
+    response = await client.post("/backend/api/results/", json={
+        "uuid": uuid,
+        "answers": [
+            {
+                "question_id": "11111111-1111-1111-1111-111111111111",
+                "answer_ids": ["22222222-2222-2222-2222-222222222222"]
+            }
+        ]
+    })
+    assert response.status_code == 201
+    return uuid
+
+
+@pytest.mark.asyncio
+async def test_reads_after_write_stick_to_primary(client: AsyncClient, test_data, replica):
+    router, executed = replica
+    uuid = await _register_and_answer(client)
+
+    response = await client.get(f"/backend/api/applicant/{uuid}")
+    assert response.status_code == 200
+    assert _reads(executed) == []
+
+    # Другой воркер не знает о записи, но cookie клиента держит его чтения на мастере
+    router._sticky.clear()
+    assert float(client.cookies[STICKY_COOKIE]) > time.time()
+    response = await client.get(f"/backend/api/applicant/{uuid}")
+    assert response.status_code == 200
+    assert _reads(executed) == []
+
+    client.cookies.clear()
+    response = await client.get(f"/backend/api/applicant/{uuid}")
+    assert [faculty_type["compliance"] for faculty_type in response.json()["faculty_type"]] == [10]
+    assert any("applicant_result" in statement for statement in _reads(executed))
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary(client: AsyncClient, test_data, replica, monkeypatch):
+    router, executed = replica
+    uuid = await _register_and_answer(client)
+    router._sticky.clear()
+    client.cookies.clear()
+
+    async def measure_lag():
+        return 60.0
+
+    monkeypatch.setattr(router, "measure_lag", measure_lag)
+    response = await client.get(f"/backend/api/applicant/{uuid}/eligibility")
+    assert response.status_code == 200
+    assert _reads(executed) == []
+
+
+@pytest.mark.asyncio
+async def test_replica_router(replica):
+    router, _ = replica
+    assert await router.measure_lag() == 0
+    assert await router.use_replica(UUID(int=1))
+
+    router.stick(UUID(int=1))
+    assert not await router.use_replica(UUID(int=1))
+    assert await router.use_replica(UUID(int=2))
+
+    router.sticky_seconds = -1
+    router.stick(UUID(int=1))
+    assert await router.use_replica(UUID(int=1))
+
+    assert not await router.use_replica(sticky_until=str(time.time() + 10))
+    assert await router.use_replica(sticky_until=str(time.time() - 1))
+    assert await router.use_replica(sticky_until="garbage")
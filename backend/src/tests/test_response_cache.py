@@ -0,0 +1,55 @@
+import pytest
+from httpx import AsyncClient
+from uuid import UUID
+
+from backend.src.database.models import Answer
+from backend.src.tests.conftest import TestSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_questions_not_modified(client: AsyncClient, test_data):
+    response = await client.get("/backend/api/questions/")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    cached = await client.get("/backend/api/questions/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+@pytest.mark.asyncio
+async def test_exams_gzip_variant(client: AsyncClient, test_data):
+    plain = await client.get("/backend/api/exam/", headers={"Accept-Encoding": "identity"})
+    compressed = await client.get("/backend/api/exam/", headers={"Accept-Encoding": "gzip, br"})
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.json() == plain.json()
+    assert compressed.headers["etag"] == plain.headers["etag"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accept_encoding, compressed", [
+    ("gzip;q=0, br", False),
+    ("gzip; q=0.0", False),
+    ("*;q=0.5", True),
+    ("*, gzip;q=0", False),
+    ("GZIP;q=0.3", True),
+])
+async def test_exams_gzip_quality(client: AsyncClient, test_data, accept_encoding, compressed):
+    response = await client.get("/backend/api/exam/", headers={"Accept-Encoding": accept_encoding})
+    assert (response.headers.get("content-encoding") == "gzip") is compressed
+
+
+@pytest.mark.asyncio
+async def test_questions_invalidated_on_change(client: AsyncClient, test_data):
+    response = await client.get("/backend/api/questions/")
+    etag = response.headers["etag"]
+
+    async with TestSessionLocal() as session:
+        session.add(Answer(text="Новый ответ", question_id=UUID("11111111-1111-1111-1111-111111111111")))
+        await session.commit()
+
+    response = await client.get("/backend/api/questions/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()[0]["answers"]) == 3
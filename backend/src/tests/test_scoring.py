@@ -0,0 +1,85 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from uuid import UUID
+
+from backend.src.applicants.scoring import HIT, MISS, ScoringMatrix, ScoringMetrics, scoring_metrics
+from backend.src.database.models import AnswerFaculty
+from backend.src.tests.conftest import TestSessionLocal
+
+
+def test_scoring_matrix_sums_selected_rows():
+    answer1, answer2 = UUID(int=1), UUID(int=2)
+    type1, type2 = UUID(int=10), UUID(int=20)
+    matrix = ScoringMatrix([
+        (answer1, type1, 10),
+        (answer1, type2, None),
+        (answer2, type1, 3),
+    ])
+
+    assert matrix.score([str(answer1), str(answer2)]) == {type1: 13, type2: 0}
+    assert matrix.score([str(answer2), "not-a-uuid", str(UUID(int=3))]) == {type1: 3}
+    assert matrix.score([]) == {}
+
+
+async def _submit(client: AsyncClient, answer_ids: list[str]) -> dict:
+    register_resp = await client.post("/backend/api/applicant/register/", json={
+        "surname": "Сидоров",
+        "name": "Сидор",
+        "phone_number": "79111234567",
+        "city": "Казань",
+        "exams": []
+    })
+    response = await client.post("/backend/api/results/", json={
+        "uuid": register_resp.json()["uuid"],
+        "answers": [{"question_id": "11111111-1111-1111-1111-111111111111", "answer_ids": answer_ids}]
+    })
+    assert response.status_code == 201
+    return {faculty_type["name"]: faculty_type["compliance"] for faculty_type in response.json()["faculty_type"]}
+
+
+@pytest.mark.asyncio
+async def test_process_user_answers_scores_all_answers(client: AsyncClient, test_data):
+    compliance = await _submit(client, ["22222222-2222-2222-2222-222222222222",
+                                        "33333333-3333-3333-3333-333333333333"])
+    assert compliance == {"Технический": 10, "Гуманитарный": 5}
+
+
+@pytest.mark.asyncio
+async def test_scoring_matrix_rebuilds_after_weight_change(client: AsyncClient, test_data):
+    answer_ids = ["22222222-2222-2222-2222-222222222222"]
+    assert await _submit(client, answer_ids) == {"Технический": 10}
+    hits = scoring_metrics.lookups.value((HIT,))
+    assert await _submit(client, answer_ids) == {"Технический": 10}
+    assert scoring_metrics.lookups.value((HIT,)) == hits + 1
+
+    async with TestSessionLocal() as session:
+        answer_faculty = (await session.exec(select(AnswerFaculty).where(
+            AnswerFaculty.answer_id == UUID(answer_ids[0])
+        ))).one()
+        answer_faculty.score = 42
+        session.add(answer_faculty)
+        await session.commit()
+
+    # Новые веса — новая матрица с пустой памятью
+    assert await _submit(client, answer_ids) == {"Технический": 42}
+
+
+def test_scoring_memo_by_answer_set():
+    answer1, answer2 = UUID(int=1), UUID(int=2)
+    type1 = UUID(int=10)
+    metrics = ScoringMetrics()
+    matrix = ScoringMatrix([(answer1, type1, 10), (answer2, type1, 3)], memo_size=2, metrics=metrics)
+
+    assert matrix.score([str(answer1), str(answer2)]) == {type1: 13}
+    # Тот же набор в другом порядке берётся из памяти
+    assert matrix.score([answer2, answer1]) == {type1: 13}
+    assert metrics.lookups.value((HIT,)) == 1 and metrics.lookups.value((MISS,)) == 1
+    # Повтор ответа — другой набор
+    assert matrix.score([answer1, answer1]) == {type1: 20}
+    assert metrics.hit_rate() == 1 / 3
+
+    matrix.score([answer2]).clear()
+    assert matrix.score([answer2]) == {type1: 3}
+    # В памяти не больше memo_size наборов
+    assert metrics.size.value(()) == 2
@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.src.applicants import search
+from backend.src.applicants.search import trigram_available
+from backend.src.database.migrations import m0005_applicant_search
+from backend.src.tests.conftest import test_engine
+
+
+async def _register(client: AsyncClient, phone_number: str, surname: str, name: str, city: str) -> str:
+    response = await client.post("/backend/api/applicant/register/", json={
+        "surname": surname, "name": name, "phone_number": phone_number, "city": city, "exams": []
+    })
+    return response.json()["uuid"]
+
+
+async def _search(client: AsyncClient, q: str, **params) -> list[dict]:
+    response = await client.get("/backend/api/applicants/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()["items"]
+
+
+@pytest.fixture()
+async def applicants(client: AsyncClient, test_data) -> dict[str, str]:
+    return {
+        "ivanov": await _register(client, "79001234567", "Иванов", "Иван", "Краснодар"),
+        "ivanova": await _register(client, "79001234568", "Иванова", "Мария", "Сочи"),
+        "petrov": await _register(client, "79001234569", "Петров", "Пётр", "Краснодар"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_by_fragment(client: AsyncClient, applicants):
+    # Точное совпадение фамилии выше похожей
+    found = await _search(client, "Иванов")
+    assert [item["uuid"] for item in found][:2] == [applicants["ivanov"], applicants["ivanova"]]
+    assert applicants["petrov"] not in [item["uuid"] for item in found]
+
+    found = await _search(client, "петров краснодар")
+    assert [item["uuid"] for item in found] == [applicants["petrov"]]
+
+    assert len(await _search(client, "Иванов", limit=1)) == 1
+    assert await _search(client, "Смирнов") == []
+    assert await _search(client, "   ") == []
+    response = await client.get("/backend/api/applicants/search", params={"q": "И"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_misspelled(client: AsyncClient, applicants):
+    async with AsyncSession(test_engine) as session:
+        if not await trigram_available(session):
+            pytest.skip("pg_trgm is not installed")
+    found = await _search(client, "Петрав")
+    assert found[0]["uuid"] == applicants["petrov"]
+    assert 0 < found[0]["similarity"] < 1
+
+
+@pytest.mark.asyncio
+async def test_search_one_statement(client: AsyncClient, applicants, statements):
+    await _search(client, "Иванов")
+
+    statements.clear()
+    await _search(client, "Иван")
+    assert len(statements) == 1
+
+
+def test_search_document_matches_index():
+    # Иначе планировщик не узнает выражение запроса и не возьмёт триграммный индекс
+    assert search.SEARCH_DOCUMENT == m0005_applicant_search.SEARCH_DOCUMENT
+    assert search.SEARCH_COLUMNS == m0005_applicant_search.SEARCH_COLUMNS
+
+
+def test_trigram_query_uses_indexed_expression():
+    # Без pg_trgm запрос не выполнить; проверяется хотя бы, что он фильтрует и сортирует по выражению индекса
+    sql = str(search.trigram_query("петрав", 5).compile(dialect=postgresql.dialect(paramstyle="named")))
+    where, order_by = sql.split("WHERE ")[1].split(" ORDER BY ")
+    assert where.strip() == f":query <% {search.SEARCH_DOCUMENT}"
+    assert order_by.startswith(f":query <<-> {search.SEARCH_DOCUMENT}, applicant.uuid")